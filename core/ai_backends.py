@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - AI 模型後端
+
+AITranslator 透過統一介面送出提示詞：
+- gemini-cli: 每個請求執行一次命令列工具（預設 gemini chat），提示詞經標準輸入傳遞
+- http:       OpenAI 相容的 chat/completions JSON API，以連線池重用 HTTP 連線
+- stub:       行程內的確定性模擬模型，可設定延遲與錯誤率，不需網路即可測量整個流程
+- genai:      以 google-genai SDK 在行程內呼叫 Gemini（選用依賴）
+- persistent: 常駐工作行程池（core/ai_process_pool.py），行程內再使用上述任一後端
+
+StubModel 同時供 tools/ai_stub_server.py 使用，以相同的規則回應 HTTP 請求。
+所有後端都以串流方式取得輸出（不支援串流的後端在完成時一次輸出全部內容），
+並記錄請求數、失敗數、每次請求的耗時、首個輸出片段的等待時間與生成速度。
+"""
+
+import codecs
+import hashlib
+import json
+import queue
+import random
+import re
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from google import genai
+except ImportError:
+    genai = None
+
+from .prompt_builder import PACKED_MARKER, PACKED_MARKER_PATTERN
+from .text_stats import estimate_tokens
+from .unicode_handler import safe_print
+
+
+BACKENDS = ('gemini-cli', 'http', 'stub', 'genai', 'persistent')
+
+DEFAULT_CLI_COMMAND = ['gemini', 'chat']
+DEFAULT_GENAI_MODEL = "gemini-2.5-pro"
+
+_SOURCE_BLOCK = re.compile(r'### 原文\n```\n(.*?)\n```', re.DOTALL)
+
+
+class AIBackend(ABC):
+    """模型後端的共同介面（子類別實作 _complete，支援串流的後端改繼承 StreamingBackend）"""
+
+    name = "base"
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "latencies": [],
+                      "first_token": [], "stream_tokens": 0, "stream_seconds": 0.0}
+
+    def translate(self, prompt: str) -> Optional[str]:
+        """送出提示詞並返回模型輸出，失敗時返回 None"""
+        return self.translate_stream(prompt)
+
+    def translate_stream(self, prompt: str, on_delta: Callable[[str], None] = None) -> Optional[str]:
+        """
+        送出提示詞，輸出片段到達時依序呼叫 on_delta
+
+        Returns:
+            完整的模型輸出；失敗時返回 None（失敗前已回報的片段仍有效，可供續譯）
+        """
+        start = time.monotonic()
+        pieces = []
+        arrivals = []
+
+        def emit(text: str) -> None:
+            if not text:
+                return
+            arrivals.append(time.monotonic())
+            pieces.append(text)
+            if on_delta is not None:
+                on_delta(text)
+
+        try:
+            result = self._stream(prompt, emit)
+        except Exception as e:
+            safe_print(f"❌ {self.name} 後端錯誤: {e}")
+            result = None
+        self._record(time.monotonic() - start, result is not None, start, arrivals, pieces)
+        return result
+
+    def _stream(self, prompt: str, emit: Callable[[str], None]) -> Optional[str]:
+        """預設實作：不支援串流的後端在完成時一次輸出全部內容"""
+        result = self._complete(prompt)
+        if result:
+            emit(result)
+        return result
+
+    @abstractmethod
+    def _complete(self, prompt: str) -> Optional[str]:
+        """送出提示詞並返回完整輸出，失敗時返回 None 或拋出例外"""
+
+    def _record(self, elapsed: float, success: bool, start: float = None,
+                arrivals: List[float] = None, pieces: List[str] = None) -> None:
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["errors"] += 0 if success else 1
+            self.stats["latencies"].append(elapsed)
+            if arrivals:
+                self.stats["first_token"].append(arrivals[0] - start)
+            # 生成速度只能由分多次到達的輸出估算：第一個片段之後的輸出量 / 經過時間
+            if arrivals and len(arrivals) > 1 and arrivals[-1] > arrivals[0]:
+                self.stats["stream_tokens"] += estimate_tokens(''.join(pieces[1:]))
+                self.stats["stream_seconds"] += arrivals[-1] - arrivals[0]
+
+    def close(self) -> None:
+        """釋放連線等資源"""
+
+
+class StreamingBackend(AIBackend):
+    """支援串流的後端：子類別實作 _stream，_complete 由串流輸出組成"""
+
+    @abstractmethod
+    def _stream(self, prompt: str, emit: Callable[[str], None]) -> Optional[str]:
+        """送出提示詞，輸出片段到達時呼叫 emit，返回完整輸出"""
+
+    def _complete(self, prompt: str) -> Optional[str]:
+        return self._stream(prompt, lambda text: None)
+
+
+class CLIBackend(StreamingBackend):
+    """每個請求執行一次命令列工具，邊執行邊讀取標準輸出"""
+
+    name = "gemini-cli"
+
+    def __init__(self, command: List[str] = None, timeout: float = 120):
+        """
+        Args:
+            command: 命令列工具與參數
+            timeout: 等待下一段輸出的最長秒數，超過即終止行程
+        """
+        super().__init__()
+        self.command = list(command or DEFAULT_CLI_COMMAND)
+        self.timeout = timeout
+
+    def _stream(self, prompt: str, emit: Callable[[str], None]) -> Optional[str]:
+        try:
+            process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except FileNotFoundError:
+            safe_print(f"❌ 未找到 {self.command[0]} 命令，請確認已安裝Gemini CLI")
+            return None
+
+        chunks = queue.Queue()
+        errors = []
+
+        def write_prompt():
+            # 將 prompt 通過標準輸入傳遞（另一個執行緒寫入，避免輸出管線塞滿時互相等待）
+            try:
+                process.stdin.write(prompt.encode('utf-8'))
+                process.stdin.close()
+            except OSError:
+                pass
+
+        def read_output():
+            for data in iter(lambda: process.stdout.read1(4096), b''):
+                chunks.put(data)
+            chunks.put(None)
+
+        threads = [threading.Thread(target=write_prompt, daemon=True),
+                   threading.Thread(target=read_output, daemon=True),
+                   threading.Thread(target=lambda: errors.append(process.stderr.read()), daemon=True)]
+        for thread in threads:
+            thread.start()
+
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        pieces = []
+        while True:
+            try:
+                data = chunks.get(timeout=self.timeout)
+            except queue.Empty:
+                process.kill()
+                process.wait()
+                safe_print("❌ 翻譯超時")
+                return None
+            text = decoder.decode(data or b'', final=data is None)
+            if text:
+                pieces.append(text)
+                emit(text)
+            if data is None:
+                break
+
+        process.wait()
+        threads[2].join(timeout=1)
+        if process.returncode != 0:
+            message = errors[0].decode('utf-8', errors='replace').strip() if errors else ""
+            safe_print(f"❌ Gemini CLI錯誤: {message}")
+            return None
+        return ''.join(pieces).strip() or None
+
+
+class HTTPBackend(StreamingBackend):
+    """OpenAI 相容的 chat/completions API（同一個 Session 重用連線）"""
+
+    name = "http"
+
+    def __init__(self, url: str, model: str = "", api_key: str = None,
+                 timeout: float = 120, pool_size: int = 8):
+        """
+        初始化後端
+
+        Args:
+            url: chat/completions 端點的完整網址
+            model: 模型名稱
+            api_key: Bearer 權杖，None 表示不附帶
+            timeout: 單次請求逾時秒數
+            pool_size: 連線池大小（應不小於同時進行的請求數）
+        """
+        super().__init__()
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Content-Type'] = 'application/json'
+        if api_key:
+            self.session.headers['Authorization'] = f'Bearer {api_key}'
+
+    def _stream(self, prompt: str, emit: Callable[[str], None]) -> Optional[str]:
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": True
+        }
+        try:
+            with self.session.post(self.url, json=payload, timeout=self.timeout, stream=True) as response:
+                if response.status_code != 200:
+                    safe_print(f"❌ HTTP {response.status_code}: {response.text[:200]}")
+                    return None
+                # 不支援串流的伺服器直接返回完整的 JSON 回應
+                if 'text/event-stream' not in response.headers.get('Content-Type', ''):
+                    return self._parse_completion(response, emit)
+                return self._read_events(response, emit)
+        except requests.RequestException as e:
+            safe_print(f"❌ HTTP 請求失敗: {e}")
+            return None
+
+    @staticmethod
+    def _parse_completion(response: requests.Response, emit: Callable[[str], None]) -> Optional[str]:
+        try:
+            content = response.json()["choices"][0]["message"]["content"].strip()
+        except (ValueError, KeyError, IndexError, TypeError):
+            safe_print("❌ 無法解析模型回應")
+            return None
+        emit(content)
+        return content or None
+
+    @staticmethod
+    def _read_events(response: requests.Response, emit: Callable[[str], None]) -> Optional[str]:
+        """讀取 server-sent events 格式的串流回應（讀到回應結束，連線才能放回連線池重用）"""
+        response.encoding = 'utf-8'
+        pieces = []
+        failed = False
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith('data:'):
+                continue
+            data = line[5:].strip()
+            if data == '[DONE]':
+                continue
+            try:
+                event = json.loads(data)
+            except ValueError:
+                continue
+            if "error" in event:
+                safe_print(f"❌ 串流中斷: {event['error'].get('message', '')}")
+                failed = True
+                continue
+            try:
+                text = event["choices"][0]["delta"].get("content") or ""
+            except (KeyError, IndexError, TypeError, AttributeError):
+                continue
+            if text:
+                pieces.append(text)
+                emit(text)
+        if failed:
+            return None
+        return ''.join(pieces).strip() or None
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class GenAIBackend(StreamingBackend):
+    """以 google-genai SDK 呼叫 Gemini（用戶端在整個行程中重用，只認證一次）"""
+
+    name = "genai"
+
+    def __init__(self, model: str = "", api_key: str = None):
+        """
+        Args:
+            model: 模型名稱，空字串表示 DEFAULT_GENAI_MODEL
+            api_key: API 金鑰，None 表示由 SDK 讀取環境變數（GEMINI_API_KEY / GOOGLE_API_KEY）
+
+        Raises:
+            ImportError: 未安裝 google-genai
+        """
+        super().__init__()
+        if genai is None:
+            raise ImportError("genai 後端需要 google-genai，請執行 pip install google-genai")
+        self.model = model or DEFAULT_GENAI_MODEL
+        self.client = genai.Client(api_key=api_key) if api_key else genai.Client()
+
+    def _stream(self, prompt: str, emit: Callable[[str], None]) -> Optional[str]:
+        pieces = []
+        for chunk in self.client.models.generate_content_stream(model=self.model, contents=prompt):
+            if chunk.text:
+                pieces.append(chunk.text)
+                emit(chunk.text)
+        return ''.join(pieces).strip() or None
+
+
+class StubModel:
+    """
+    確定性的模擬模型
+
+    輸出依提示詞中的原文逐段產生「（譯）原文」，並遵守合併請求的分隔標記，
+    因此 AITranslator 的分段、合併、翻譯記憶與模板更新都能完整執行。
+    延遲與錯誤由 (種子, 提示詞, 第幾次收到此提示詞) 決定，重試的結果也可重現。
+    """
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0, per_token_latency: float = 0.0):
+        """
+        Args:
+            latency: 每個請求的基本延遲秒數
+            jitter: 在基本延遲上隨機增加的最大秒數
+            error_rate: 請求失敗的機率（0–1）
+            seed: 隨機種子
+            per_token_latency: 每個輸出字元增加的延遲秒數（模擬生成速度）
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.seed = seed
+        self.per_token_latency = per_token_latency
+        self._attempts = {}
+        self._lock = threading.Lock()
+
+    def plan(self, prompt: str):
+        """返回 (延遲秒數, 是否失敗)"""
+        digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()
+        with self._lock:
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+        rng = random.Random(f"{self.seed}:{digest}:{attempt}")
+        delay = self.latency + rng.random() * self.jitter
+        return delay, rng.random() < self.error_rate
+
+    @staticmethod
+    def render(prompt: str) -> str:
+        """依提示詞中的原文產生格式正確的輸出"""
+        task = prompt.split("## 翻譯任務", 1)[-1]
+        sources = _SOURCE_BLOCK.findall(task)
+        packed = len(PACKED_MARKER_PATTERN.findall(task)) > 0 and len(sources) > 1
+
+        outputs = []
+        for number, source in enumerate(sources, 1):
+            paragraphs = [line.strip() for line in source.splitlines() if line.strip()]
+            body = "\n\n".join(f"（譯）{paragraph}" for paragraph in paragraphs)
+            section = f"### 現代中文翻譯\n{body}\n\n### 翻譯要點\n- 模擬輸出，共 {len(paragraphs)} 段\n"
+            if packed:
+                section = f"{PACKED_MARKER.format(number=number)}\n{section}"
+            outputs.append(section)
+        return "\n".join(outputs)
+
+    def stream(self, prompt: str, emit: Callable[[str], None],
+               sleep: Callable[[float], None] = time.sleep) -> Optional[str]:
+        """
+        模擬一次串流請求：等待延遲後逐行輸出
+
+        失敗的請求在輸出約一半後中斷（模擬生成途中逾時），返回 None
+        """
+        delay, failed = self.plan(prompt)
+        sleep(delay)
+        output = self.render(prompt)
+        lines = output.splitlines(keepends=True)
+        if failed:
+            lines = lines[:len(lines) // 2]
+        for line in lines:
+            sleep(len(line) * self.per_token_latency)
+            emit(line)
+        return None if failed else output
+
+    def respond(self, prompt: str, sleep: Callable[[float], None] = time.sleep) -> Optional[str]:
+        """模擬一次請求：等待延遲後返回輸出，失敗時返回 None"""
+        delay, failed = self.plan(prompt)
+        if failed:
+            sleep(delay)
+            return None
+        output = self.render(prompt)
+        sleep(delay + len(output) * self.per_token_latency)
+        return output
+
+
+class StubBackend(StreamingBackend):
+    """行程內的模擬模型後端"""
+
+    name = "stub"
+
+    def __init__(self, model: StubModel = None):
+        super().__init__()
+        self.model = model or StubModel()
+
+    def _stream(self, prompt: str, emit: Callable[[str], None]) -> Optional[str]:
+        return self.model.stream(prompt, emit)
+
+
+class CallableBackend(AIBackend):
+    """以 Python 函式作為後端（行程內模型或測試替身）"""
+
+    name = "callable"
+
+    def __init__(self, function: Callable[[str], Optional[str]], name: str = None):
+        super().__init__()
+        self.function = function
+        if name:
+            self.name = name
+
+    def _complete(self, prompt: str) -> Optional[str]:
+        return self.function(prompt)
+
+
+def _summarize(values: List[float]) -> Dict:
+    values = sorted(values)
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0}
+
+    def percentile(fraction):
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+    return {
+        "mean": sum(values) / len(values),
+        "p50": percentile(0.5),
+        "p95": percentile(0.95)
+    }
+
+
+def latency_summary(stats: Dict) -> Dict:
+    """由後端統計計算平均、P50、P95 延遲（秒）"""
+    return _summarize(stats.get("latencies", []))
+
+
+def streaming_summary(stats: Dict) -> Dict:
+    """
+    由後端統計計算首個輸出片段的等待時間（平均、P50、P95，秒）與生成速度
+
+    Returns:
+        {"first_token": {...}, "tokens_per_second": 每秒生成的估計 token 數，無法估算時為 None}
+    """
+    seconds = stats.get("stream_seconds", 0.0)
+    return {
+        "first_token": _summarize(stats.get("first_token", [])),
+        "tokens_per_second": stats.get("stream_tokens", 0) / seconds if seconds > 0 else None
+    }
+
+
+def create_backend(config: Dict, name: str = None) -> AIBackend:
+    """
+    依設定建立後端
+
+    Args:
+        config: AI 翻譯設定（backend、backend_command、backend_url、backend_model、api_key、stub_*、persistent_*）
+        name: 後端名稱，None 表示使用 config["backend"]
+
+    Raises:
+        ValueError: 未知的後端名稱或 http 後端缺少網址
+    """
+    name = name or config.get("backend", "gemini-cli")
+    timeout = config.get("timeout", 120)
+    api_key = config.get("api_key")
+    if api_key and api_key.startswith("YOUR_"):
+        api_key = None
+
+    if name == "gemini-cli":
+        return CLIBackend(config.get("backend_command"), timeout)
+    if name == "http":
+        url = config.get("backend_url")
+        if not url:
+            raise ValueError("http 後端需要設定 backend_url")
+        # 檔案工作與長章節分段的執行緒池同時送出請求
+        return HTTPBackend(url, config.get("backend_model", ""), api_key, timeout,
+                           pool_size=config.get("workers", 4) + config.get("chunk_workers", 4))
+    if name == "stub":
+        return StubBackend(StubModel(
+            latency=config.get("stub_latency", 0.5),
+            jitter=config.get("stub_jitter", 0.0),
+            error_rate=config.get("stub_error_rate", 0.0),
+            seed=config.get("stub_seed", 0),
+            per_token_latency=config.get("stub_token_latency", 0.0)
+        ))
+    if name == "genai":
+        return GenAIBackend(config.get("backend_model", ""), api_key)
+    if name == "persistent":
+        from .ai_process_pool import create_persistent_backend
+        if config.get("persistent_backend") == "persistent":
+            raise ValueError("persistent_backend 不可為 persistent")
+        return create_persistent_backend(config)
+    raise ValueError(f"未知的AI後端: {name}（可用: {', '.join(BACKENDS)}）")
@@ -12,6 +12,13 @@ class AIEngine:
         self.source_texts_dir = self.root_dir / 'docs' / 'source_texts'
         self.translations_dir = self.root_dir / 'docs' / 'translations'
         self.guidelines_path = self.root_dir / 'config' / 'ai_translation_guidelines.md'
+        self._resolved_guidelines_path = None
+
+    def _resolve_guidelines(self):
+        """解析翻譯準則的絕對路徑（找到後在整個會話中重複使用，不再逐檔檢查）"""
+        if self._resolved_guidelines_path is None and self.guidelines_path.exists():
+            self._resolved_guidelines_path = self.guidelines_path.resolve()
+        return self._resolved_guidelines_path
 
     def prepare_translation_task(self, filename):
         """準備翻譯任務，並返回給 Gemini CLI 的指令。"""
@@ -40,7 +47,8 @@ class AIEngine:
         # We don't check for existence of translation_path anymore because
         # the tracker already determined it's untranslated.
 
-        if not self.guidelines_path.exists():
+        guidelines_path = self._resolve_guidelines()
+        if guidelines_path is None:
             safe_print(f"錯誤：找不到翻譯準則檔案 '{self.guidelines_path}'")
             return None
 
@@ -50,7 +58,7 @@ class AIEngine:
         safe_print("下一步，請複製並執行以下指令來開始翻譯：")
         safe_print("\n" + "-"*60)
         # Use absolute paths in the final command for clarity
-        gemini_command = f"翻譯檔案 '{source_path.resolve()}' 至 '{translation_path.resolve()}'，並使用準則 '{self.guidelines_path.resolve()}'"
+        gemini_command = f"翻譯檔案 '{source_path.resolve()}' 至 '{translation_path.resolve()}'，並使用準則 '{guidelines_path}'"
         safe_print(gemini_command)
         safe_print("-"*60 + "\n")
         
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 常駐模型行程池
+
+每個請求啟動一次 CLI 需要重複支付直譯器啟動、載入與認證的成本。
+此模組讓一組常駐的工作行程（預設為 tools/ai_worker.py）持續執行，
+以標準輸入輸出上的 JSON Lines 協定交換提示詞與回應：
+
+    → {"type": "request", "id": 1, "prompt": "..."}
+    ← {"type": "delta", "id": 1, "text": "..."}        （零或多個，串流輸出的片段）
+    ← {"type": "result", "id": 1, "text": "..."}       或 {"type": "error", "id": 1, "message": "..."}
+    → {"type": "ping", "id": 2}
+    ← {"type": "pong", "id": 2}
+
+- 每個行程一次只處理一個請求，池中的行程數即為並行上限
+- 閒置超過 health_check_interval 的行程在使用前先以 ping 檢查
+- 請求逾時（行程卡住）或行程結束時強制終止並重新啟動，該請求視為失敗交由上層重試
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .ai_backends import StreamingBackend
+from .unicode_handler import safe_print
+
+
+DEFAULT_WORKER_SCRIPT = Path(__file__).parent.parent / "tools" / "ai_worker.py"
+
+# 行程結束時放入回應佇列的標記
+_EOF = object()
+
+
+class WorkerProcessError(Exception):
+    """工作行程無回應、已結束或協定錯誤"""
+
+
+class WorkerProcess:
+    """單一常駐工作行程的驅動器（呼叫者需確保同時只有一個請求）"""
+
+    def __init__(self, command: List[str], startup_timeout: float = 30, env: Dict[str, str] = None):
+        """
+        Args:
+            command: 啟動工作行程的命令
+            startup_timeout: 啟動後等待第一個 pong 的秒數
+            env: 額外的環境變數（如 AI_WORKER_CONFIG）
+        """
+        self.command = list(command)
+        self.startup_timeout = startup_timeout
+        self.env = dict(os.environ, **(env or {}))
+        self.process = None
+        self.started = False
+        self.restarts = 0
+        self.last_used = 0.0
+        self._responses = queue.Queue()
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        """啟動行程並確認可以回應"""
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            bufsize=1,
+            env=self.env
+        )
+        self.started = True
+        self._responses = queue.Queue()
+        reader = threading.Thread(target=self._read_loop, args=(self.process, self._responses), daemon=True)
+        reader.start()
+
+        if not self.ping(self.startup_timeout):
+            self.stop()
+            raise WorkerProcessError(f"工作行程啟動後沒有回應: {' '.join(self.command)}")
+        self.last_used = time.monotonic()
+
+    def stop(self) -> None:
+        """終止行程"""
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def ensure_running(self) -> None:
+        """尚未啟動時啟動，已結束時重新啟動"""
+        if not self.alive:
+            if self.started:
+                self.restart()
+            else:
+                self.start()
+
+    def restart(self) -> None:
+        """強制終止並重新啟動"""
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+        self.restarts += 1
+        self.start()
+
+    @staticmethod
+    def _read_loop(process: subprocess.Popen, responses: queue.Queue) -> None:
+        """讀取行程輸出（每個行程各自的佇列，重啟後舊行程的輸出不會混入）"""
+        for line in process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                responses.put(json.loads(line))
+            except ValueError:
+                # 非協定輸出（如工具自身的訊息）直接略過
+                continue
+        responses.put(_EOF)
+
+    def _send(self, message: dict) -> int:
+        self._next_id += 1
+        message["id"] = self._next_id
+        try:
+            self.process.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise WorkerProcessError(f"無法寫入工作行程: {e}")
+        return self._next_id
+
+    def _receive(self, request_id: int, deadline: float) -> dict:
+        """等待指定請求的下一則訊息（略過過期請求的殘留訊息）"""
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise WorkerProcessError("工作行程回應逾時")
+            try:
+                message = self._responses.get(timeout=remaining)
+            except queue.Empty:
+                raise WorkerProcessError("工作行程回應逾時")
+            if message is _EOF:
+                raise WorkerProcessError("工作行程已結束")
+            if message.get("id") == request_id:
+                return message
+
+    def ping(self, timeout: float = 5) -> bool:
+        """健康檢查"""
+        if not self.alive:
+            return False
+        try:
+            request_id = self._send({"type": "ping"})
+            return self._receive(request_id, time.monotonic() + timeout).get("type") == "pong"
+        except WorkerProcessError:
+            return False
+
+    def request(self, prompt: str, timeout: float,
+                on_delta: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """
+        送出提示詞並等待完整回應
+
+        Args:
+            prompt: 提示詞
+            timeout: 兩則訊息之間的最長間隔秒數（串流輸出時每收到一個片段重新計時）
+            on_delta: 收到串流片段時呼叫
+
+        Returns:
+            模型輸出；工作行程回報錯誤時返回 None
+
+        Raises:
+            WorkerProcessError: 逾時、行程結束或寫入失敗
+        """
+        if not self.alive:
+            raise WorkerProcessError("工作行程未執行")
+
+        self.last_used = time.monotonic()
+        request_id = self._send({"type": "request", "prompt": prompt})
+        while True:
+            message = self._receive(request_id, time.monotonic() + timeout)
+            kind = message.get("type")
+            if kind == "delta":
+                if on_delta is not None:
+                    on_delta(message.get("text", ""))
+            elif kind == "result":
+                self.last_used = time.monotonic()
+                return message.get("text") or None
+            elif kind == "error":
+                self.last_used = time.monotonic()
+                safe_print(f"❌ 工作行程錯誤: {message.get('message', '')}")
+                return None
+
+
+class PersistentProcessBackend(StreamingBackend):
+    """以常駐工作行程池處理請求的後端"""
+
+    name = "persistent"
+
+    def __init__(self, command: List[str], processes: int = 4, timeout: float = 120,
+                 health_check_interval: float = 60, startup_timeout: float = 30,
+                 env: Dict[str, str] = None):
+        """
+        Args:
+            command: 啟動工作行程的命令
+            processes: 行程數（同時處理的請求數上限）
+            timeout: 單一請求等待回應的最長秒數，超過即視為卡住並重新啟動行程
+            health_check_interval: 行程閒置超過此秒數後，使用前先以 ping 檢查
+            startup_timeout: 行程啟動的等待秒數
+            env: 傳給工作行程的額外環境變數
+        """
+        super().__init__()
+        self.command = list(command)
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.workers = [WorkerProcess(command, startup_timeout, env) for _ in range(max(1, processes))]
+        self._idle = queue.Queue()
+        for worker in self.workers:
+            self._idle.put(worker)
+
+    @property
+    def restarts(self) -> int:
+        return sum(worker.restarts for worker in self.workers)
+
+    def _checkout(self) -> WorkerProcess:
+        """取得一個可用的行程（必要時啟動或重新啟動）"""
+        worker = self._idle.get()
+        try:
+            if not worker.alive:
+                worker.ensure_running()
+            elif time.monotonic() - worker.last_used > self.health_check_interval and not worker.ping():
+                safe_print("⚠️ 工作行程健康檢查失敗，重新啟動")
+                worker.restart()
+        except (WorkerProcessError, OSError):
+            self._idle.put(worker)
+            raise
+        return worker
+
+    def _stream(self, prompt: str, emit: Callable[[str], None]) -> Optional[str]:
+        try:
+            worker = self._checkout()
+        except (WorkerProcessError, OSError) as e:
+            safe_print(f"❌ 無法啟動工作行程: {e}")
+            return None
+
+        try:
+            return worker.request(prompt, self.timeout, emit)
+        except WorkerProcessError as e:
+            safe_print(f"⚠️ {e}，重新啟動工作行程")
+            try:
+                worker.restart()
+            except (WorkerProcessError, OSError) as restart_error:
+                safe_print(f"❌ 工作行程重新啟動失敗: {restart_error}")
+            return None
+        finally:
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        for worker in self.workers:
+            worker.stop()
+
+
+WORKER_CONFIG_ENV = "AI_WORKER_CONFIG"
+
+
+def create_persistent_backend(config: Dict) -> PersistentProcessBackend:
+    """
+    依 AI 翻譯設定建立常駐行程後端
+
+    persistent_command 未指定時以目前的 Python 執行 tools/ai_worker.py，
+    工作行程內使用 persistent_backend 指定的後端；設定經環境變數傳遞（避免金鑰出現在命令列）。
+    """
+    command = config.get("persistent_command") or [sys.executable, str(DEFAULT_WORKER_SCRIPT)]
+    worker_config = dict(config, backend=config.get("persistent_backend", "genai"))
+    return PersistentProcessBackend(
+        command,
+        processes=config.get("persistent_processes") or config.get("workers", 4),
+        timeout=config.get("timeout", 120),
+        health_check_interval=config.get("health_check_interval", 60),
+        env={WORKER_CONFIG_ENV: json.dumps(worker_config, ensure_ascii=False)}
+    )
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 非同步HTTP後端
+
+基於 aiohttp 的連線池化抓取器，供 TranslationEngine、ShidianCrawler、
+BaseCrawler 選用。提供每主機並行上限、共享速率限制與帶抖動的指數退避重試。
+"""
+
+import asyncio
+import json
+import random
+from typing import Dict, Optional
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .rate_limiter import RateLimiter
+from .http_cache import ResponseCache, OfflineCacheMiss, is_offline_mode
+
+
+# 這些狀態碼視為暫時性錯誤，會進行重試
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchResult:
+    """非同步請求的結果（介面與 requests.Response 常用部分一致）"""
+
+    def __init__(self, url: str, status_code: int, text: str, headers: Dict = None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    def json(self):
+        """將回應內容解析為JSON"""
+        return json.loads(self.text)
+
+
+class AsyncFetcher:
+    """aiohttp 抓取器，需在事件迴圈中以 async with 使用"""
+
+    def __init__(self, headers: Dict = None, timeout: float = 10, max_retries: int = 3,
+                 per_host_limit: int = 4, total_limit: int = 100,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0):
+        """
+        初始化抓取器
+
+        Args:
+            headers: 每個請求附帶的標頭
+            timeout: 單次請求逾時秒數
+            max_retries: 最大嘗試次數
+            per_host_limit: 每個主機的最大並行連線數
+            total_limit: 連線池總上限
+            rate_limiter: 共享的速率限制器（可與同步路徑共用）
+            cache: 回應快取，None 表示不使用快取
+            backoff_base: 退避基準秒數
+            backoff_max: 單次退避的上限秒數
+        """
+        if aiohttp is None:
+            raise ImportError("非同步後端需要 aiohttp，請執行 pip install aiohttp")
+
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.max_retries = max(1, max_retries)
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = None
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """建立連線池化的 ClientSession"""
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.total_limit,
+                                             limit_per_host=self.per_host_limit)
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+    async def close(self) -> None:
+        """關閉 ClientSession 並釋放連線"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """計算第 attempt 次重試前的等待時間（full jitter）"""
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    async def get(self, url: str, timeout: float = None, **kwargs) -> FetchResult:
+        """
+        發送GET請求，有快取時先查快取，暫時性錯誤時自動重試
+
+        Args:
+            url: 目標網址
+            timeout: 覆寫預設逾時秒數
+
+        Returns:
+            FetchResult: 快取內容或最後一次嘗試的結果
+
+        Raises:
+            OfflineCacheMiss: 離線模式下快取未命中
+            aiohttp.ClientError / asyncio.TimeoutError: 所有重試都因連線錯誤失敗時
+        """
+        # 快取的磁碟讀寫都放到執行緒中，不阻塞事件迴圈
+        entry = await self._in_thread(self.cache.lookup, url) if self.cache is not None else None
+
+        if entry is not None and (is_offline_mode() or self.cache.is_fresh(entry)):
+            return await self._result_from_cache(entry)
+
+        if is_offline_mode():
+            raise OfflineCacheMiss(f"離線模式：快取中沒有 {url}")
+
+        if entry is not None:
+            headers = dict(kwargs.pop('headers', None) or {})
+            headers.update(self.cache.conditional_headers(entry))
+            kwargs['headers'] = headers
+
+        if self.session is None:
+            await self.open()
+
+        if timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+
+        last_error = None
+        for attempt in range(self.max_retries):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+
+            try:
+                async with self.session.get(url, **kwargs) as response:
+                    body = await response.read()
+                    text = await response.text(errors='replace')
+                    result = FetchResult(str(response.url), response.status,
+                                         text, dict(response.headers))
+
+                if result.status_code == 304 and entry is not None:
+                    await self._in_thread(self.cache.refresh, entry)
+                    return await self._result_from_cache(entry)
+
+                if result.status_code == 200 and self.cache is not None:
+                    await self._in_thread(self.cache.store, url, result.status_code, result.headers, body)
+
+                if result.status_code not in RETRY_STATUSES or attempt == self.max_retries - 1:
+                    return result
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+                if attempt == self.max_retries - 1:
+                    raise
+
+            await asyncio.sleep(self._backoff_delay(attempt))
+
+        raise last_error
+
+    @staticmethod
+    async def _in_thread(function, *args):
+        """在預設執行緒池中執行阻塞的函式（支援沒有 asyncio.to_thread 的 Python 3.7/3.8）"""
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    async def _result_from_cache(self, entry: Dict) -> FetchResult:
+        """由快取項目組裝 FetchResult"""
+        body = await self._in_thread(self.cache.read_body, entry)
+        encoding = 'utf-8'
+        for key, value in entry['headers'].items():
+            if key.lower() == 'content-type' and 'charset=' in value:
+                encoding = value.split('charset=')[-1].split(';')[0].strip()
+        try:
+            text = body.decode(encoding, errors='replace')
+        except LookupError:
+            text = body.decode('utf-8', errors='replace')
+        return FetchResult(entry['url'], entry['status'], text, dict(entry['headers']))
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 書籍處理清單（檢查點）
+
+每本書一個清單檔，記錄：
+- 書籍資訊與發現階段得到的完整章節列表（重新執行時不必再次發現）
+- 每個章節的爬取狀態（完成、略過、失敗）、輸出檔名、內容雜湊值與嘗試次數
+
+translate_book 中斷後重新執行時，已完成或刻意略過（如與品重複的卷）的章節直接略過，
+只重試失敗或未處理的章節。
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class BookManifest:
+    """單本書籍的處理清單"""
+
+    STATUS_DONE = "done"
+    STATUS_SKIPPED = "skipped"
+    STATUS_FAILED = "failed"
+
+    def __init__(self, book_id: str, manifest_dir: Path = None):
+        """
+        初始化清單（存在時自動載入）
+
+        Args:
+            book_id: 書籍ID
+            manifest_dir: 清單目錄
+        """
+        self.book_id = book_id
+        self.manifest_dir = Path(manifest_dir or "data/manifests")
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_file = self.manifest_dir / f"{book_id}.json"
+        self.load()
+
+    def load(self) -> None:
+        """載入清單"""
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+                return
+            except (json.JSONDecodeError, FileNotFoundError):
+                pass
+        self.data = self._create_empty_manifest()
+
+    def _create_empty_manifest(self) -> Dict:
+        """創建空的清單結構"""
+        return {
+            "metadata": {
+                "book_id": self.book_id,
+                "created": datetime.now().isoformat(),
+                "last_updated": datetime.now().isoformat(),
+                "version": "1.0"
+            },
+            "book_info": None,
+            "chapters": [],
+            "discovery_complete": False,
+            "chapter_status": {}
+        }
+
+    def save(self) -> None:
+        """原子性地儲存清單（中途中斷不會留下損壞的檔案）"""
+        self.data["metadata"]["last_updated"] = datetime.now().isoformat()
+
+        temp_file = self.manifest_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.manifest_file)
+
+    def reset(self) -> None:
+        """清空清單（重新開始整本書）"""
+        self.data = self._create_empty_manifest()
+        self.save()
+
+    # ---- 發現階段 ----
+
+    def has_discovery(self) -> bool:
+        """是否已保存完整的發現結果"""
+        return bool(self.data.get("discovery_complete") and self.data.get("chapters"))
+
+    @property
+    def book_info(self) -> Optional[Dict]:
+        return self.data.get("book_info")
+
+    @property
+    def chapters(self) -> List[Dict]:
+        return self.data.get("chapters", [])
+
+    def set_discovery(self, book_info: Dict, chapters: List[Dict]) -> None:
+        """
+        保存發現結果
+
+        章節列表變更（重新發現）時，編號或網址已不同的章節狀態會被捨棄。
+        """
+        known = {self._chapter_key(chapter): chapter['number'] for chapter in chapters}
+        self.data["chapter_status"] = {
+            key: status for key, status in self.data.get("chapter_status", {}).items()
+            if known.get(key) == status.get("number")
+        }
+
+        self.data["book_info"] = book_info
+        self.data["chapters"] = chapters
+        self.data["discovery_complete"] = True
+        self.save()
+
+    # ---- 章節狀態 ----
+
+    @staticmethod
+    def _chapter_key(chapter: Dict) -> str:
+        return chapter.get('url') or chapter.get('chapter_id') or str(chapter['number'])
+
+    def get_status(self, chapter: Dict) -> Optional[Dict]:
+        """章節的狀態記錄"""
+        return self.data["chapter_status"].get(self._chapter_key(chapter))
+
+    def is_complete(self, chapter: Dict, source_dir: Path) -> bool:
+        """章節是否已完成（狀態為完成且原文檔案仍存在，或已刻意略過）"""
+        status = self.get_status(chapter)
+        if status and status.get("status") == self.STATUS_SKIPPED:
+            return True
+        if not status or status.get("status") != self.STATUS_DONE:
+            return False
+        return bool(status.get("file")) and (Path(source_dir) / status["file"]).exists()
+
+    def pending_chapters(self, chapters: List[Dict], source_dir: Path) -> List[Dict]:
+        """尚未完成（未處理或失敗）的章節，略過的章節不再處理"""
+        return [chapter for chapter in chapters if not self.is_complete(chapter, source_dir)]
+
+    def mark_done(self, chapter: Dict, file_name: str, content_hash: Optional[str]) -> None:
+        """記錄章節完成並立即寫入檢查點"""
+        self._update(chapter, {
+            "status": self.STATUS_DONE,
+            "file": file_name,
+            "content_hash": content_hash,
+            "error": None
+        })
+
+    def mark_skipped(self, chapter: Dict, reason: str = None) -> None:
+        """記錄章節被刻意略過（不寫入原文檔案，重新執行時不再爬取）"""
+        self._update(chapter, {
+            "status": self.STATUS_SKIPPED,
+            "file": None,
+            "error": None,
+            "reason": reason
+        })
+
+    def mark_failed(self, chapter: Dict, error: str = None) -> None:
+        """記錄章節失敗並立即寫入檢查點"""
+        self._update(chapter, {
+            "status": self.STATUS_FAILED,
+            "error": error
+        })
+
+    def _update(self, chapter: Dict, fields: Dict) -> None:
+        key = self._chapter_key(chapter)
+        status = self.data["chapter_status"].setdefault(key, {"attempts": 0})
+        status.update(fields)
+        status["number"] = chapter['number']
+        status["title"] = chapter.get('title')
+        status["attempts"] = status.get("attempts", 0) + 1
+        status["updated"] = datetime.now().isoformat()
+        self.save()
+
+    def get_statistics(self) -> Dict:
+        """獲取清單統計資訊"""
+        statuses = [s.get("status") for s in self.data["chapter_status"].values()]
+        return {
+            "total_chapters": len(self.chapters),
+            "done": statuses.count(self.STATUS_DONE),
+            "skipped": statuses.count(self.STATUS_SKIPPED),
+            "failed": statuses.count(self.STATUS_FAILED),
+            "discovery_complete": self.has_discovery()
+        }
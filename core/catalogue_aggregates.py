@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 目錄累計統計
+
+維護整個目錄的總計、分類統計、標籤統計與整體翻譯進度。
+每次新增、取代或更新一部經典時只套用該經典的差值（與標籤數成正比），
+不需要重新走訪所有經典；rebuild() 提供完整重算，用於初始化與一致性檢查。
+"""
+
+from typing import Dict, Iterable, Optional
+
+
+def _empty_bucket() -> Dict[str, int]:
+    return {"count": 0, "chapters": 0, "characters": 0, "completed": 0}
+
+
+class CatalogueAggregates:
+    """經典目錄的累計統計"""
+
+    def __init__(self, data: Optional[Dict] = None):
+        """
+        初始化統計
+
+        Args:
+            data: to_dict() 的輸出（由中繼資料載入），None 表示空目錄
+        """
+        data = data or {}
+        self.totals = dict(_empty_bucket(), **data.get("totals", {}))
+        self.categories = {name: dict(bucket) for name, bucket in data.get("categories", {}).items()}
+        self.tags = {name: dict(bucket) for name, bucket in data.get("tags", {}).items()}
+
+    @classmethod
+    def rebuild(cls, classics: Iterable[Dict]) -> "CatalogueAggregates":
+        """由所有經典記錄完整重算"""
+        aggregates = cls()
+        for classic in classics:
+            aggregates.add(classic)
+        return aggregates
+
+    @staticmethod
+    def _contribution(classic: Dict) -> Dict:
+        status = classic.get("translation_status") or {}
+        return {
+            "category": classic.get("category", "未分類"),
+            "tags": list(dict.fromkeys(classic.get("tags", []))),
+            "chapters": classic.get("chapter_count", 0),
+            "characters": classic.get("total_characters", 0),
+            "completed": status.get("completed_chapters", 0)
+        }
+
+    def _apply(self, classic: Dict, sign: int) -> None:
+        contribution = self._contribution(classic)
+        buckets = [self.totals, self.categories.setdefault(contribution["category"], _empty_bucket())]
+        buckets.extend(self.tags.setdefault(tag, _empty_bucket()) for tag in contribution["tags"])
+
+        for bucket in buckets:
+            bucket["count"] += sign
+            bucket["chapters"] += sign * contribution["chapters"]
+            bucket["characters"] += sign * contribution["characters"]
+            bucket["completed"] += sign * contribution["completed"]
+
+        if sign < 0:
+            # 移除已沒有經典的分類與標籤
+            if self.categories[contribution["category"]]["count"] <= 0:
+                del self.categories[contribution["category"]]
+            for tag in contribution["tags"]:
+                if self.tags[tag]["count"] <= 0:
+                    del self.tags[tag]
+
+    def add(self, classic: Dict) -> None:
+        """計入一部經典"""
+        self._apply(classic, 1)
+
+    def remove(self, classic: Dict) -> None:
+        """移除一部經典的貢獻"""
+        self._apply(classic, -1)
+
+    def replace(self, old: Optional[Dict], new: Optional[Dict]) -> None:
+        """以新記錄取代舊記錄（任一方為 None 表示新增或刪除）"""
+        if old is not None:
+            self.remove(old)
+        if new is not None:
+            self.add(new)
+
+    def overall_progress(self) -> Dict:
+        """整體翻譯進度"""
+        total = self.totals["chapters"]
+        completed = self.totals["completed"]
+        return {
+            "total_chapters": total,
+            "completed_chapters": completed,
+            "completion_percentage": round(completed / total * 100, 1) if total > 0 else 0
+        }
+
+    def to_dict(self) -> Dict:
+        """可寫入中繼資料的結構"""
+        return {
+            "totals": dict(self.totals),
+            "categories": {name: dict(bucket) for name, bucket in self.categories.items()},
+            "tags": {name: dict(bucket) for name, bucket in self.tags.items()}
+        }
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CatalogueAggregates) and self.to_dict() == other.to_dict()
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 經典目錄儲存後端
+
+ClassicTracker 透過 CatalogueStore 介面存取經典、章節、標籤與翻譯狀態：
+- JsonCatalogueStore:   原有的 data/tracking/classics.json（整份載入記憶體，
+                        經預寫檔原子性寫入）
+- SqliteCatalogueStore: data/tracking/classics.db，以索引表格儲存，WAL 模式；
+                        開啟時不載入整個目錄，依分類/標籤/章節的查詢走索引
+
+open_catalogue_store 依 backend 名稱建立後端；未指定時若已有 classics.db
+則使用 SQLite，否則使用 JSON。首次建立 SQLite 目錄時自動由 classics.json 匯入。
+"""
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.unicode_handler import safe_print
+
+
+CATALOGUE_BACKENDS = ('json', 'sqlite')
+
+
+def create_empty_metadata() -> Dict:
+    """創建空的目錄中繼資料"""
+    return {
+        "created": datetime.now().isoformat(),
+        "last_updated": datetime.now().isoformat(),
+        "version": "2.0",
+        "total_classics": 0,
+        "total_chapters": 0,
+        "total_characters": 0
+    }
+
+
+class CatalogueStore(ABC):
+    """經典目錄儲存介面"""
+
+    @abstractmethod
+    def get_metadata(self) -> Dict:
+        """目錄中繼資料（統計數字、版本、更新時間）"""
+
+    @abstractmethod
+    def update_metadata(self, fields: Dict) -> None:
+        """更新中繼資料欄位"""
+
+    @abstractmethod
+    def get_classic(self, classic_id: str) -> Optional[Dict]:
+        """獲取單一經典的完整記錄"""
+
+    @abstractmethod
+    def put_classic(self, classic_id: str, record: Dict) -> None:
+        """新增或取代經典記錄（含章節、標籤與翻譯狀態）"""
+
+    @abstractmethod
+    def iter_classics(self) -> Iterator[Tuple[str, Dict]]:
+        """逐一列出 (經典ID, 記錄)"""
+
+    @abstractmethod
+    def classics_by_category(self, category: str) -> List[Dict]:
+        """依分類列出經典記錄"""
+
+    @abstractmethod
+    def classics_by_tag(self, tag: str) -> List[Dict]:
+        """依標籤列出經典記錄"""
+
+    @abstractmethod
+    def get_chapter_hash(self, classic_id: str, chapter_number: int) -> Optional[str]:
+        """章節內容的雜湊（未記錄時為 None）"""
+
+    @abstractmethod
+    def update_translation_status(self, classic_id: str, fields: Dict) -> None:
+        """更新經典的翻譯狀態欄位"""
+
+    @abstractmethod
+    def aggregate_totals(self) -> Dict:
+        """重新計算經典數、章節數與字數總計"""
+
+    @abstractmethod
+    def save(self) -> None:
+        """持久化修改（在 transaction() 中時延後到交易結束）"""
+
+    @abstractmethod
+    def transaction(self):
+        """交易（context manager）：區塊內的修改在結束時一次持久化，發生例外時全部回復"""
+
+    def to_dict(self) -> Dict:
+        """以 classics.json 的結構匯出整個目錄"""
+        return {
+            "metadata": self.get_metadata(),
+            "classics": dict(self.iter_classics())
+        }
+
+    def close(self) -> None:
+        pass
+
+
+class JsonCatalogueStore(CatalogueStore):
+    """
+    classics.json 後端
+
+    寫入流程：先完整寫入並同步 classics.json.wal，再以 rename 原子性地取代
+    classics.json。載入時若發現完整的 .wal（上次在 rename 前中斷）會先套用；
+    主檔損壞時改名保留，不會以空資料覆蓋。
+    """
+
+    def __init__(self, data_dir: Path, compact: bool = False):
+        self.data_dir = Path(data_dir)
+        self.tracker_file = self.data_dir / "classics.json"
+        self.wal_file = self.data_dir / "classics.json.wal"
+        self.compact = compact
+
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """載入追蹤資料（必要時由預寫檔恢復）"""
+        with self._lock:
+            self._recover_from_wal()
+
+            if self.tracker_file.exists():
+                try:
+                    with open(self.tracker_file, 'r', encoding='utf-8') as f:
+                        self.data = json.load(f)
+                    return
+                except json.JSONDecodeError:
+                    # 保留損壞的檔案，避免下次儲存時以空資料覆蓋整個目錄
+                    corrupt_file = self.tracker_file.with_name(
+                        f"classics.corrupt-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+                    os.replace(self.tracker_file, corrupt_file)
+                    safe_print(f"⚠️  追蹤資料損壞，已保留為 {corrupt_file.name}")
+                except FileNotFoundError:
+                    pass
+
+            self.data = {"metadata": create_empty_metadata(), "classics": {}}
+
+    def _recover_from_wal(self) -> None:
+        """套用上次未完成的預寫檔；不完整的預寫檔直接捨棄"""
+        if not self.wal_file.exists():
+            return
+
+        try:
+            with open(self.wal_file, 'r', encoding='utf-8') as f:
+                json.load(f)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # 預寫檔在寫入途中中斷，主檔仍是上一個完整版本
+            self.wal_file.unlink()
+            return
+
+        os.replace(self.wal_file, self.tracker_file)
+        safe_print("♻️  已由預寫檔恢復追蹤資料")
+
+    def get_metadata(self) -> Dict:
+        return self.data.setdefault("metadata", create_empty_metadata())
+
+    def update_metadata(self, fields: Dict) -> None:
+        self.get_metadata().update(fields)
+
+    def get_classic(self, classic_id: str) -> Optional[Dict]:
+        return self.data["classics"].get(classic_id)
+
+    def put_classic(self, classic_id: str, record: Dict) -> None:
+        self.data["classics"][classic_id] = record
+
+    def iter_classics(self) -> Iterator[Tuple[str, Dict]]:
+        return iter(list(self.data["classics"].items()))
+
+    def classics_by_category(self, category: str) -> List[Dict]:
+        return [
+            classic for classic in self.data["classics"].values()
+            if classic.get("category") == category
+        ]
+
+    def classics_by_tag(self, tag: str) -> List[Dict]:
+        return [
+            classic for classic in self.data["classics"].values()
+            if tag in classic.get("tags", [])
+        ]
+
+    def get_chapter_hash(self, classic_id: str, chapter_number: int) -> Optional[str]:
+        classic = self.data["classics"].get(classic_id)
+        if not classic:
+            return None
+        for chapter in classic.get("chapters", []):
+            if chapter.get("number") == chapter_number:
+                return chapter.get("file_hash")
+        return None
+
+    def update_translation_status(self, classic_id: str, fields: Dict) -> None:
+        self.data["classics"][classic_id]["translation_status"].update(fields)
+
+    def aggregate_totals(self) -> Dict:
+        classics = self.data["classics"].values()
+        return {
+            "total_classics": len(self.data["classics"]),
+            "total_chapters": sum(classic["chapter_count"] for classic in classics),
+            "total_characters": sum(classic["total_characters"] for classic in classics)
+        }
+
+    def save(self) -> None:
+        with self._lock:
+            if self._depth > 0:
+                self._dirty = True
+                return
+            self._write_data()
+
+    def _write_data(self) -> None:
+        """經預寫檔原子性地寫入 classics.json（呼叫者需持有鎖）"""
+        if self.compact:
+            serialized = json.dumps(self.data, ensure_ascii=False, separators=(',', ':'))
+        else:
+            serialized = json.dumps(self.data, ensure_ascii=False, indent=2)
+
+        with open(self.wal_file, 'w', encoding='utf-8') as f:
+            f.write(serialized)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.wal_file, self.tracker_file)
+        self._dirty = False
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            snapshot = copy.deepcopy(self.data) if self._depth == 0 else None
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                if snapshot is not None:
+                    self.data = snapshot
+                    self._dirty = False
+                raise
+            finally:
+                self._depth -= 1
+
+            if self._depth == 0 and self._dirty:
+                self._write_data()
+
+    def to_dict(self) -> Dict:
+        # 直接返回記憶體中的資料，呼叫端的修改在下次 save() 時寫入
+        return self.data
+
+
+# 記錄中由獨立欄位或表格儲存的鍵，其餘鍵存入 extra
+_CLASSIC_COLUMNS = ('folder_name', 'source_dir', 'translation_dir', 'added_time',
+                    'last_modified', 'chapter_count', 'total_characters', 'category', 'status')
+_CHAPTER_COLUMNS = ('title', 'file_size', 'char_count', 'file_hash', 'added_time')
+_STATUS_COLUMNS = ('completed_chapters', 'total_chapters', 'completion_percentage',
+                   'last_translation_update')
+_CLASSIC_KEYS = set(_CLASSIC_COLUMNS) | {'book_info', 'chapters', 'translation_status', 'tags'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS classics (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    author TEXT,
+    book_info TEXT NOT NULL,
+    folder_name TEXT,
+    source_dir TEXT,
+    translation_dir TEXT,
+    added_time TEXT,
+    last_modified TEXT,
+    chapter_count INTEGER DEFAULT 0,
+    total_characters INTEGER DEFAULT 0,
+    category TEXT,
+    status TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_classics_category ON classics(category);
+CREATE INDEX IF NOT EXISTS idx_classics_added_time ON classics(added_time);
+CREATE TABLE IF NOT EXISTS chapters (
+    classic_id TEXT NOT NULL REFERENCES classics(id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    title TEXT,
+    file_size INTEGER,
+    char_count INTEGER,
+    file_hash TEXT,
+    added_time TEXT,
+    extra TEXT,
+    PRIMARY KEY (classic_id, number)
+);
+CREATE TABLE IF NOT EXISTS tags (
+    classic_id TEXT NOT NULL REFERENCES classics(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (classic_id, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag);
+CREATE TABLE IF NOT EXISTS translation_status (
+    classic_id TEXT PRIMARY KEY REFERENCES classics(id) ON DELETE CASCADE,
+    completed_chapters INTEGER DEFAULT 0,
+    total_chapters INTEGER DEFAULT 0,
+    completion_percentage REAL DEFAULT 0,
+    last_translation_update TEXT
+);
+"""
+
+
+class SqliteCatalogueStore(CatalogueStore):
+    """classics.db 後端（WAL 模式、索引查詢）"""
+
+    def __init__(self, data_dir: Path, import_json: bool = True):
+        """
+        開啟或建立 SQLite 目錄
+
+        Args:
+            data_dir: 追蹤資料目錄
+            import_json: 新建資料庫時自動匯入同目錄的 classics.json
+        """
+        self.data_dir = Path(data_dir)
+        self.db_file = self.data_dir / "classics.db"
+        is_new = not self.db_file.exists()
+
+        self._lock = threading.RLock()
+        self._depth = 0
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+
+        if is_new:
+            json_file = self.data_dir / "classics.json"
+            if import_json and json_file.exists():
+                self.import_json(json_file)
+            else:
+                self.update_metadata(create_empty_metadata())
+                self.save()
+
+    def import_json(self, json_file: Path) -> int:
+        """
+        由 classics.json 匯入整個目錄（取代現有內容）
+
+        Returns:
+            int: 匯入的經典數
+        """
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        with self.transaction():
+            self.conn.execute("DELETE FROM classics")
+            self.conn.execute("DELETE FROM metadata")
+            metadata = create_empty_metadata()
+            metadata.update(data.get("metadata", {}))
+            metadata["imported_from_json"] = datetime.now().isoformat()
+            self.update_metadata(metadata)
+            for classic_id, record in data.get("classics", {}).items():
+                self.put_classic(classic_id, record)
+
+        count = len(data.get("classics", {}))
+        safe_print(f"📦 已由 {json_file.name} 匯入 {count} 部經典到 {self.db_file.name}")
+        return count
+
+    def get_metadata(self) -> Dict:
+        with self._lock:
+            rows = self.conn.execute("SELECT key, value FROM metadata").fetchall()
+        return {row["key"]: json.loads(row["value"]) for row in rows}
+
+    def update_metadata(self, fields: Dict) -> None:
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False)) for key, value in fields.items()]
+            )
+
+    def put_classic(self, classic_id: str, record: Dict) -> None:
+        book_info = record.get("book_info", {})
+        extra = {k: v for k, v in record.items() if k not in _CLASSIC_KEYS}
+
+        with self._lock:
+            # 先刪除舊記錄，章節、標籤與翻譯狀態經外鍵一併刪除
+            self.conn.execute("DELETE FROM classics WHERE id = ?", (classic_id,))
+            self.conn.execute(
+                "INSERT INTO classics (id, title, author, book_info, " + ", ".join(_CLASSIC_COLUMNS) +
+                ", extra) VALUES (?, ?, ?, ?, " + ", ".join("?" * len(_CLASSIC_COLUMNS)) + ", ?)",
+                (classic_id, book_info.get("title"), book_info.get("author"),
+                 json.dumps(book_info, ensure_ascii=False),
+                 *(record.get(column) for column in _CLASSIC_COLUMNS),
+                 json.dumps(extra, ensure_ascii=False) if extra else None)
+            )
+
+            chapter_rows = []
+            for chapter in record.get("chapters", []):
+                chapter_extra = {k: v for k, v in chapter.items()
+                                 if k != 'number' and k not in _CHAPTER_COLUMNS}
+                chapter_rows.append((
+                    classic_id, chapter["number"],
+                    *(chapter.get(column) for column in _CHAPTER_COLUMNS),
+                    json.dumps(chapter_extra, ensure_ascii=False) if chapter_extra else None
+                ))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO chapters (classic_id, number, " + ", ".join(_CHAPTER_COLUMNS) +
+                ", extra) VALUES (?, ?, " + ", ".join("?" * len(_CHAPTER_COLUMNS)) + ", ?)",
+                chapter_rows
+            )
+
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tags (classic_id, tag, position) VALUES (?, ?, ?)",
+                [(classic_id, tag, position) for position, tag in enumerate(record.get("tags", []))]
+            )
+
+            status = record.get("translation_status", {})
+            self.conn.execute(
+                "INSERT INTO translation_status (classic_id, " + ", ".join(_STATUS_COLUMNS) +
+                ") VALUES (?, ?, ?, ?, ?)",
+                (classic_id, *(status.get(column) for column in _STATUS_COLUMNS))
+            )
+
+    def _build_records(self, rows: List[sqlite3.Row]) -> List[Tuple[str, Dict]]:
+        """由 classics 資料列組裝完整記錄（章節、標籤與狀態各以一次查詢取得）"""
+        if not rows:
+            return []
+
+        ids = [row["id"] for row in rows]
+        placeholders = ", ".join("?" * len(ids))
+
+        chapters = {classic_id: [] for classic_id in ids}
+        for row in self.conn.execute(
+                f"SELECT * FROM chapters WHERE classic_id IN ({placeholders}) "
+                "ORDER BY classic_id, number", ids):
+            chapter = {"number": row["number"]}
+            chapter.update({column: row[column] for column in _CHAPTER_COLUMNS})
+            if row["extra"]:
+                chapter.update(json.loads(row["extra"]))
+            chapters[row["classic_id"]].append(chapter)
+
+        tags = {classic_id: [] for classic_id in ids}
+        for row in self.conn.execute(
+                f"SELECT classic_id, tag FROM tags WHERE classic_id IN ({placeholders}) "
+                "ORDER BY classic_id, position", ids):
+            tags[row["classic_id"]].append(row["tag"])
+
+        statuses = {}
+        for row in self.conn.execute(
+                f"SELECT * FROM translation_status WHERE classic_id IN ({placeholders})", ids):
+            statuses[row["classic_id"]] = {column: row[column] for column in _STATUS_COLUMNS}
+
+        records = []
+        for row in rows:
+            classic_id = row["id"]
+            record = {
+                "book_info": json.loads(row["book_info"]),
+                "folder_name": row["folder_name"],
+                "source_dir": row["source_dir"],
+                "translation_dir": row["translation_dir"],
+                "added_time": row["added_time"],
+                "last_modified": row["last_modified"],
+                "chapter_count": row["chapter_count"],
+                "total_characters": row["total_characters"],
+                "chapters": chapters[classic_id],
+                "translation_status": statuses.get(classic_id, {}),
+                "tags": tags[classic_id],
+                "category": row["category"],
+                "status": row["status"]
+            }
+            if row["extra"]:
+                record.update(json.loads(row["extra"]))
+            records.append((classic_id, record))
+        return records
+
+    def _query_classics(self, where: str = "", params: tuple = ()) -> List[Tuple[str, Dict]]:
+        with self._lock:
+            rows = self.conn.execute(f"SELECT * FROM classics {where}", params).fetchall()
+            return self._build_records(rows)
+
+    def get_classic(self, classic_id: str) -> Optional[Dict]:
+        records = self._query_classics("WHERE id = ?", (classic_id,))
+        return records[0][1] if records else None
+
+    def iter_classics(self) -> Iterator[Tuple[str, Dict]]:
+        # 分批讀取，避免一次組裝整個目錄
+        last_id = ""
+        while True:
+            records = self._query_classics("WHERE id > ? ORDER BY id LIMIT 200", (last_id,))
+            if not records:
+                return
+            yield from records
+            last_id = records[-1][0]
+
+    def classics_by_category(self, category: str) -> List[Dict]:
+        return [record for _, record in self._query_classics("WHERE category = ?", (category,))]
+
+    def classics_by_tag(self, tag: str) -> List[Dict]:
+        return [record for _, record in self._query_classics(
+            "WHERE id IN (SELECT classic_id FROM tags WHERE tag = ?)", (tag,))]
+
+    def get_chapter_hash(self, classic_id: str, chapter_number: int) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT file_hash FROM chapters WHERE classic_id = ? AND number = ?",
+                (classic_id, chapter_number)
+            ).fetchone()
+        return row["file_hash"] if row else None
+
+    def update_translation_status(self, classic_id: str, fields: Dict) -> None:
+        columns = [column for column in _STATUS_COLUMNS if column in fields]
+        if not columns:
+            return
+        with self._lock:
+            self.conn.execute(
+                "UPDATE translation_status SET " + ", ".join(f"{c} = ?" for c in columns) +
+                " WHERE classic_id = ?",
+                (*(fields[column] for column in columns), classic_id)
+            )
+
+    def aggregate_totals(self) -> Dict:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) AS classics, COALESCE(SUM(chapter_count), 0) AS chapters, "
+                "COALESCE(SUM(total_characters), 0) AS characters FROM classics"
+            ).fetchone()
+        return {
+            "total_classics": row["classics"],
+            "total_chapters": row["chapters"],
+            "total_characters": row["characters"]
+        }
+
+    def save(self) -> None:
+        with self._lock:
+            if self._depth == 0:
+                self.conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._depth == 1:
+                    self.conn.rollback()
+                raise
+            finally:
+                self._depth -= 1
+
+            if self._depth == 0:
+                self.conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+
+def open_catalogue_store(data_dir: Path, backend: str = None, **kwargs) -> CatalogueStore:
+    """
+    建立目錄儲存後端
+
+    Args:
+        data_dir: 追蹤資料目錄
+        backend: 'json' 或 'sqlite'；None 時已有 classics.db 則用 SQLite，否則用 JSON
+        kwargs: 傳給後端的參數（如 JSON 後端的 compact）
+
+    Raises:
+        ValueError: 未知的後端名稱
+    """
+    data_dir = Path(data_dir)
+    if backend is None:
+        backend = 'sqlite' if (data_dir / "classics.db").exists() else 'json'
+    if backend not in CATALOGUE_BACKENDS:
+        raise ValueError(f"未知的目錄儲存後端: {backend}（可用: {', '.join(CATALOGUE_BACKENDS)}）")
+
+    if backend == 'sqlite':
+        return SqliteCatalogueStore(data_dir, **{k: v for k, v in kwargs.items() if k == 'import_json'})
+    return JsonCatalogueStore(data_dir, **{k: v for k, v in kwargs.items() if k == 'compact'})
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 章節探測器
+
+並行探測候選章節網址是否存在：
+- 以 HEAD 請求（快取中已有過期項目時附帶條件式標頭）判斷存在與否，
+  不下載不存在章節的頁面內容；快取可直接回應時完全不發送請求
+- 離線模式下只依快取判斷，快取無法回應的網址視為不存在
+- 所有探測共用速率限制器
+- 依候選順序連續未命中達到上限時提前停止
+- 只對命中的網址呼叫 fetch 下載完整內容
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+import requests
+
+from .rate_limiter import RateLimiter
+from .http_cache import ResponseCache, is_offline_mode
+
+
+# 伺服器不支援 HEAD 時改用不讀取內容的 GET
+_HEAD_UNSUPPORTED = {405, 501}
+
+
+class ChapterProber:
+    """並行的章節網址探測器"""
+
+    def __init__(self, session: requests.Session, rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None, max_workers: int = 8,
+                 timeout: float = 5):
+        """
+        初始化探測器
+
+        Args:
+            session: 發送探測請求的會話
+            rate_limiter: 共享的速率限制器，None 表示不限速
+            cache: 回應快取，用於免請求命中與條件式探測
+            max_workers: 同時進行的探測數
+            timeout: 單次探測逾時秒數
+        """
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+
+    def exists(self, url: str) -> bool:
+        """探測單一網址是否存在（狀態碼 200，或快取項目仍有效；離線時只看快取）"""
+        entry = None
+        if self.cache is not None:
+            prepared_url = self.session.prepare_request(requests.Request('GET', url)).url
+            if self.cache.can_serve(prepared_url):
+                return True
+            entry = self.cache.lookup(prepared_url)
+
+        if is_offline_mode():
+            return False
+
+        headers = self.cache.conditional_headers(entry) if entry is not None else {}
+
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            response = self.session.head(url, headers=headers, timeout=self.timeout,
+                                         allow_redirects=True)
+
+            if response.status_code in _HEAD_UNSUPPORTED:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                # stream=True 只讀取狀態列與標頭
+                with self.session.get(url, headers=headers, timeout=self.timeout,
+                                      stream=True) as response:
+                    pass
+
+            return response.status_code == 200 or (
+                response.status_code == 304 and entry is not None)
+
+        except requests.RequestException:
+            return False
+
+    def probe(self, urls: Iterable[str], fetch: Callable[[str], Any] = None,
+              stop_after: Optional[int] = None) -> List[Tuple[str, Any]]:
+        """
+        依序並行探測多個網址
+
+        Args:
+            urls: 候選網址（依預期順序排列）
+            fetch: 命中時在同一工作執行緒中呼叫以下載完整內容
+            stop_after: 依候選順序連續未命中這麼多個即停止，None 表示探測全部
+
+        Returns:
+            依候選順序的 [(網址, fetch 結果或 None), ...]，只包含命中的網址
+        """
+        def task(url: str):
+            if not self.exists(url):
+                return False, None
+            return True, fetch(url) if fetch else None
+
+        hits = []
+        misses = 0
+        candidates = iter(urls)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 只保留 max_workers 個進行中的探測，提前停止時不會浪費太多請求
+            pending = deque()
+            for url in candidates:
+                pending.append((url, executor.submit(task, url)))
+                if len(pending) >= self.max_workers:
+                    break
+
+            while pending:
+                url, future = pending.popleft()
+                found, result = future.result()
+
+                if found:
+                    hits.append((url, result))
+                    misses = 0
+                else:
+                    misses += 1
+                    if stop_after is not None and misses >= stop_after:
+                        for _, other in pending:
+                            other.cancel()
+                        break
+
+                next_url = next(candidates, None)
+                if next_url is not None:
+                    pending.append((next_url, executor.submit(task, next_url)))
+
+        return hits
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 語料索引
+
+docs/source_texts 與 docs/translations 的持久化索引（data/cache/corpus_index.json）：
+書籍 → 章節 → 原文/翻譯路徑、大小、雜湊值、字數與模板標記。
+
+重新整理時只讀取有變更的部分：
+- 目錄 mtime 未變時沿用記錄的檔案列表，不重新列出目錄
+- 檔案的 (大小, mtime_ns) 未變時沿用記錄的結果，不重新讀取
+各工具查詢索引即可，不需要各自走訪目錄、讀取檔案。
+"""
+
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .file_hasher import get_file_hasher
+from .text_stats import count_cjk
+
+
+# 各種翻譯模板中代表「尚未翻譯」的標記
+TEMPLATE_MARKERS = (
+    "[此處應為現代中文翻譯]",
+    "[此處填入現代中文翻譯]",
+    "[請在此處填入翻譯內容]",
+    "🔄 待翻譯",
+)
+
+_ENCODED_MARKERS = [(marker, marker.encode('utf-8')) for marker in TEMPLATE_MARKERS]
+_CHAPTER_NAME = re.compile(r'(\d+)_(.+)')
+# UTF-8 延續位元組，刪除後的長度即為字元數
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+SOURCE_SUBDIR = "原文"
+
+
+class CorpusIndex:
+    """原文與翻譯檔案的增量索引"""
+
+    def __init__(self, source_root: Path = None, translation_root: Path = None,
+                 index_file: Path = None, max_workers: int = 8):
+        """
+        初始化索引（存在時自動載入）
+
+        Args:
+            source_root: 原文根目錄
+            translation_root: 翻譯根目錄
+            index_file: 索引檔案，None 表示不持久化
+            max_workers: 並行讀取變更檔案的執行緒數
+        """
+        self.source_root = Path(source_root or "docs/source_texts")
+        self.translation_root = Path(translation_root or "docs/translations")
+        self.index_file = Path(index_file) if index_file else None
+        self.max_workers = max(1, max_workers)
+
+        self._lock = threading.RLock()
+        self._dirty = False
+        self.load()
+
+    # ---- 持久化 ----
+
+    def load(self) -> None:
+        """載入索引（根目錄不同時捨棄）"""
+        self.data = self._create_empty_index()
+        if self.index_file is None or not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return
+        if (data.get("source_root") == self.source_root.as_posix()
+                and data.get("translation_root") == self.translation_root.as_posix()):
+            self.data = data
+
+    def _create_empty_index(self) -> Dict:
+        return {
+            "version": "1.0",
+            "source_root": self.source_root.as_posix(),
+            "translation_root": self.translation_root.as_posix(),
+            "last_refreshed": None,
+            "books": {}
+        }
+
+    def save(self) -> None:
+        """原子性地儲存索引（沒有變更時不寫入）"""
+        if self.index_file is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            serialized = json.dumps(self.data, ensure_ascii=False, separators=(',', ':'))
+            self._dirty = False
+
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.index_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(serialized)
+        os.replace(temp_file, self.index_file)
+
+    # ---- 重新整理 ----
+
+    def refresh(self, check_files: bool = True) -> Dict:
+        """
+        增量更新索引並儲存
+
+        Args:
+            check_files: 逐一檢查檔案的大小與 mtime；False 時只依目錄 mtime 判斷
+                （只關心檔案列表時使用，不會發現就地修改的檔案內容）
+
+        Returns:
+            {"books": 書籍數, "rescanned_dirs": 重新列出的目錄數, "read_files": 重新讀取的檔案數}
+        """
+        with self._lock:
+            books = self.data["books"]
+            book_ids = set(self._list_dirs(self.source_root)) | set(self._list_dirs(self.translation_root))
+
+            for book_id in list(books):
+                if book_id not in book_ids:
+                    del books[book_id]
+                    self._dirty = True
+
+            stats = {"books": len(book_ids), "rescanned_dirs": 0, "read_files": 0}
+            stale = []
+            for book_id in sorted(book_ids):
+                book = books.setdefault(book_id, self._create_empty_book(book_id))
+                stale.extend(self._refresh_book(book, check_files, stats))
+
+            if stale:
+                workers = min(self.max_workers, len(stale))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for chapter, fields in executor.map(self._read_entry, stale):
+                        chapter.update(fields)
+                stats["read_files"] = len(stale)
+                self._dirty = True
+
+            if self._dirty:
+                self.data["last_refreshed"] = datetime.now().isoformat()
+        self.save()
+        return stats
+
+    def update_files(self, paths: Iterable[Path]) -> int:
+        """
+        只更新指定的檔案（檔案監看器回報變更時使用），不走訪其他目錄
+
+        Returns:
+            重新讀取的檔案數
+        """
+        with self._lock:
+            stale = []
+            for path in paths:
+                located = self._locate(Path(path))
+                if located is None:
+                    continue
+                book_id, kind, stem = located
+                book = self.data["books"].setdefault(book_id, self._create_empty_book(book_id))
+                chapter = book["chapters"].setdefault(stem, {})
+                self._dirty = True
+
+                file_path = Path(book[f"{kind}_dir"]) / Path(path).name
+                if not file_path.is_file():
+                    self._clear_side(chapter, kind)
+                    if not chapter.get("source") and not chapter.get("translation"):
+                        del book["chapters"][stem]
+                    continue
+                chapter[kind] = file_path.as_posix()
+                stale.append((chapter, kind, chapter[kind]))
+
+            for item in stale:
+                chapter, fields = self._read_entry(item)
+                chapter.update(fields)
+        self.save()
+        return len(stale)
+
+    def _locate(self, path: Path) -> Optional[tuple]:
+        """路徑對應的 (書籍ID, 'source' | 'translation', 檔名主幹)，不屬於索引時返回 None"""
+        path = Path(os.path.abspath(path))
+        for kind, root, suffix, depth in (("source", self.source_root, ".txt", 3),
+                                          ("translation", self.translation_root, ".md", 2)):
+            try:
+                parts = path.relative_to(os.path.abspath(root)).parts
+            except ValueError:
+                continue
+            if len(parts) != depth or path.suffix != suffix:
+                return None
+            if kind == "source" and parts[1] != SOURCE_SUBDIR:
+                return None
+            return parts[0], kind, path.stem
+        return None
+
+    @staticmethod
+    def _list_dirs(root: Path) -> List[str]:
+        try:
+            with os.scandir(root) as entries:
+                return [entry.name for entry in entries if entry.is_dir()]
+        except OSError:
+            return []
+
+    def _create_empty_book(self, book_id: str) -> Dict:
+        return {
+            "source_dir": (self.source_root / book_id / SOURCE_SUBDIR).as_posix(),
+            "translation_dir": (self.translation_root / book_id).as_posix(),
+            "source_dir_mtime_ns": None,
+            "translation_dir_mtime_ns": None,
+            "chapters": {}
+        }
+
+    def _refresh_book(self, book: Dict, check_files: bool, stats: Dict) -> List:
+        """更新單本書的檔案列表，返回需要重新讀取的 [(章節, 種類, 路徑)]"""
+        stale = []
+        chapters = book["chapters"]
+
+        for kind, directory, suffix in (("source", book["source_dir"], ".txt"),
+                                        ("translation", book["translation_dir"], ".md")):
+            try:
+                dir_mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                dir_mtime = None
+
+            if dir_mtime == book[f"{kind}_dir_mtime_ns"] and not check_files:
+                continue
+
+            if dir_mtime != book[f"{kind}_dir_mtime_ns"]:
+                stats["rescanned_dirs"] += 1
+                book[f"{kind}_dir_mtime_ns"] = dir_mtime
+                self._dirty = True
+                listed = self._list_files(directory, suffix) if dir_mtime is not None else {}
+                for stem, chapter in list(chapters.items()):
+                    if chapter.get(kind) and stem not in listed:
+                        self._clear_side(chapter, kind)
+                        if not chapter.get("source") and not chapter.get("translation"):
+                            del chapters[stem]
+                for stem, path in listed.items():
+                    chapter = chapters.setdefault(stem, {})
+                    chapter[kind] = path
+
+            for stem, chapter in chapters.items():
+                path = chapter.get(kind)
+                if not path:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if (chapter.get(f"{kind}_size") != stat.st_size
+                        or chapter.get(f"{kind}_mtime_ns") != stat.st_mtime_ns):
+                    stale.append((chapter, kind, path))
+
+        return stale
+
+    @staticmethod
+    def _list_files(directory: str, suffix: str) -> Dict[str, str]:
+        files = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(suffix) and entry.is_file():
+                        files[entry.name[:-len(suffix)]] = Path(directory, entry.name).as_posix()
+        except OSError:
+            pass
+        return files
+
+    @staticmethod
+    def _clear_side(chapter: Dict, kind: str) -> None:
+        for key in [key for key in chapter if key == kind or key.startswith(f"{kind}_")]:
+            del chapter[key]
+        if kind == "source":
+            chapter.pop("char_count", None)
+        else:
+            chapter.pop("markers", None)
+
+    @staticmethod
+    def _read_entry(item):
+        """讀取一個變更的檔案（在工作執行緒中執行）"""
+        chapter, kind, path = item
+        try:
+            stat = os.stat(path)
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return chapter, {}
+
+        fields = {f"{kind}_size": stat.st_size, f"{kind}_mtime_ns": stat.st_mtime_ns}
+        if kind == "source":
+            hasher = get_file_hasher()
+            digest = hasher.hash_bytes(data)
+            hasher.record(path, digest)
+            fields["source_hash"] = digest
+            fields["char_count"] = count_cjk(data.decode('utf-8', errors='replace'))
+        else:
+            fields["markers"] = [marker for marker, encoded in _ENCODED_MARKERS if encoded in data]
+            fields["translation_chars"] = len(data.translate(None, _CONTINUATION_BYTES))
+        return chapter, fields
+
+    # ---- 查詢 ----
+
+    def book_ids(self, with_source: bool = False) -> List[str]:
+        """所有書籍ID（with_source 時只列出有原文目錄的書籍）"""
+        return [book_id for book_id, book in sorted(self.data["books"].items())
+                if not with_source or book["source_dir_mtime_ns"] is not None]
+
+    def get_book(self, book_id: str) -> Optional[Dict]:
+        """書籍記錄"""
+        return self.data["books"].get(book_id)
+
+    def chapters(self, book_id: str) -> List[Dict]:
+        """書籍的章節列表（依檔名排序），每項包含 stem、number 與 title"""
+        book = self.get_book(book_id)
+        if book is None:
+            return []
+        result = []
+        for stem, chapter in sorted(book["chapters"].items()):
+            match = _CHAPTER_NAME.match(stem)
+            result.append(dict(chapter, stem=stem,
+                               number=match.group(1) if match else None,
+                               title=match.group(2) if match else stem))
+        return result
+
+    def source_chapters(self, book_id: str) -> List[Dict]:
+        """有原文檔案的章節"""
+        return [chapter for chapter in self.chapters(book_id) if chapter.get("source")]
+
+    def get_chapter(self, book_id: str, stem: str) -> Optional[Dict]:
+        """以檔名（不含副檔名）查詢章節"""
+        book = self.get_book(book_id)
+        return book["chapters"].get(stem) if book else None
+
+    def has_translations(self, book_id: str) -> bool:
+        """書籍是否已有任何翻譯檔案"""
+        book = self.get_book(book_id)
+        return bool(book) and any(chapter.get("translation") for chapter in book["chapters"].values())
+
+    @staticmethod
+    def has_markers(chapter: Optional[Dict], markers=TEMPLATE_MARKERS) -> bool:
+        """章節的翻譯檔案是否包含任一指定的模板標記"""
+        return bool(chapter) and any(marker in chapter.get("markers", ()) for marker in markers)
+
+    def template_files(self, markers=TEMPLATE_MARKERS) -> List[Path]:
+        """仍包含模板標記的翻譯檔案"""
+        return [Path(chapter["translation"])
+                for book_id in self.book_ids()
+                for chapter in self.chapters(book_id)
+                if chapter.get("translation") and self.has_markers(chapter, markers)]
+
+
+# 全域索引實例
+_index_instance = None
+
+def get_corpus_index() -> CorpusIndex:
+    """獲取共享的語料索引"""
+    global _index_instance
+    if _index_instance is None:
+        _index_instance = CorpusIndex(index_file=Path("data/cache/corpus_index.json"))
+    return _index_instance
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 檔案雜湊服務
+
+ClassicTracker、FileMonitor 與 TranslationEngine 共用的檔案雜湊：
+- 以固定大小的區塊串流讀取，不將整個檔案載入記憶體
+- 已安裝 xxhash 時使用 xxh3_128，否則使用標準庫的 BLAKE2b（16 位元組摘要）
+- 依 (路徑, 大小, mtime_ns) 記憶結果並保存到 data/cache/file_hashes.json，
+  跨執行期間未變更的檔案不會重新讀取
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def default_algorithm() -> str:
+    """可用的最快演算法"""
+    return 'xxh3_128' if xxhash is not None else 'blake2b'
+
+
+class FileHasher:
+    """帶持久化快取的串流檔案雜湊器（執行緒安全）"""
+
+    def __init__(self, cache_file: Path = None, algorithm: str = None,
+                 chunk_size: int = CHUNK_SIZE):
+        """
+        初始化雜湊器
+
+        Args:
+            cache_file: 快取檔案，None 表示只在記憶體中快取
+            algorithm: 'xxh3_128'、'blake2b' 或 hashlib 支援的名稱（如 'md5'）
+            chunk_size: 每次讀取的位元組數
+        """
+        self.algorithm = algorithm or default_algorithm()
+        if self.algorithm == 'xxh3_128' and xxhash is None:
+            raise ImportError("xxh3_128 需要 xxhash，請執行 pip install xxhash")
+        self.chunk_size = chunk_size
+        self.cache_file = Path(cache_file) if cache_file else None
+
+        self._entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load_cache()
+
+    def _new_hash(self):
+        if self.algorithm == 'xxh3_128':
+            return xxhash.xxh3_128()
+        if self.algorithm == 'blake2b':
+            return hashlib.blake2b(digest_size=16)
+        return hashlib.new(self.algorithm)
+
+    def load_cache(self) -> None:
+        """載入快取（演算法不同時捨棄）"""
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return
+        if data.get("algorithm") == self.algorithm:
+            self._entries = data.get("entries", {})
+
+    def save_cache(self) -> None:
+        """原子性地儲存快取（沒有變更時不寫入）"""
+        if self.cache_file is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            # 移除已不存在的檔案
+            self._entries = {path: entry for path, entry in self._entries.items()
+                             if os.path.exists(path)}
+            data = {"algorithm": self.algorithm, "entries": self._entries}
+            self._dirty = False
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.cache_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, self.cache_file)
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return os.path.abspath(path)
+
+    def hash_bytes(self, data: bytes) -> str:
+        """計算位元組內容的雜湊值（與 hash_file 結果一致）"""
+        hasher = self._new_hash()
+        hasher.update(data)
+        return hasher.hexdigest()
+
+    def hash_file(self, file_path: Union[str, Path]) -> Optional[str]:
+        """
+        計算檔案雜湊值，檔案自上次計算後未變更時直接返回快取
+
+        Returns:
+            雜湊值；檔案不存在或無法讀取時返回 None
+        """
+        key = self._key(file_path)
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+
+        hasher = self._new_hash()
+        try:
+            with open(key, 'rb') as f:
+                for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                    hasher.update(chunk)
+        except OSError:
+            return None
+
+        digest = hasher.hexdigest()
+        self._remember(key, stat, digest)
+        return digest
+
+    def record(self, file_path: Union[str, Path], digest: str) -> None:
+        """登記剛寫入的檔案雜湊值（呼叫者已知內容），之後不需再讀取該檔案"""
+        key = self._key(file_path)
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return
+        self._remember(key, stat, digest)
+
+    def _remember(self, key: str, stat: os.stat_result, digest: str) -> None:
+        with self._lock:
+            self._entries[key] = [stat.st_size, stat.st_mtime_ns, digest]
+            self._dirty = True
+
+    def clear(self) -> None:
+        """清空快取"""
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+
+
+# 全域雜湊器實例
+_hasher_instance = None
+
+def get_file_hasher() -> FileHasher:
+    """獲取共享的檔案雜湊器，程式結束時自動保存快取"""
+    global _hasher_instance
+    if _hasher_instance is None:
+        _hasher_instance = FileHasher(Path("data/cache/file_hashes.json"))
+        atexit.register(_hasher_instance.save_cache)
+    return _hasher_instance
@@ -1,71 +1,238 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-from core.unicode_handler import safe_print
 道教經典翻譯系統 - 檔案監控核心
 
 整合原有的 file_tracker.py 功能，提供統一的檔案監控介面
+
+操作記錄以僅追加的 JSONL 格式（每行一筆）寫入 data/logs/file_operations.jsonl：
+- 寫入先進入緩衝區，累積到 flush_threshold 筆、經過 flush_interval 秒、
+  離開 with 區塊或程式結束時才一次追加到檔案
+- 日誌超過 max_log_bytes 時輪替為 file_operations.1.jsonl ...，
+  最多保留 max_rotated 個舊檔
+- 查詢以逐行串流方式讀取，不將整個日誌載入記憶體；統計計數器只在首次查詢時
+  讀取一次日誌，之後隨每筆操作增量更新
+
+start_watching() 另外監看原文與翻譯目錄，將外部（如編輯器）造成的變更
+記錄為操作、更新雜湊與語料索引，並通知已登記的監聽器。
 """
 
+import atexit
 import json
-import hashlib
+import os
+import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Any
+
+from core.unicode_handler import safe_print
+from core.file_hasher import get_file_hasher
+from core.file_watcher import FileWatcher, CREATED, DELETED
+from core.corpus_index import get_corpus_index
 
 
 class FileMonitor:
     """檔案監控器核心類"""
     
-    def __init__(self, data_dir: Path = None):
-        """初始化檔案監控器"""
+    # 增量統計中保留的最近操作數
+    RECENT_LIMIT = 50
+    
+    def __init__(self, data_dir: Path = None, flush_threshold: int = 50,
+                 flush_interval: float = 5.0, max_log_bytes: int = 5 * 1024 * 1024,
+                 max_rotated: int = 3):
+        """
+        初始化檔案監控器
+        
+        Args:
+            data_dir: 日誌目錄
+            flush_threshold: 緩衝區累積多少筆操作時立即寫入
+            flush_interval: 緩衝的操作最多延遲多少秒寫入
+            max_log_bytes: 日誌檔超過此大小時輪替
+            max_rotated: 保留的輪替舊檔數
+        """
         self.data_dir = data_dir or Path("data/logs")
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-        self.log_file = self.data_dir / "file_operations.json"
+        self.log_file = self.data_dir / "file_operations.jsonl"
+        self.meta_file = self.data_dir / "file_operations.meta.json"
+        self.legacy_log_file = self.data_dir / "file_operations.json"
+        
+        self.flush_threshold = max(1, flush_threshold)
+        self.flush_interval = flush_interval
+        self.max_log_bytes = max_log_bytes
+        self.max_rotated = max_rotated
+        
+        self._buffer = []
+        self._lock = threading.RLock()
+        self._timer = None
+        
+        # 增量統計計數器（首次查詢時建立）、建立時磁碟上的操作總數與日誌檔狀態
+        self._counters = None
+        self._counted_disk_total = None
+        self._counted_log_stat = None
+        
+        self._watcher = None
+        self._listeners = []
+        # 本程式自己寫入的檔案雜湊值，監看到相同內容時不重複記錄
+        self._known_hashes = {}
+        
         self.load_log_data()
+        atexit.register(self.flush)
+        
+    def __enter__(self) -> "FileMonitor":
+        return self
+        
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
         
     def load_log_data(self) -> None:
-        """載入日誌資料"""
-        if self.log_file.exists():
+        """載入日誌中繼資料（舊版 JSON 日誌會先轉換為 JSONL）"""
+        if self.legacy_log_file.exists() and not self.log_file.exists():
+            self._migrate_legacy_log()
+            
+        self.metadata = self._read_metadata() or self._create_empty_metadata()
+        
+    def _read_metadata(self) -> Optional[Dict]:
+        """讀取磁碟上的中繼資料"""
+        if self.meta_file.exists():
             try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    self.log_data = json.load(f)
+                with open(self.meta_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
             except (json.JSONDecodeError, FileNotFoundError):
-                self.log_data = self._create_empty_log()
-        else:
-            self.log_data = self._create_empty_log()
+                pass
+        return None
             
-    def _create_empty_log(self) -> Dict:
-        """創建空的日誌資料結構"""
+    def _create_empty_metadata(self) -> Dict:
+        """創建空的日誌中繼資料"""
         return {
-            "metadata": {
-                "created": datetime.now().isoformat(),
-                "last_updated": datetime.now().isoformat(),
-                "version": "2.0",
-                "total_operations": 0
-            },
-            "operations": []
+            "created": datetime.now().isoformat(),
+            "last_updated": datetime.now().isoformat(),
+            "version": "3.0",
+            "total_operations": 0
         }
         
+    def _migrate_legacy_log(self) -> None:
+        """將舊版整檔 JSON 日誌轉為 JSONL，原檔改名保留"""
+        try:
+            with open(self.legacy_log_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return
+            
+        with open(self.log_file, 'w', encoding='utf-8') as f:
+            for op in legacy.get("operations", []):
+                f.write(json.dumps(op, ensure_ascii=False) + "\n")
+                
+        metadata = self._create_empty_metadata()
+        metadata.update({k: v for k, v in legacy.get("metadata", {}).items()
+                         if k in ("created", "total_operations")})
+        self.metadata = metadata
+        self._save_metadata()
+        
+        os.replace(self.legacy_log_file, self.legacy_log_file.with_suffix('.json.migrated'))
+        safe_print(f"📦 已將舊版檔案日誌轉換為 {self.log_file.name}")
+            
+    def _save_metadata(self) -> None:
+        """原子性地儲存中繼資料"""
+        self.metadata["last_updated"] = datetime.now().isoformat()
+        temp_file = self.meta_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.metadata, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.meta_file)
+        
     def save_log_data(self) -> None:
-        """儲存日誌資料"""
-        self.log_data["metadata"]["last_updated"] = datetime.now().isoformat()
+        """儲存日誌資料（等同 flush）"""
+        self.flush()
         
-        with open(self.log_file, 'w', encoding='utf-8') as f:
-            json.dump(self.log_data, f, ensure_ascii=False, indent=2)
+    def flush(self) -> None:
+        """將緩衝區中的操作追加到日誌檔"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+                
+            if not self._buffer:
+                return
+                
+            lines = ''.join(json.dumps(op, ensure_ascii=False) + "\n" for op in self._buffer)
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(lines)
+                
+            # 其他實例可能也寫入了同一份日誌，以磁碟上的計數為準
+            disk_metadata = self._read_metadata()
+            if self._disk_total(disk_metadata) != self._counted_disk_total:
+                self._counters = None
+            self.metadata = disk_metadata or self.metadata
+            self.metadata["total_operations"] += len(self._buffer)
+            if self._counters is not None:
+                self._counted_disk_total = self.metadata["total_operations"]
+            self._buffer = []
+            self._save_metadata()
+            
+            if self.log_file.stat().st_size > self.max_log_bytes:
+                self._rotate()
+            # 本實例的寫入已計入統計，日誌檔狀態的這次變更不需重新讀取
+            self._counted_log_stat = self._log_stat()
+                
+    def _rotate(self) -> None:
+        """輪替日誌檔（呼叫者需持有鎖）"""
+        for index in range(self.max_rotated, 0, -1):
+            older = self._rotated_file(index)
+            if index == self.max_rotated:
+                if older.exists():
+                    older.unlink()
+                    # 最舊的記錄已刪除，統計需重建
+                    self._counters = None
+            elif older.exists():
+                os.replace(older, self._rotated_file(index + 1))
+                
+        if self.max_rotated > 0:
+            os.replace(self.log_file, self._rotated_file(1))
+        else:
+            self.log_file.unlink()
+            self._counters = None
+            
+    def _rotated_file(self, index: int) -> Path:
+        return self.data_dir / f"file_operations.{index}.jsonl"
+        
+    def _schedule_flush(self) -> None:
+        """啟動延遲寫入計時器（呼叫者需持有鎖）"""
+        if self._timer is None and self.flush_interval:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+            
+    def iter_operations(self) -> Iterator[Dict]:
+        """由舊到新逐筆讀取所有保留的操作記錄（含尚未寫入的緩衝）"""
+        files = [self._rotated_file(i) for i in range(self.max_rotated, 0, -1)]
+        files.append(self.log_file)
+        
+        for log_file in files:
+            if not log_file.exists():
+                continue
+            with open(log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # 寫入中斷留下的殘行
+                        continue
+                        
+        with self._lock:
+            pending = list(self._buffer)
+        yield from pending
             
     def calculate_file_hash(self, file_path: Path) -> Optional[str]:
-        """計算檔案雜湊值"""
-        try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except Exception:
-            return None
+        """計算檔案雜湊值（經共享的雜湊快取）"""
+        return get_file_hasher().hash_file(file_path)
             
     def track_file_write(self, file_path: Path, file_type: str = "unknown", 
                         details: Dict = None) -> None:
-        """追蹤檔案寫入操作"""
+        """追蹤檔案寫入操作（先寫入緩衝區）"""
         file_path = Path(file_path)
         
         operation = {
@@ -79,14 +246,8 @@ class FileMonitor:
             "details": details or {}
         }
         
-        self.log_data["operations"].append(operation)
-        self.log_data["metadata"]["total_operations"] += 1
-        
-        # 保持日誌大小合理（最多保留1000條記錄）
-        if len(self.log_data["operations"]) > 1000:
-            self.log_data["operations"] = self.log_data["operations"][-1000:]
-            
-        self.save_log_data()
+        self._known_hashes[os.path.abspath(file_path)] = operation["file_hash"]
+        self._record(operation)
         
         safe_print(f"📝 記錄檔案操作: {operation['operation']} - {file_path.name}")
         
@@ -94,6 +255,110 @@ class FileMonitor:
         if self._is_classic_file(file_path):
             self._analyze_classic_file(file_path)
             
+    def _record(self, operation: Dict) -> None:
+        """將操作放入緩衝區並更新統計計數器"""
+        with self._lock:
+            self._buffer.append(operation)
+            if self._counters is not None:
+                self._count(self._counters, operation)
+            if len(self._buffer) >= self.flush_threshold:
+                self.flush()
+            else:
+                self._schedule_flush()
+                
+    def add_listener(self, callback: Callable[[List[Dict]], None]) -> None:
+        """登記監聽器，監看到外部變更時以該批操作記錄呼叫"""
+        self._listeners.append(callback)
+        
+    def remove_listener(self, callback: Callable[[List[Dict]], None]) -> None:
+        """移除監聽器"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+        
+    def start_watching(self, paths: Iterable[Path] = None, debounce: float = 1.0,
+                       poll_interval: float = 2.0) -> FileWatcher:
+        """
+        開始監看外部檔案變更
+        
+        Args:
+            paths: 監看的目錄，預設為原文與翻譯目錄
+            debounce: 合併連續事件的等待秒數
+            poll_interval: 沒有 watchdog 時的輪詢間隔秒數
+        """
+        if self._watcher is not None:
+            return self._watcher
+            
+        if paths is None:
+            index = get_corpus_index()
+            paths = [index.source_root, index.translation_root]
+            
+        self._watcher = FileWatcher(paths, self._handle_external_changes,
+                                    debounce=debounce, poll_interval=poll_interval).start()
+        safe_print(f"👁️  開始監看檔案變更（{self._watcher.backend}）")
+        return self._watcher
+        
+    def stop_watching(self) -> None:
+        """停止監看"""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+            self.flush()
+            
+    def _handle_external_changes(self, changes: Dict[Path, str]) -> None:
+        """記錄監看到的變更，增量更新雜湊與語料索引後通知監聽器"""
+        operations = []
+        
+        for file_path, event in sorted(changes.items()):
+            key = os.path.abspath(file_path)
+            exists = event != DELETED and file_path.exists()
+            file_hash = self.calculate_file_hash(file_path) if exists else None
+            
+            # 內容與上次記錄的相同（如本程式自己的寫入）時略過
+            if key in self._known_hashes and self._known_hashes[key] == file_hash:
+                continue
+            self._known_hashes[key] = file_hash
+            
+            if not exists:
+                operation_name = "delete"
+            else:
+                operation_name = "create" if event == CREATED else "modify"
+                
+            operations.append({
+                "timestamp": datetime.now().isoformat(),
+                "operation": operation_name,
+                "file_path": str(file_path).replace('\\', '/'),
+                "file_name": file_path.name,
+                "file_size": file_path.stat().st_size if exists else 0,
+                "file_hash": file_hash,
+                "file_type": self._external_file_type(file_path),
+                "details": {"source": "watcher"}
+            })
+            
+        if not operations:
+            return
+            
+        for operation in operations:
+            self._record(operation)
+            
+        try:
+            get_corpus_index().update_files(Path(op["file_path"]) for op in operations)
+        except Exception as e:
+            safe_print(f"⚠️  更新語料索引失敗: {e}")
+            
+        for listener in list(self._listeners):
+            try:
+                listener(operations)
+            except Exception as e:
+                safe_print(f"⚠️  監聽器處理失敗: {e}")
+                
+    @staticmethod
+    def _external_file_type(file_path: Path) -> str:
+        if 'source_texts' in file_path.parts:
+            return "source_text"
+        if 'translations' in file_path.parts:
+            return "translation"
+        return "unknown"
+        
     def _is_classic_file(self, file_path: Path) -> bool:
         """判斷是否為經典相關檔案"""
         path_parts = file_path.parts
@@ -131,59 +396,103 @@ class FileMonitor:
         
     def get_recent_operations(self, limit: int = 10) -> List[Dict]:
         """獲取最近的操作記錄"""
-        operations = self.log_data["operations"]
-        return operations[-limit:] if operations else []
+        if limit <= 0:
+            return []
+        if limit <= self.RECENT_LIMIT:
+            with self._lock:
+                recent = self._ensure_counters()["recent"]
+                return list(recent)[-limit:]
+        return list(deque(self.iter_operations(), maxlen=limit))
         
     def get_operations_by_type(self, file_type: str) -> List[Dict]:
         """根據檔案類型獲取操作記錄"""
         return [
-            op for op in self.log_data["operations"]
+            op for op in self.iter_operations()
             if op.get("file_type") == file_type
         ]
         
     def get_operations_by_date(self, date_str: str) -> List[Dict]:
         """根據日期獲取操作記錄"""
         return [
-            op for op in self.log_data["operations"]
+            op for op in self.iter_operations()
             if op["timestamp"].startswith(date_str)
         ]
         
-    def get_statistics(self) -> Dict:
-        """獲取統計資訊"""
-        operations = self.log_data["operations"]
+    @staticmethod
+    def _disk_total(metadata: Optional[Dict]) -> int:
+        return metadata.get("total_operations", 0) if metadata else 0
         
-        if not operations:
-            return {
+    def _count(self, counters: Dict, op: Dict) -> None:
+        """將一筆操作計入統計"""
+        counters["total_operations"] += 1
+        counters["recent"].append(op)
+        
+        # 檔案類型統計
+        file_type = op.get("file_type", "unknown")
+        counters["file_types"][file_type] = counters["file_types"].get(file_type, 0) + 1
+        
+        # 日期活動統計
+        date = op["timestamp"][:10]
+        counters["daily_activity"][date] = counters["daily_activity"].get(date, 0) + 1
+        
+    def _log_stat(self) -> Optional[Tuple[int, int]]:
+        """日誌檔的 (大小, 修改時間)，不存在時為 None"""
+        try:
+            stat = self.log_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+        
+    def _ensure_counters(self) -> Dict:
+        """
+        返回統計計數器（呼叫者需持有鎖）
+        
+        日誌檔狀態變更時才讀取磁碟上的中繼資料；其他實例寫入了同一份日誌
+        （磁碟上的操作總數與建立時不同）時重新讀取一次日誌。
+        """
+        log_stat = self._log_stat()
+        if self._counters is not None and log_stat == self._counted_log_stat:
+            return self._counters
+            
+        disk_metadata = self._read_metadata()
+        if disk_metadata:
+            self.metadata = disk_metadata
+        disk_total = self._disk_total(disk_metadata)
+        self._counted_log_stat = log_stat
+        if self._counters is None or disk_total != self._counted_disk_total:
+            counters = {
                 "total_operations": 0,
                 "file_types": {},
                 "daily_activity": {},
-                "recent_activity": []
+                "recent": deque(maxlen=self.RECENT_LIMIT)
             }
-            
-        # 統計檔案類型
-        file_types = {}
-        daily_activity = {}
+            for op in self.iter_operations():
+                self._count(counters, op)
+            self._counters = counters
+            self._counted_disk_total = disk_total
+        return self._counters
         
-        for op in operations:
-            # 檔案類型統計
-            file_type = op.get("file_type", "unknown")
-            file_types[file_type] = file_types.get(file_type, 0) + 1
-            
-            # 日期活動統計
-            date = op["timestamp"][:10]
-            daily_activity[date] = daily_activity.get(date, 0) + 1
-            
-        return {
-            "total_operations": len(operations),
-            "file_types": file_types,
-            "daily_activity": daily_activity,
-            "recent_activity": self.get_recent_operations(5)
-        }
+    def get_statistics(self) -> Dict:
+        """
+        獲取統計資訊（增量維護，不重新讀取日誌）
+        
+        total_operations 為中繼資料記錄的累計總數（含已輪替刪除的記錄與尚未寫入的緩衝），
+        分類與每日統計只涵蓋仍保留的記錄（retained_operations 筆）
+        """
+        with self._lock:
+            counters = self._ensure_counters()
+            return {
+                "total_operations": self.metadata.get("total_operations", 0) + len(self._buffer),
+                "retained_operations": counters["total_operations"],
+                "file_types": dict(counters["file_types"]),
+                "daily_activity": dict(counters["daily_activity"]),
+                "recent_activity": list(counters["recent"])[-5:]
+            }
         
     def generate_activity_report(self) -> str:
         """生成活動報告"""
         stats = self.get_statistics()
-        metadata = self.log_data.get("metadata", {})
+        metadata = self.metadata
         
         report = f"""# 📊 檔案操作活動報告
 
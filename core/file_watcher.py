@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 檔案監看器
+
+監看 docs/source_texts 與 docs/translations 中由外部（如編輯器）造成的檔案變更：
+- 已安裝 watchdog 時使用作業系統的事件通知（Linux 上為 inotify）
+- 否則以固定間隔比對檔案的 (大小, mtime_ns) 輪詢
+- 同一批連續事件在 debounce 秒內合併，只回報一次；同一檔案的多個事件合併為一個
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+
+WATCHED_SUFFIXES = ('.txt', '.md')
+
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+
+def _merge_event(previous: Optional[str], current: str) -> Optional[str]:
+    """合併同一檔案的連續事件，None 表示互相抵銷"""
+    if previous is None:
+        return current
+    if previous == CREATED:
+        return None if current == DELETED else CREATED
+    if previous == DELETED:
+        return MODIFIED if current == CREATED else DELETED
+    return current if current == DELETED else MODIFIED
+
+
+class _EventHandler(FileSystemEventHandler):
+    """將 watchdog 事件轉交給 FileWatcher"""
+
+    def __init__(self, watcher: "FileWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event) -> None:
+        if event.is_directory:
+            return
+        if event.event_type == "moved":
+            self.watcher.notify(event.src_path, DELETED)
+            self.watcher.notify(event.dest_path, CREATED)
+        elif event.event_type in (CREATED, MODIFIED, DELETED):
+            self.watcher.notify(event.src_path, event.event_type)
+        elif event.event_type == "closed":
+            self.watcher.notify(event.src_path, MODIFIED)
+
+
+class FileWatcher:
+    """監看目錄樹中的檔案變更並以合併後的批次回報"""
+
+    def __init__(self, paths: Iterable[Path], callback: Callable[[Dict[Path, str]], None],
+                 debounce: float = 1.0, poll_interval: float = 2.0,
+                 suffixes: Tuple[str, ...] = WATCHED_SUFFIXES, use_watchdog: bool = None):
+        """
+        初始化監看器
+
+        Args:
+            paths: 要監看的目錄（不存在的目錄會略過）
+            callback: 以 {路徑: 'created' | 'modified' | 'deleted'} 呼叫
+            debounce: 最後一個事件後等待多少秒才回報
+            poll_interval: 輪詢模式的檢查間隔秒數
+            suffixes: 只回報這些副檔名的檔案
+            use_watchdog: None 表示可用時使用 watchdog
+        """
+        self.paths = [Path(path) for path in paths]
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.suffixes = tuple(suffixes)
+
+        if use_watchdog and Observer is None:
+            raise ImportError("事件通知需要 watchdog，請執行 pip install watchdog")
+        self.backend = "watchdog" if Observer is not None and use_watchdog is not False else "polling"
+
+        self._pending = {}
+        self._first_pending = None
+        self._timer = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._observer = None
+        self._poll_thread = None
+        self._snapshot = {}
+
+    def start(self) -> "FileWatcher":
+        """開始監看"""
+        roots = [path for path in self.paths if path.is_dir()]
+        self._stop.clear()
+
+        if self.backend == "watchdog":
+            self._observer = Observer()
+            handler = _EventHandler(self)
+            for root in roots:
+                self._observer.schedule(handler, str(root), recursive=True)
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._snapshot = self._take_snapshot()
+            self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
+            self._poll_thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止監看並回報尚未送出的變更"""
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._poll_thread is not None:
+            self._poll_thread.join()
+            self._poll_thread = None
+        self.dispatch()
+
+    def __enter__(self) -> "FileWatcher":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def notify(self, path: str, event: str) -> None:
+        """登記一個檔案事件並重設延遲回報計時器"""
+        if not str(path).endswith(self.suffixes):
+            return
+        path = Path(path)
+
+        with self._lock:
+            merged = _merge_event(self._pending.get(path), event)
+            if merged is None:
+                self._pending.pop(path, None)
+            else:
+                self._pending[path] = merged
+
+            now = time.monotonic()
+            if self._first_pending is None:
+                self._first_pending = now
+
+            # 事件持續不斷時最多延遲 5 倍 debounce
+            if self._timer is not None:
+                if now - self._first_pending >= self.debounce * 5:
+                    return
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.dispatch)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def dispatch(self) -> None:
+        """立即回報累積的變更"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            changes, self._pending = self._pending, {}
+            self._first_pending = None
+
+        if changes:
+            self.callback(changes)
+
+    # ---- 輪詢模式 ----
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        stack = [str(path) for path in self.paths if path.is_dir()]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(self.suffixes):
+                            try:
+                                stat = entry.stat()
+                            except OSError:
+                                continue
+                            snapshot[entry.path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue
+        return snapshot
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            snapshot = self._take_snapshot()
+            previous = self._snapshot
+            self._snapshot = snapshot
+
+            for path, signature in snapshot.items():
+                old = previous.get(path)
+                if old is None:
+                    self.notify(path, CREATED)
+                elif old != signature:
+                    self.notify(path, MODIFIED)
+            for path in previous.keys() - snapshot.keys():
+                self.notify(path, DELETED)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - HTML解析後端
+
+可選的解析後端：
+- lxml:        BeautifulSoup + lxml 解析器（預設）
+- html.parser: BeautifulSoup + Python 內建解析器（最慢，但無額外依賴）
+- lxml-xpath:  對已知的頁面結構（read-layout-main / chapter-reader 正文、
+               semi-tree-option 目錄）直接以 lxml.html + XPath 提取，
+               完全略過 BeautifulSoup；其他情況仍使用 BeautifulSoup + lxml
+"""
+
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+    etree = None
+
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'lxml-xpath')
+
+# 依 CSS class token 比對（與 BeautifulSoup 的 class_ 比對語意一致）
+_HAS_CLASS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+
+_CHAPTER_ARTICLE_XPATH = (
+    "(//main[" + _HAS_CLASS.format('read-layout-main') + "])[1]"
+    "//article[" + _HAS_CLASS.format('chapter-reader') + "]"
+)
+_CONTENT_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p')
+
+
+def lxml_available() -> bool:
+    """是否已安裝 lxml"""
+    return lxml is not None
+
+
+def resolve_backend(name: str = None) -> str:
+    """
+    正規化解析後端名稱；未安裝 lxml 時退回 html.parser
+
+    Raises:
+        ValueError: 未知的後端名稱
+    """
+    name = name or 'lxml'
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"未知的HTML解析後端: {name}（可用: {', '.join(PARSER_BACKENDS)}）")
+    if name != 'html.parser' and not lxml_available():
+        return 'html.parser'
+    return name
+
+
+def soup_parser(backend: str) -> str:
+    """後端對應的 BeautifulSoup 解析器名稱"""
+    return 'html.parser' if backend == 'html.parser' else 'lxml'
+
+
+def make_soup(html: str, backend: str = 'lxml') -> BeautifulSoup:
+    """以指定後端建立 BeautifulSoup"""
+    return BeautifulSoup(html, soup_parser(backend))
+
+
+def parse_tree(html: str):
+    """以 lxml.html 解析頁面；內容為空或無法解析時返回 None"""
+    if not html or not html.strip():
+        return None
+    try:
+        # 以位元組解析，避免含編碼宣告的 str 被 lxml 拒絕
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        return lxml.html.fromstring(html.encode('utf-8'), parser=parser)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def chapter_paragraphs(tree) -> Optional[List[str]]:
+    """
+    XPath 快速路徑：提取 main.read-layout-main > article.chapter-reader
+    中的標題與段落文字（長度大於3的部分）
+
+    Returns:
+        段落列表；頁面不具此結構時返回 None
+    """
+    if tree is None:
+        return None
+
+    articles = tree.xpath(_CHAPTER_ARTICLE_XPATH)
+    if not articles:
+        return None
+
+    parts = []
+    for element in articles[0].iter(*_CONTENT_TAGS):
+        text = element.text_content().strip()
+        if text and len(text) > 3:
+            parts.append(text)
+    return parts
+
+
+def catalog_items(tree) -> List[Optional[Tuple[str, str]]]:
+    """
+    XPath 快速路徑：提取所有 div.semi-tree-option 中第一個連結
+
+    Returns:
+        依文件順序的 [(連結文字, href), ...]；沒有連結的項目為 None，
+        以保持與逐項編號的呼叫端一致
+    """
+    if tree is None:
+        return []
+
+    items = []
+    for option in tree.xpath("//div[" + _HAS_CLASS.format('semi-tree-option') + "]"):
+        links = option.xpath(".//a")
+        if links:
+            items.append((links[0].text_content().strip(), links[0].get('href', '')))
+        else:
+            items.append(None)
+    return items
+
+
+def first_text(tree, tag: str, class_name: str = None) -> Optional[str]:
+    """XPath 快速路徑：第一個符合標籤（與 class）的元素文字"""
+    if tree is None:
+        return None
+
+    xpath = f"//{tag}"
+    if class_name:
+        xpath += "[" + _HAS_CLASS.format(class_name) + "]"
+    elements = tree.xpath(xpath)
+    return elements[0].text_content() if elements else None
+
+
+def meta_content(tree, name: str) -> Optional[str]:
+    """XPath 快速路徑：<meta name=...> 的 content 屬性"""
+    if tree is None:
+        return None
+
+    elements = tree.xpath("//meta[@name=$name]", name=name)
+    return elements[0].get('content') if elements else None
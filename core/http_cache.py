@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - HTTP回應快取
+
+以網址為鍵的磁碟快取，支援 ETag / Last-Modified 條件式重新驗證、
+存活時間（TTL）與依容量上限的 LRU 淘汰。可掛載到 requests.Session，
+也供 AsyncFetcher 使用；離線模式下完全由快取重播。
+索引的變更（新項目、重新驗證、命中時更新的最近使用時間）定期及在程式結束時
+批次寫回，內容總量以累計值維護，每次寫入快取的成本不隨項目數增加。
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+# 回應內容已解壓縮後才存入快取，這些標頭不再適用
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+# 索引最多每隔此秒數寫回一次（其餘變更在 flush 或程式結束時寫回）
+_INDEX_SAVE_INTERVAL = 60
+# 超過容量上限時淘汰到上限的這個比例
+_EVICT_TARGET = 0.9
+
+# 全域離線模式
+_offline_mode = False
+
+
+def set_offline_mode(enabled: bool = True) -> None:
+    """開啟或關閉離線模式（所有請求只從快取讀取）"""
+    global _offline_mode
+    _offline_mode = enabled
+
+
+def is_offline_mode() -> bool:
+    """是否處於離線模式"""
+    return _offline_mode
+
+
+class OfflineCacheMiss(requests.ConnectionError):
+    """離線模式下請求的網址不在快取中"""
+
+
+class ResponseCache:
+    """HTTP回應磁碟快取"""
+
+    def __init__(self, cache_dir: Path = None, ttl: float = 86400,
+                 max_bytes: int = 500 * 1024 * 1024):
+        """
+        初始化快取
+
+        Args:
+            cache_dir: 快取目錄
+            ttl: 快取項目的存活秒數，逾時後需向伺服器重新驗證；None 表示永不過期
+            max_bytes: 快取內容總容量上限，超過時淘汰最久未使用的項目
+        """
+        self.cache_dir = Path(cache_dir or "data/cache/http")
+        self.body_dir = self.cache_dir / "bodies"
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.cache_dir / "index.json"
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self.load_index()
+        atexit.register(self.flush)
+
+    def load_index(self) -> None:
+        """載入快取索引"""
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                self.index = {}
+        else:
+            self.index = {}
+        self.total_bytes = sum(entry['size'] for entry in self.index.values())
+
+    def save_index(self) -> None:
+        """原子性地儲存快取索引"""
+        temp_file = self.index_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(temp_file, self.index_file)
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def _mark_dirty(self) -> None:
+        """記錄索引已變更，距上次寫回超過間隔時立即寫回（呼叫者需持有鎖）"""
+        self._dirty = True
+        if time.monotonic() - self._last_save >= _INDEX_SAVE_INTERVAL:
+            self.save_index()
+
+    def flush(self) -> None:
+        """寫回尚未保存的索引變更"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.save_index()
+            except OSError:
+                pass
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        """由網址產生快取鍵"""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.body_dir / f"{key}.bin"
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """查詢快取項目（只回傳元資料，內容以 read_body 讀取）"""
+        with self._lock:
+            entry = self.index.get(self.make_key(url))
+            if entry and not self._body_path(entry['key']).exists():
+                # 內容檔遺失，視為未命中
+                self._remove(entry['key'])
+                return None
+            return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """快取項目是否仍在存活時間內"""
+        if self.ttl is None:
+            return True
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def can_serve(self, url: str) -> bool:
+        """是否可不經網路直接由快取回應"""
+        entry = self.lookup(url)
+        if entry is None:
+            return False
+        return is_offline_mode() or self.is_fresh(entry)
+
+    def conditional_headers(self, entry: Dict) -> Dict:
+        """產生條件式請求標頭"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def read_body(self, entry: Dict) -> bytes:
+        """讀取快取內容並更新最近使用時間"""
+        with self._lock:
+            entry['last_access'] = time.time()
+            self._mark_dirty()
+        with open(self._body_path(entry['key']), 'rb') as f:
+            return f.read()
+
+    def refresh(self, entry: Dict) -> None:
+        """伺服器回應 304 時重設存活時間"""
+        with self._lock:
+            entry['stored_at'] = time.time()
+            entry['last_access'] = entry['stored_at']
+            self._mark_dirty()
+
+    def store(self, url: str, status: int, headers: Dict, body: bytes) -> Dict:
+        """
+        寫入快取
+
+        Args:
+            url: 請求網址
+            status: HTTP 狀態碼
+            headers: 回應標頭
+            body: 已解壓縮的回應內容
+
+        Returns:
+            Dict: 新的快取項目
+        """
+        key = self.make_key(url)
+        kept_headers = {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS}
+        lowered = {k.lower(): v for k, v in headers.items()}
+        now = time.time()
+
+        entry = {
+            'key': key,
+            'url': url,
+            'status': status,
+            'headers': kept_headers,
+            'etag': lowered.get('etag'),
+            'last_modified': lowered.get('last-modified'),
+            'size': len(body),
+            'stored_at': now,
+            'last_access': now
+        }
+
+        with self._lock:
+            temp_path = self._body_path(key).with_suffix('.tmp')
+            with open(temp_path, 'wb') as f:
+                f.write(body)
+            os.replace(temp_path, self._body_path(key))
+
+            previous = self.index.get(key)
+            if previous is not None:
+                self.total_bytes -= previous['size']
+            self.index[key] = entry
+            self.total_bytes += entry['size']
+            self._evict()
+            self._mark_dirty()
+
+        return entry
+
+    def _remove(self, key: str) -> None:
+        """移除快取項目（呼叫者需持有鎖）"""
+        entry = self.index.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry['size']
+            self._dirty = True
+        try:
+            self._body_path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """超過容量上限時依 LRU 淘汰到上限的 90%，之後多次寫入才需再排序一次（呼叫者需持有鎖）"""
+        if not self.max_bytes or self.total_bytes <= self.max_bytes:
+            return
+
+        target = self.max_bytes * _EVICT_TARGET
+        for entry in sorted(self.index.values(), key=lambda e: e['last_access']):
+            if self.total_bytes <= target:
+                break
+            self._remove(entry['key'])
+
+    def clear(self) -> None:
+        """清空快取"""
+        with self._lock:
+            for key in list(self.index):
+                self._remove(key)
+            self.save_index()
+
+    def get_statistics(self) -> Dict:
+        """獲取快取統計資訊"""
+        with self._lock:
+            return {
+                "entries": len(self.index),
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl
+            }
+
+
+class CachingAdapter(HTTPAdapter):
+    """在 requests 傳輸層套用 ResponseCache 的轉接器"""
+
+    def __init__(self, cache: ResponseCache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != 'GET' or stream:
+            return super().send(request, stream=stream, **kwargs)
+
+        url = request.url
+        entry = self.cache.lookup(url)
+
+        if entry is not None and (is_offline_mode() or self.cache.is_fresh(entry)):
+            return self._build_response(request, entry)
+
+        if is_offline_mode():
+            raise OfflineCacheMiss(f"離線模式：快取中沒有 {url}", request=request)
+
+        if entry is not None:
+            request.headers.update(self.cache.conditional_headers(entry))
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            self.cache.refresh(entry)
+            return self._build_response(request, entry)
+
+        if response.status_code == 200:
+            self.cache.store(url, response.status_code, dict(response.headers), response.content)
+
+        return response
+
+    def _build_response(self, request, entry: Dict) -> requests.Response:
+        """由快取項目組裝 requests.Response"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry['url']
+        response.request = request
+        response.connection = self
+        response._content = self.cache.read_body(entry)
+        response.from_cache = True
+        return response
+
+
+def install_cache(session: requests.Session, cache: ResponseCache = None,
+                  **adapter_kwargs) -> ResponseCache:
+    """
+    將回應快取掛載到 requests.Session
+
+    Args:
+        session: 要掛載的會話
+        cache: 使用的快取，預設為共享的全域快取
+        adapter_kwargs: 傳給 HTTPAdapter 的參數（如 pool_maxsize）
+
+    Returns:
+        ResponseCache: 實際使用的快取
+    """
+    cache = cache or get_response_cache()
+    adapter = CachingAdapter(cache, **adapter_kwargs)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return cache
+
+
+# 全域快取實例（依目錄區分）
+_cache_instances = {}
+
+def get_response_cache(cache_dir: Path = None, **kwargs) -> ResponseCache:
+    """獲取共享的回應快取實例，同一目錄只建立一次"""
+    key = str(Path(cache_dir or "data/cache/http").resolve())
+    if key not in _cache_instances:
+        _cache_instances[key] = ResponseCache(cache_dir, **kwargs)
+    return _cache_instances[key]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 單次執行的頁面存放區
+
+同一次翻譯流程中，書籍頁面與章節頁面會被多個階段（書籍資訊、章節列表、
+隱藏章節發現、子章節發現、章節爬取）重複使用。PageStore 讓每個網址只下載
+和解析一次，所有階段共用同一棵 BeautifulSoup 樹。只存放成功（2xx）的頁面，
+錯誤回應直接交給呼叫者，下一次取得時重新下載。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+from .html_backend import make_soup, parse_tree
+
+
+class Page:
+    """已下載的頁面，BeautifulSoup 樹與 lxml 樹都在首次使用時才建立"""
+
+    def __init__(self, url: str, status_code: int, text: str, parser: str = 'lxml'):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.parser = parser
+        self._soup = None
+        self._tree = None
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """解析後的頁面（只解析一次）"""
+        if self._soup is None:
+            self._soup = make_soup(self.text, self.parser)
+        return self._soup
+
+    @property
+    def tree(self):
+        """lxml.html 解析樹，供 XPath 快速路徑使用（只解析一次）"""
+        if self._tree is None:
+            self._tree = parse_tree(self.text)
+        return self._tree
+
+    def raise_for_status(self) -> None:
+        """狀態碼為錯誤時拋出 requests.HTTPError"""
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class PageStore:
+    """以網址為鍵、有容量上限的頁面存放區（執行緒安全）"""
+
+    def __init__(self, fetch: Callable[..., requests.Response],
+                 parser: str = 'lxml', max_pages: int = 256):
+        """
+        初始化頁面存放區
+
+        Args:
+            fetch: 實際下載頁面的函數，簽名同 requests.Session.get
+            parser: HTML解析後端（見 core.html_backend.PARSER_BACKENDS）
+            max_pages: 最多保留的頁面數，超過時淘汰最久未使用的頁面
+        """
+        self.fetch = fetch
+        self.parser = parser
+        self.max_pages = max_pages
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> Page:
+        """
+        取得頁面，未存放時下載
+
+        Args:
+            url: 頁面網址
+            kwargs: 傳給 fetch 的參數（如 timeout）
+
+        Returns:
+            Page: 頁面（下載失敗時拋出 fetch 的例外；錯誤狀態碼的頁面照常返回但不存放）
+        """
+        page = self.peek(url)
+        if page is not None:
+            return page
+
+        response = self.fetch(url, **kwargs)
+        return self.put(url, response.status_code, response.text)
+
+    def peek(self, url: str) -> Optional[Page]:
+        """只查詢不下載"""
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self._pages.move_to_end(url)
+            return page
+
+    def put(self, url: str, status_code: int, text: str) -> Page:
+        """存放已下載的頁面（供非同步路徑使用）；非 2xx 的頁面只返回不存放"""
+        page = Page(url, status_code, text, self.parser)
+        if not 200 <= status_code < 300:
+            return page
+        with self._lock:
+            self._pages[url] = page
+            self._pages.move_to_end(url)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def clear(self) -> None:
+        """清空存放區（每次翻譯流程結束時呼叫）"""
+        with self._lock:
+            self._pages.clear()
+
+    def __len__(self) -> int:
+        return len(self._pages)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 翻譯進度掃描器
+
+判斷翻譯 Markdown 檔案是否仍是模板：
+- 依 (路徑, 大小, mtime_ns) 快取掃描結果並保存到 data/cache/，未變更的檔案不重新讀取
+- 佔位符只會出現在「## 翻譯」標題之後，找到標題後只讀取其後固定大小的區段
+- 以位元組比對，不解碼整個檔案；大檔案的字數只記下界
+- 需要讀取的檔案以執行緒池並行掃描
+"""
+
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+
+TRANSLATION_PLACEHOLDER = "[此處應為現代中文翻譯]"
+
+_PLACEHOLDER = TRANSLATION_PLACEHOLDER.encode('utf-8')
+# 整行比對，「## 翻譯說明」等其他標題不算（允許行尾空白與 \r）
+_HEADING = re.compile("\n## 翻譯[ \t\r]*\n".encode('utf-8'))
+# 分塊讀取時保留的重疊位元組數，標題跨兩個區塊時仍能找到
+_HEADING_OVERLAP = 64
+# 標題之後需要檢查的位元組數（佔位符緊接在標題後）
+_WINDOW = 1024
+_CHUNK_SIZE = 64 * 1024
+# 超過此字數的判斷只需要下界（UTF-8 每字最多 4 位元組）
+MAX_CHAR_THRESHOLD = 1000
+# UTF-8 延續位元組，刪除後的長度即為字元數
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+
+class TranslationProgressScanner:
+    """帶持久化快取的翻譯檔案掃描器（執行緒安全）"""
+
+    def __init__(self, cache_file: Path = None, max_workers: int = 8):
+        """
+        初始化掃描器
+
+        Args:
+            cache_file: 快取檔案，None 表示只在記憶體中快取
+            max_workers: 並行讀取的執行緒數
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.max_workers = max(1, max_workers)
+
+        self._entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load_cache()
+
+    def load_cache(self) -> None:
+        """載入快取"""
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f).get("entries", {})
+        except (json.JSONDecodeError, FileNotFoundError, AttributeError):
+            self._entries = {}
+
+    def save_cache(self) -> None:
+        """原子性地儲存快取（沒有變更時不寫入）"""
+        if self.cache_file is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            self._entries = {path: entry for path, entry in self._entries.items()
+                             if os.path.exists(path)}
+            data = {"entries": self._entries}
+            self._dirty = False
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.cache_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, self.cache_file)
+
+    def scan(self, paths: Iterable[Union[str, Path]]) -> Dict[str, Optional[Dict]]:
+        """
+        掃描多個翻譯檔案
+
+        Returns:
+            {絕對路徑: {"placeholder": bool, "chars": int} 或 None（檔案不存在）}
+        """
+        results = {}
+        stale = []
+
+        for path in paths:
+            key = os.path.abspath(path)
+            if key in results:
+                continue
+            try:
+                stat = os.stat(key)
+            except OSError:
+                results[key] = None
+                continue
+
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                results[key] = {"placeholder": entry[2], "chars": entry[3]}
+            else:
+                stale.append((key, stat))
+
+        if stale:
+            workers = min(self.max_workers, len(stale))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for key, result in zip([key for key, _ in stale],
+                                       executor.map(self._scan_file, stale)):
+                    results[key] = result
+
+        return results
+
+    def _scan_file(self, item) -> Optional[Dict]:
+        key, stat = item
+        try:
+            placeholder, chars = self._read_file(key, stat.st_size)
+        except OSError:
+            return None
+
+        with self._lock:
+            self._entries[key] = [stat.st_size, stat.st_mtime_ns, placeholder, chars]
+            self._dirty = True
+        return {"placeholder": placeholder, "chars": chars}
+
+    @staticmethod
+    def _read_file(path: str, size: int):
+        """返回 (是否含佔位符, 字數或其下界)"""
+        # 小檔案完整讀取以取得精確字數
+        if size < 4 * (MAX_CHAR_THRESHOLD + 1):
+            with open(path, 'rb') as f:
+                data = f.read()
+            return _PLACEHOLDER in data, len(data.translate(None, _CONTINUATION_BYTES))
+
+        buffer = bytearray()
+        heading = -1
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                start = max(0, len(buffer) - _HEADING_OVERLAP)
+                buffer += chunk
+                if heading < 0:
+                    match = _HEADING.search(buffer, start)
+                    if match:
+                        heading = match.end()
+                if heading >= 0 and len(buffer) >= heading + _WINDOW:
+                    break
+
+        if heading >= 0:
+            window = buffer[heading:heading + _WINDOW]
+            placeholder = _PLACEHOLDER in window
+        else:
+            # 沒有模板標題時檢查整個檔案
+            placeholder = _PLACEHOLDER in buffer
+        return placeholder, size // 4
+
+    @staticmethod
+    def is_translated(result: Optional[Dict], min_chars: int) -> bool:
+        """掃描結果是否為實際翻譯（沒有佔位符且字數超過 min_chars，min_chars 不可超過 MAX_CHAR_THRESHOLD）"""
+        return bool(result) and not result["placeholder"] and result["chars"] > min_chars
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - AI 翻譯提示詞組裝
+
+每個翻譯會話只組裝一次固定前綴（角色、精簡後的指導規範、翻譯要求與輸出格式）：
+- 前綴在整個會話中逐位元組不變，且位於提示詞最前面，供應商端的前綴快取可以命中
+- 指導規範中的術語表格自前綴移出，與術語對照表合併為詞彙表；
+  每個請求只附上原文中實際出現的術語
+- 記錄前綴與可變部分的估計 token 數
+- 可附上翻譯記憶中的相似段落作為參考
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .text_stats import estimate_tokens
+
+
+# 多章節合併請求中每篇的分隔標記
+PACKED_MARKER = "=== 第{number}篇 ==="
+PACKED_MARKER_PATTERN = re.compile(r'^\s*={3}\s*第\s*(\d+)\s*篇\s*={3}\s*$', re.MULTILINE)
+
+_TABLE_ROW = re.compile(r'^\|(.+)\|\s*$')
+_TABLE_RULE = re.compile(r'^\|[\s:\-|]+\|\s*$')
+_HTML_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+
+_PROMPT_HEADER = "你是一位專業的道教經典翻譯專家。請根據以下指導規範翻譯古文："
+
+_PROMPT_REQUIREMENTS = """## 翻譯要求
+1. 提供準確、流暢的現代中文翻譯
+2. 保持道教術語的專業性和一致性，術語對照中列出的詞彙依對照翻譯
+3. 必要時提供重要詞彙的註解
+4. 說明翻譯過程中的重點和難點
+5. 譯文與原文逐段對應：每段原文的譯文單獨成段，段與段之間空一行，段數與原文相同
+
+## 輸出格式
+請按以下格式輸出：
+
+### 現代中文翻譯
+[翻譯內容]
+
+### 重要詞彙註解
+- **[術語1]**: [解釋]
+- **[術語2]**: [解釋]
+
+### 翻譯要點
+- [翻譯要點1]
+- [翻譯要點2]"""
+
+
+def compact_guidelines(guidelines: str) -> Tuple[str, Dict[str, str]]:
+    """
+    精簡指導規範並取出其中的術語表格
+
+    Returns:
+        (精簡後的規範, {術語: 建議譯文與備註})
+    """
+    glossary = {}
+    lines = []
+    header_seen = False
+
+    for line in _HTML_COMMENT.sub('', guidelines).splitlines():
+        line = line.rstrip()
+        row = _TABLE_ROW.match(line)
+        if row:
+            if _TABLE_RULE.match(line):
+                continue
+            cells = [cell.strip() for cell in row.group(1).split('|')]
+            # 表格第一列為標題
+            if not header_seen:
+                header_seen = True
+                continue
+            if cells and cells[0]:
+                glossary[cells[0]] = "；".join(cell for cell in cells[1:] if cell)
+            continue
+
+        header_seen = False
+        if line.strip() in ('---', '***', '___'):
+            continue
+        # 連續空白行只保留一行
+        if not line.strip() and (not lines or not lines[-1]):
+            continue
+        lines.append(line)
+
+    return '\n'.join(lines).strip(), glossary
+
+
+class PromptBuilder:
+    """會話內共用的提示詞組裝器（執行緒安全）"""
+
+    def __init__(self, guidelines: str, terminology: Optional[Dict[str, str]] = None):
+        """
+        初始化組裝器並建立固定前綴
+
+        Args:
+            guidelines: 翻譯指導規範全文
+            terminology: 額外的術語對照 {術語: 譯法}
+        """
+        compacted, glossary = compact_guidelines(guidelines)
+        for term, rendering in (terminology or {}).items():
+            glossary.setdefault(term, rendering)
+        self.glossary = glossary
+
+        self.prefix = f"{_PROMPT_HEADER}\n\n{compacted}\n\n{_PROMPT_REQUIREMENTS}\n\n"
+        self.prefix_tokens = estimate_tokens(self.prefix)
+
+        # 較長的術語優先比對，單一正規表達式一次掃描原文
+        terms = sorted(glossary, key=len, reverse=True)
+        self._term_pattern = re.compile('|'.join(map(re.escape, terms))) if terms else None
+
+        self._lock = threading.Lock()
+        self.stats = {"prompts": 0, "prefix_tokens": 0, "variable_tokens": 0}
+
+    def find_terms(self, text: str) -> List[str]:
+        """原文中出現的術語（依首次出現順序）"""
+        if self._term_pattern is None:
+            return []
+        return list(dict.fromkeys(self._term_pattern.findall(text)))
+
+    def _glossary_section(self, text: str) -> str:
+        terms = self.find_terms(text)
+        if not terms:
+            return ""
+        lines = [f"- {term}：{self.glossary[term]}" if self.glossary[term] and self.glossary[term] != term
+                 else f"- {term}：保留原詞" for term in terms]
+        return "## 術語對照\n" + "\n".join(lines) + "\n\n"
+
+    @staticmethod
+    def _references_section(references: Optional[Sequence[Tuple[str, str]]]) -> str:
+        if not references:
+            return ""
+        lines = ["### 翻譯記憶參考", "以下為先前已完成的相似段落譯文，請保持用語一致："]
+        for source, translation in references:
+            lines.append(f"- 原文：{source}\n  譯文：{translation}")
+        return "\n".join(lines) + "\n\n"
+
+    @staticmethod
+    def _context_section(context: Dict) -> str:
+        lines = [
+            f"- 經典名稱：{context.get('book_title', '未知')}",
+            f"- 章節：{context.get('chapter_title', '未知')}",
+            f"- 作者：{context.get('author', '未知')}"
+        ]
+        if context.get('part'):
+            lines.append(f"- 段落：{context['part']}（只翻譯本段，不要補寫前後文）")
+        return "### 上下文資訊\n" + "\n".join(lines) + "\n\n"
+
+    def build(self, original_text: str, context: Dict = None,
+              references: Optional[Sequence[Tuple[str, str]]] = None) -> str:
+        """
+        組裝單一原文的提示詞
+
+        Args:
+            original_text: 原文
+            context: 經典名稱、章節等上下文
+            references: 翻譯記憶中的相似段落 [(原文, 譯文)]
+        """
+        context = context or {}
+        text = original_text.strip()
+        variable = (
+            "## 翻譯任務\n請將以下道教經典原文翻譯成現代中文：\n\n"
+            f"{self._context_section(context)}"
+            f"{self._glossary_section(text)}"
+            f"{self._references_section(references)}"
+            f"### 原文\n```\n{text}\n```\n\n請開始翻譯："
+        )
+        self._record(variable)
+        return self.prefix + variable
+
+    def build_packed(self, items: Sequence[Tuple[str, Dict]]) -> str:
+        """組裝多個短章節合併的提示詞，要求依分隔標記逐篇輸出"""
+        texts = [text.strip() for text, _ in items]
+        sections = []
+        for number, (text, (_, context)) in enumerate(zip(texts, items), 1):
+            sections.append(
+                f"{PACKED_MARKER.format(number=number)}\n"
+                f"{self._context_section(context or {})}"
+                f"### 原文\n```\n{text}\n```"
+            )
+        variable = (
+            f"## 翻譯任務\n以下共 {len(items)} 篇彼此獨立的道教經典原文，請分別翻譯成現代中文。\n"
+            f"每篇輸出前先單獨一行寫出與原文相同的分隔標記（如 {PACKED_MARKER.format(number=1)}），"
+            "其後依輸出格式寫出該篇的三個部分。\n\n"
+            f"{self._glossary_section(''.join(texts))}"
+            + "\n\n".join(sections)
+            + "\n\n請開始翻譯："
+        )
+        self._record(variable)
+        return self.prefix + variable
+
+    @staticmethod
+    def split_packed_response(response: str, count: int) -> Optional[List[str]]:
+        """依分隔標記拆分合併請求的回應，篇數不符時返回 None"""
+        parts = {}
+        matches = list(PACKED_MARKER_PATTERN.finditer(response))
+        for index, match in enumerate(matches):
+            end = matches[index + 1].start() if index + 1 < len(matches) else len(response)
+            parts[int(match.group(1))] = response[match.end():end].strip()
+        if sorted(parts) != list(range(1, count + 1)):
+            return None
+        return [parts[number] for number in range(1, count + 1)]
+
+    def _record(self, variable: str) -> None:
+        tokens = estimate_tokens(variable)
+        with self._lock:
+            self.stats["prompts"] += 1
+            self.stats["prefix_tokens"] += self.prefix_tokens
+            self.stats["variable_tokens"] += tokens
+
+    def count_tokens(self, prompt: str) -> int:
+        """提示詞的估計 token 數"""
+        if prompt.startswith(self.prefix):
+            return self.prefix_tokens + estimate_tokens(prompt[len(self.prefix):])
+        return estimate_tokens(prompt)
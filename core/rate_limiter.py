@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 請求速率限制器
+
+以令牌桶（token bucket）控制對目標網站的請求頻率，
+可在多個工作執行緒之間共享，取代每次請求後固定的 time.sleep
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """執行緒安全的令牌桶速率限制器"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        初始化速率限制器
+
+        Args:
+            rate: 每秒補充的令牌數（即允許的平均請求頻率），<= 0 表示不限速
+            burst: 桶容量，允許的瞬間突發請求數
+        """
+        self.rate = rate
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_delay(cls, delay: float, burst: int = 1) -> "RateLimiter":
+        """由傳統的「請求間隔秒數」建立等效的限制器"""
+        rate = 1.0 / delay if delay and delay > 0 else 0
+        return cls(rate, burst)
+
+    def _refill(self) -> None:
+        """依經過時間補充令牌（呼叫者需持有鎖）"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        取得一個令牌，必要時阻塞等待
+
+        Args:
+            timeout: 最長等待秒數，None 表示無限等待
+
+        Returns:
+            bool: 是否成功取得令牌
+        """
+        if self.rate <= 0:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """acquire 的協程版本，等待時不阻塞事件迴圈"""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            await asyncio.sleep(wait)
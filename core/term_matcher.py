@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 術語比對
+
+將整個術語表編譯成一個 Aho-Corasick 自動機，一次掃描文本即可找出所有出現的術語
+（包含重疊與互相包含的術語，如「太上」與「太上老君」），
+掃描成本只與文本長度及命中數有關，不隨術語表大小增加。
+"""
+
+from collections import Counter, deque
+from typing import Dict, Iterable, List
+
+
+class TermMatcher:
+    """多詞彙比對器（建立後唯讀，可在多個執行緒間共用）"""
+
+    def __init__(self, terms: Iterable[str]):
+        """
+        建立自動機
+
+        Args:
+            terms: 術語（空字串與重複項目略過，保留第一次出現的順序）
+        """
+        self.terms = []
+        self._index = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for term in terms:
+            if term and term not in self._index:
+                self._index[term] = len(self.terms)
+                self.terms.append(term)
+                self._insert(term)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._index
+
+    def index(self, term: str) -> int:
+        """術語在術語表中的順序"""
+        return self._index[term]
+
+    def _insert(self, term: str) -> None:
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(self._index[term])
+
+    def _link(self) -> None:
+        """以廣度優先建立失敗連結，並將後綴節點的輸出併入"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                if self._output[self._fail[child]]:
+                    self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """各術語在文本中出現的次數（只含出現的術語）"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        hits = Counter()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                hits.update(output[node])
+        return {self.terms[index]: count for index, count in hits.items()}
+
+    def find(self, text: str) -> List[str]:
+        """文本中出現的術語，依術語表順序"""
+        found = self.counts(text)
+        return sorted(found, key=self._index.__getitem__)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - AI 翻譯分段規劃
+
+- split_text 將過長的原文在段落邊界切分，單一段落仍超過預算時再於句末標點切分，
+  每段的估計 token 數不超過預算；split_chunks 另外記錄片段之間的分隔，
+  以 join_chunks 接回時段落中途切開處不會多出空白行
+- pack_items 將相鄰的短章節依序合併成一個請求，減少每個請求的固定提示詞開銷
+"""
+
+import re
+from typing import List, Sequence, Tuple
+
+from .text_stats import PARAGRAPH_SEPARATOR, estimate_tokens
+
+
+# 句末標點（含緊接的收尾引號）之後可以切分
+SENTENCE_BOUNDARY = re.compile(r'(?<=[。！？；!?;])(?![」』”’）)])|(?<=[。！？；!?;][」』”’）)])')
+
+
+def _split_sentences(paragraph: str, max_tokens: int) -> List[str]:
+    """將段落切成不超過預算的句子片段（單句過長時依字數硬切）"""
+    pieces = []
+    for sentence in SENTENCE_BOUNDARY.split(paragraph):
+        if not sentence:
+            continue
+        if estimate_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        # 漢字約每字 1 個 token，以字數作為硬切長度
+        for start in range(0, len(sentence), max_tokens):
+            pieces.append(sentence[start:start + max_tokens])
+    return pieces
+
+
+def split_chunks(text: str, max_tokens: int) -> List[Tuple[str, str]]:
+    """
+    將原文切分成估計 token 數不超過 max_tokens 的片段，並記錄片段之間的分隔
+
+    放得進一個片段的段落不會被切開：目前片段放不下時整段移到下一個片段；
+    只有單一段落超過預算時才在句末標點切分，切開處以原本的分隔接回
+    （同一行內為空字串，段落內換行處為換行）。
+
+    Returns:
+        [(與前一片段之間的分隔, 片段)]，第一個片段的分隔為空字串；
+        以 join_chunks 依分隔串接即還原原文的段落結構
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if estimate_tokens(text) <= max_tokens:
+        return [("", text)]
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    separator = ""
+
+    def flush(next_separator: str) -> None:
+        nonlocal current, current_tokens, separator
+        if current:
+            chunks.append((separator, ''.join(current).strip()))
+            separator = next_separator
+        current, current_tokens = [], 0
+
+    for paragraph in PARAGRAPH_SEPARATOR.split(text):
+        if not paragraph.strip():
+            continue
+        tokens = estimate_tokens(paragraph)
+        if current and current_tokens + tokens > max_tokens:
+            flush("\n\n")
+        if tokens <= max_tokens:
+            if current:
+                current.append('\n\n')
+            current.append(paragraph)
+            current_tokens += tokens
+            continue
+
+        # 單一段落超過預算：在句末切分，各片段依序填入
+        for piece in _split_sentences(paragraph, max_tokens):
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                # 切開處的空白（含換行）在片段中被去除，記下是否為換行以便接回
+                boundary = current[-1][len(current[-1].rstrip()):] + piece[:len(piece) - len(piece.lstrip())]
+                flush('\n' if '\n' in boundary else '')
+            current.append(piece)
+            current_tokens += piece_tokens
+    flush("")
+    return chunks
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """
+    將原文切分成估計 token 數不超過 max_tokens 的片段（切分規則見 split_chunks）
+
+    Returns:
+        片段列表，原文不超過預算時只有一個片段
+    """
+    return [chunk for _, chunk in split_chunks(text, max_tokens)]
+
+
+def join_chunks(parts: Sequence[str], separators: Sequence[str]) -> str:
+    """依 split_chunks 記錄的分隔串接各片段（或其譯文）"""
+    joined = ""
+    for separator, part in zip(separators, parts):
+        joined += (separator if joined else "") + part
+    return joined
+
+
+def pack_items(sizes: Sequence[int], max_tokens: int, max_items: int) -> List[List[int]]:
+    """
+    將相鄰的項目依序分組，每組的 token 總數不超過 max_tokens、項目數不超過 max_items
+
+    Args:
+        sizes: 每個項目的估計 token 數
+        max_tokens: 每組的 token 預算（單一項目超過預算時自成一組）
+        max_items: 每組最多項目數
+
+    Returns:
+        以索引表示的分組
+    """
+    groups = []
+    current = []
+    current_tokens = 0
+    for index, size in enumerate(sizes):
+        if current and (current_tokens + size > max_tokens or len(current) >= max_items):
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += size
+    if current:
+        groups.append(current)
+    return groups
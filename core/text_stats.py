@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 文本統計
+
+ClassicTracker、TemplateGenerator 與 TranslationEngine 共用的字數統計：
+- 漢字涵蓋基本區、擴展 A–I 區、相容表意文字及〇（道藏常見的罕用字多在擴展區）
+- 標點涵蓋 CJK 標點、全形標點、通用標點與 ASCII 標點
+- 以預先編譯的正規表達式逐段比對，計數在 C 層級完成，不逐字建立 Python 物件
+- estimate_tokens 提供 AI 翻譯分段與提示詞大小估算用的 token 數
+"""
+
+import re
+from typing import Dict
+
+
+# 漢字（表意文字）區段
+CJK_RANGES = (
+    ('\u3007', '\u3007'),          # 〇
+    ('\u3400', '\u4dbf'),          # 擴展 A
+    ('\u4e00', '\u9fff'),          # 基本區
+    ('\uf900', '\ufaff'),          # 相容表意文字
+    ('\U00020000', '\U0002a6df'),  # 擴展 B
+    ('\U0002a700', '\U0002ebef'),  # 擴展 C–F
+    ('\U0002ebf0', '\U0002ee5f'),  # 擴展 I
+    ('\U0002f800', '\U0002fa1f'),  # 相容表意文字補充
+    ('\U00030000', '\U000323af'),  # 擴展 G–H
+)
+
+# 標點區段
+PUNCTUATION_RANGES = (
+    ('\u3001', '\u3003'),          # 、。〃
+    ('\u3008', '\u3011'),          # 〈〉《》「」『』【】
+    ('\u3014', '\u301f'),          # 〔〕〖〗〘〙〚〛〜〝〞〟
+    ('\u3030', '\u3030'),          # 〰
+    ('\u303d', '\u303d'),          # 〽
+    ('\u2010', '\u2027'),          # 連字號、引號、省略號
+    ('\u2030', '\u205e'),          # 其他通用標點
+    ('\ufe10', '\ufe19'),          # 直排標點
+    ('\ufe30', '\ufe6b'),          # 相容形式與小型變體
+    ('\uff01', '\uff0f'),          # ！＂＃…／
+    ('\uff1a', '\uff20'),          # ：；＜＝＞？＠
+    ('\uff3b', '\uff40'),          # ［＼］＾＿｀
+    ('\uff5b', '\uff65'),          # ｛｜｝～｟｠｡｢｣､･
+    ('!', '/'),
+    (':', '@'),
+    ('[', '`'),
+    ('{', '~'),
+)
+
+
+def _char_class(ranges) -> str:
+    return ''.join(re.escape(start) if start == end else f'{re.escape(start)}-{re.escape(end)}'
+                   for start, end in ranges)
+
+
+CJK_RUN_PATTERN = re.compile(f'[{_char_class(CJK_RANGES)}]+')
+PUNCTUATION_RUN_PATTERN = re.compile(f'[{_char_class(PUNCTUATION_RANGES)}]+')
+# 段落以空白行分隔
+PARAGRAPH_SEPARATOR = re.compile(r'\n[ \t　]*\n\s*')
+
+
+def _count_runs(pattern: re.Pattern, text: str) -> int:
+    # 以連續片段比對，每段只產生一個字串物件
+    return sum(map(len, pattern.findall(text)))
+
+
+def count_cjk(text: str) -> int:
+    """計算漢字數"""
+    return _count_runs(CJK_RUN_PATTERN, text)
+
+
+def count_punctuation(text: str) -> int:
+    """計算標點符號數"""
+    return _count_runs(PUNCTUATION_RUN_PATTERN, text)
+
+
+def count_lines(text: str) -> int:
+    """計算行數（最後一行沒有換行符號也計入）"""
+    if not text:
+        return 0
+    return text.count('\n') + (0 if text.endswith('\n') else 1)
+
+
+def count_paragraphs(text: str) -> int:
+    """計算段落數（以空白行分隔的非空區塊）"""
+    stripped = text.strip()
+    if not stripped:
+        return 0
+    return len(PARAGRAPH_SEPARATOR.split(stripped))
+
+
+def estimate_tokens(text: str) -> int:
+    """估計模型 token 數（漢字約每字 1 個，其餘字元約每 4 個 1 個）"""
+    cjk = count_cjk(text)
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def analyze_text(text: str) -> Dict[str, int]:
+    """
+    計算文本統計
+
+    Returns:
+        {"cjk_chars", "punctuation", "lines", "paragraphs", "total_chars"}
+    """
+    return {
+        "cjk_chars": count_cjk(text),
+        "punctuation": count_punctuation(text),
+        "lines": count_lines(text),
+        "paragraphs": count_paragraphs(text),
+        "total_chars": len(text)
+    }
@@ -1,69 +1,137 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-from core.unicode_handler import safe_print
 道教經典翻譯系統 - 經典追蹤核心
 
 整合原有的 classic_tracker.py 功能，提供統一的追蹤介面
+
+目錄資料經 core.catalogue_store 的儲存後端存取（classics.json 或 SQLite）
 """
 
-import json
-import hashlib
+import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Set
+
+from core.unicode_handler import safe_print
+from core.catalogue_store import open_catalogue_store
+from core.file_hasher import get_file_hasher
+from core.text_stats import count_cjk
+from core.progress_scanner import TranslationProgressScanner, TRANSLATION_PLACEHOLDER
+from core.corpus_index import get_corpus_index
+from core.catalogue_aggregates import CatalogueAggregates
 
 
 class ClassicTracker:
     """經典追蹤器核心類"""
     
-    def __init__(self, data_dir: Path = None):
-        """初始化追蹤器"""
+    def __init__(self, data_dir: Path = None, compact: bool = False, backend: str = None):
+        """
+        初始化追蹤器
+        
+        Args:
+            data_dir: 追蹤資料目錄
+            compact: JSON 後端以不縮排的緊湊格式儲存 classics.json
+            backend: 儲存後端 'json' 或 'sqlite'；None 時已有 classics.db 則用 SQLite
+        """
         self.data_dir = data_dir or Path("data/tracking")
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
         self.tracker_file = self.data_dir / "classics.json"
+        self.compact = compact
+        self.backend = backend
         self.load_tracker_data()
         
+        # 提交後通知的監聽器與尚未通知的變更經典ID
+        self._listeners = []
+        self._changed_ids = set()
+        self._changed_lock = threading.Lock()
+        self._batch_depth = 0
+        
+        # 累計統計（首次使用時由中繼資料載入）
+        self._aggregates = None
+        
+        # 翻譯檔案掃描結果快取在 data/cache/ 下
+        self.progress_scanner = TranslationProgressScanner(
+            self.data_dir.parent / "cache" / "translation_progress.json")
+        
     def load_tracker_data(self) -> None:
-        """載入追蹤資料"""
-        if self.tracker_file.exists():
-            try:
-                with open(self.tracker_file, 'r', encoding='utf-8') as f:
-                    self.data = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                self.data = self._create_empty_data()
-        else:
-            self.data = self._create_empty_data()
+        """載入追蹤資料（開啟儲存後端）"""
+        self.store = open_catalogue_store(self.data_dir, self.backend, compact=self.compact)
+        self._aggregates = None
+        
+    @property
+    def data(self) -> Dict:
+        """以 classics.json 結構表示的整個目錄（SQLite 後端時為唯讀快照）"""
+        return self.store.to_dict()
             
-    def _create_empty_data(self) -> Dict:
-        """創建空的追蹤資料結構"""
-        return {
-            "metadata": {
-                "created": datetime.now().isoformat(),
-                "last_updated": datetime.now().isoformat(),
-                "version": "2.0",
-                "total_classics": 0,
-                "total_chapters": 0,
-                "total_characters": 0
-            },
-            "classics": {}
-        }
-        
     def save_tracker_data(self) -> None:
-        """儲存追蹤資料"""
-        self.data["metadata"]["last_updated"] = datetime.now().isoformat()
-        
-        with open(self.tracker_file, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        """儲存追蹤資料（在 batch() 中時延後到交易結束才寫入）"""
+        self.store.update_metadata({"last_updated": datetime.now().isoformat()})
+        self.store.save()
+        if self._batch_depth == 0:
+            self._notify_listeners()
+            
+    def add_listener(self, callback: Callable[[Set[str]], None]) -> None:
+        """登記監聽器，每次提交後以變更的經典ID集合呼叫"""
+        self._listeners.append(callback)
+        
+    def remove_listener(self, callback: Callable[[Set[str]], None]) -> None:
+        """移除監聽器"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+            
+    def _mark_changed(self, classic_id: str) -> None:
+        with self._changed_lock:
+            self._changed_ids.add(classic_id)
+            
+    def _notify_listeners(self) -> None:
+        with self._changed_lock:
+            changed, self._changed_ids = self._changed_ids, set()
+        if not changed:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(changed)
+            except Exception as e:
+                safe_print(f"⚠️  監聽器處理失敗: {e}")
+        
+    @contextmanager
+    def batch(self):
+        """
+        交易：區塊內的所有修改在結束時只寫入一次
+        
+        區塊內發生例外時，所有修改回復到交易開始前的狀態，不寫入檔案。
+        可以巢狀使用，只有最外層結束時才會寫入。
+        
+        用法:
+            with tracker.batch():
+                tracker.track_new_classic(...)
+                tracker.check_translation_progress()
+        """
+        with self.store.transaction():
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._batch_depth == 1:
+                    with self._changed_lock:
+                        self._changed_ids.clear()
+                    # 目錄已回復，累計統計改由回復後的中繼資料重新載入
+                    self._aggregates = None
+                raise
+            finally:
+                self._batch_depth -= 1
+            outermost = self._batch_depth == 0
+            
+        if outermost:
+            self._notify_listeners()
             
     def generate_file_hash(self, file_path: Path) -> Optional[str]:
-        """生成檔案雜湊值用於檢測變更"""
-        try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except Exception:
-            return None
+        """生成檔案雜湊值用於檢測變更（經共享的雜湊快取）"""
+        return get_file_hasher().hash_file(file_path)
             
     def track_new_classic(self, book_info: Dict, chapters: List[Dict], 
                          source_dir: Path, translation_dir: Path) -> Dict:
@@ -85,7 +153,7 @@ class ClassicTracker:
                 try:
                     with open(chapter_file, 'r', encoding='utf-8') as f:
                         content = f.read()
-                        char_count = len([c for c in content if '\u4e00' <= c <= '\u9fff'])
+                        char_count = count_cjk(content)
                         total_chars += char_count
                 except Exception:
                     char_count = 0
@@ -121,17 +189,21 @@ class ClassicTracker:
         }
         
         # 記錄狀態
-        if classic_id not in self.data["classics"]:
+        old_record = self.store.get_classic(classic_id)
+        if old_record is None:
             safe_print(f"📚 新增經典: {book_info['title']}")
             classic_record["status"] = "新增"
         else:
             safe_print(f"🔄 更新經典: {book_info['title']}")
             classic_record["status"] = "更新"
             # 保留舊的添加時間
-            old_record = self.data["classics"][classic_id]
             classic_record["added_time"] = old_record.get("added_time", classic_record["added_time"])
         
-        self.data["classics"][classic_id] = classic_record
+        # 先載入累計統計（需在寫入前，否則首次重算已包含這筆記錄）
+        aggregates = self._get_aggregates()
+        self.store.put_classic(classic_id, classic_record)
+        self._mark_changed(classic_id)
+        aggregates.replace(old_record, classic_record)
         
         # 更新統計
         self._update_statistics()
@@ -191,80 +263,168 @@ class ClassicTracker:
         else:
             return '其他道教文獻'
             
+    def _get_aggregates(self) -> CatalogueAggregates:
+        """
+        累計統計
+        
+        由中繼資料載入；沒有保存或與中繼資料的總計不一致（如由舊版本寫入）時完整重算一次。
+        """
+        if self._aggregates is None:
+            metadata = self.store.get_metadata()
+            aggregates = CatalogueAggregates(metadata.get("aggregates"))
+            if ("aggregates" not in metadata
+                    or aggregates.totals["count"] != metadata.get("total_classics", 0)
+                    or aggregates.totals["chapters"] != metadata.get("total_chapters", 0)):
+                aggregates = CatalogueAggregates.rebuild(
+                    classic for _, classic in self.store.iter_classics())
+            self._aggregates = aggregates
+        return self._aggregates
+        
     def _update_statistics(self) -> None:
-        """更新統計資訊"""
-        total_classics = len(self.data["classics"])
-        total_chapters = sum(classic["chapter_count"] for classic in self.data["classics"].values())
-        total_characters = sum(classic["total_characters"] for classic in self.data["classics"].values())
-        
-        self.data["metadata"].update({
-            "total_classics": total_classics,
-            "total_chapters": total_chapters,
-            "total_characters": total_characters
+        """更新統計資訊（寫入累計統計，不重新走訪目錄）"""
+        aggregates = self._get_aggregates()
+        self.store.update_metadata({
+            "total_classics": aggregates.totals["count"],
+            "total_chapters": aggregates.totals["chapters"],
+            "total_characters": aggregates.totals["characters"],
+            "aggregates": aggregates.to_dict()
         })
         
-    def check_translation_progress(self) -> None:
-        """檢查翻譯進度"""
-        safe_print("🔍 檢查翻譯進度...")
+    def get_aggregates(self) -> Dict:
+        """累計統計：{"totals", "categories", "tags", "progress"}"""
+        aggregates = self._get_aggregates()
+        return dict(aggregates.to_dict(), progress=aggregates.overall_progress())
         
-        for classic_id, classic in self.data["classics"].items():
-            translation_dir = Path(classic["translation_dir"])
-            completed = 0
-            
-            if translation_dir.exists():
-                for chapter in classic["chapters"]:
-                    trans_file = translation_dir / f"{chapter['number']:02d}_{chapter['title']}.md"
-                    if trans_file.exists():
-                        # 檢查是否有實際翻譯內容（不只是模板）
-                        try:
-                            with open(trans_file, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                                if '[此處應為現代中文翻譯]' not in content and len(content) > 1000:
-                                    completed += 1
-                        except Exception:
-                            pass
-            
-            # 更新翻譯狀態
-            total = classic["chapter_count"]
-            percentage = (completed / total * 100) if total > 0 else 0
-            
-            classic["translation_status"].update({
-                "completed_chapters": completed,
-                "completion_percentage": round(percentage, 1),
-                "last_translation_update": datetime.now().isoformat()
-            })
+    def get_category_statistics(self) -> Dict[str, Dict]:
+        """各分類的經典數、章節數、字數與已完成章節數"""
+        return self._get_aggregates().to_dict()["categories"]
+        
+    def get_tag_statistics(self) -> Dict[str, Dict]:
+        """各標籤的經典數、章節數、字數與已完成章節數"""
+        return self._get_aggregates().to_dict()["tags"]
+        
+    def get_overall_progress(self) -> Dict:
+        """整體翻譯進度"""
+        return self._get_aggregates().overall_progress()
+        
+    def verify_aggregates(self, repair: bool = True) -> bool:
+        """
+        完整重算累計統計並與增量維護的結果比對
+        
+        Args:
+            repair: 不一致時以重算結果取代並寫入
             
-        self.save_tracker_data()
+        Returns:
+            bool: 是否一致
+        """
+        rebuilt = CatalogueAggregates.rebuild(classic for _, classic in self.store.iter_classics())
+        consistent = rebuilt == self._get_aggregates()
+        if not consistent:
+            safe_print("⚠️  累計統計與目錄不一致")
+            if repair:
+                self._aggregates = rebuilt
+                self._update_statistics()
+                self.save_tracker_data()
+                safe_print("🔧 已重算累計統計")
+        return consistent
+        
+    def _translation_file(self, classic: Dict, chapter: Dict) -> Path:
+        return Path(classic.get("translation_dir", "")) / f"{chapter['number']:02d}_{chapter['title']}.md"
+        
+    def _scan_translations(self, classics: List[Dict]) -> Dict[str, Optional[Dict]]:
+        """並行掃描所有經典的翻譯檔案（未變更的檔案使用快取結果）"""
+        paths = [self._translation_file(classic, chapter)
+                 for classic in classics for chapter in classic.get("chapters", [])]
+        results = self.progress_scanner.scan(paths)
+        self.progress_scanner.save_cache()
+        return results
+        
+    def check_translation_progress(self) -> None:
+        """檢查翻譯進度（只重新讀取有變更的翻譯檔案）"""
+        safe_print("🔍 檢查翻譯進度...")
+        self._update_translation_progress(list(self.store.iter_classics()))
+        
+    def refresh_translation_progress(self, changed_files: List[Path]) -> List[str]:
+        """
+        只更新翻譯目錄中有檔案變更的經典（檔案監看器回報變更時使用）
+        
+        Returns:
+            翻譯狀態有變化的經典ID列表
+        """
+        changed_dirs = {os.path.abspath(Path(file_path).parent) for file_path in changed_files}
+        classics = [
+            (classic_id, classic) for classic_id, classic in self.store.iter_classics()
+            if os.path.abspath(classic.get("translation_dir", "")) in changed_dirs
+        ]
+        return self._update_translation_progress(classics)
+        
+    def _update_translation_progress(self, classics: List) -> List[str]:
+        """重新計算指定經典的翻譯進度，返回狀態有變化的經典ID"""
+        results = self._scan_translations([classic for _, classic in classics])
+        updated = []
+        
+        with self.batch():
+            for classic_id, classic in classics:
+                # 檢查是否有實際翻譯內容（不只是模板）
+                completed = sum(
+                    1 for chapter in classic["chapters"]
+                    if self.progress_scanner.is_translated(
+                        results.get(os.path.abspath(self._translation_file(classic, chapter))), 1000)
+                )
+                
+                # 更新翻譯狀態
+                total = classic["chapter_count"]
+                percentage = round((completed / total * 100) if total > 0 else 0, 1)
+                status = classic.get("translation_status", {})
+                if (status.get("completed_chapters") == completed
+                        and status.get("completion_percentage") == percentage):
+                    continue
+                
+                self._get_aggregates().replace(
+                    classic, dict(classic, translation_status=dict(status, completed_chapters=completed)))
+                
+                self.store.update_translation_status(classic_id, {
+                    "completed_chapters": completed,
+                    "completion_percentage": percentage,
+                    "last_translation_update": datetime.now().isoformat()
+                })
+                updated.append(classic_id)
+                self._mark_changed(classic_id)
+                
+            if updated:
+                self._update_statistics()
+                self.save_tracker_data()
+                
+        return updated
         
     def get_statistics(self) -> Dict:
         """獲取統計資訊"""
-        return self.data.get("metadata", {})
+        return self.store.get_metadata()
         
     def get_all_classics(self) -> Dict:
         """獲取所有經典"""
-        return self.data.get("classics", {})
+        return dict(self.store.iter_classics())
         
     def get_classic_by_id(self, classic_id: str) -> Optional[Dict]:
         """根據ID獲取經典"""
-        return self.data["classics"].get(classic_id)
+        return self.store.get_classic(classic_id)
+        
+    def get_chapter_hash(self, classic_id: str, chapter_number: int) -> Optional[str]:
+        """獲取已追蹤章節的檔案雜湊值（未追蹤時返回 None）"""
+        return self.store.get_chapter_hash(classic_id, chapter_number)
         
     def get_classics_by_category(self, category: str) -> List[Dict]:
         """根據分類獲取經典"""
-        return [
-            classic for classic in self.data["classics"].values()
-            if classic.get("category") == category
-        ]
+        return self.store.classics_by_category(category)
         
     def get_classics_by_tag(self, tag: str) -> List[Dict]:
         """根據標籤獲取經典"""
-        return [
-            classic for classic in self.data["classics"].values()
-            if tag in classic.get("tags", [])
-        ]
+        return self.store.classics_by_tag(tag)
         
     def generate_report(self) -> str:
         """生成詳細報告"""
-        metadata = self.data.get("metadata", {})
+        data = self.store.to_dict()
+        metadata = data.get("metadata", {})
         
         report = f"""# 📊 道教經典追蹤報告
 
@@ -284,7 +444,7 @@ class ClassicTracker:
         
         # 按添加時間排序
         sorted_classics = sorted(
-            self.data["classics"].items(),
+            data["classics"].items(),
             key=lambda x: x[1]["added_time"],
             reverse=True
         )
@@ -307,32 +467,21 @@ class ClassicTracker:
 
 """
         
-        # 按分類統計
-        categories = {}
-        for classic in self.data["classics"].values():
-            category = classic["category"]
-            if category not in categories:
-                categories[category] = {"count": 0, "chapters": 0, "characters": 0}
-            categories[category]["count"] += 1
-            categories[category]["chapters"] += classic["chapter_count"]
-            categories[category]["characters"] += classic["total_characters"]
-            
+        # 按分類統計（累計統計）
         report += "## 📊 分類統計\n\n"
-        for category, stats in categories.items():
+        for category, stats in self.get_category_statistics().items():
             report += f"- **{category}**: {stats['count']} 部, {stats['chapters']} 章, {stats['characters']:,} 字\n"
             
         # 翻譯進度統計
-        total_chapters = sum(c["chapter_count"] for c in self.data["classics"].values())
-        completed_chapters = sum(c["translation_status"]["completed_chapters"] for c in self.data["classics"].values())
-        overall_progress = (completed_chapters / total_chapters * 100) if total_chapters > 0 else 0
+        progress = self.get_overall_progress()
         
         report += f"""
 
 ## 🎯 翻譯進度總覽
 
-- **總章節**: {total_chapters} 章
-- **已完成**: {completed_chapters} 章
-- **整體進度**: {overall_progress:.1f}%
+- **總章節**: {progress['total_chapters']} 章
+- **已完成**: {progress['completed_chapters']} 章
+- **整體進度**: {progress['completion_percentage']:.1f}%
 
 ---
 *本報告由道教經典翻譯系統 v2.0 自動生成*
@@ -357,44 +506,31 @@ class ClassicTracker:
     def get_untranslated_files(self) -> List[str]:
         """獲取所有未翻譯的原文檔名列表，會檢查翻譯檔案內容以確保不是只有模板。"""
         untranslated_files = []
-        base_source_path = Path.cwd() / 'docs' / 'source_texts'
-
-        for classic in self.data.get("classics", {}).values():
-            source_dir = Path(classic.get("source_dir", ""))
-            translation_dir = Path(classic.get("translation_dir", ""))
+        
+        # 由語料索引判斷檔案狀態，只重新讀取有變更的檔案
+        index = get_corpus_index()
+        index.refresh()
+        
+        for _, classic in self.store.iter_classics():
+            book_id = Path(classic.get("source_dir", "")).name
+            book = index.get_book(book_id)
             
-            if not source_dir.is_dir() or not translation_dir.is_dir():
+            if book is None or book["source_dir_mtime_ns"] is None or book["translation_dir_mtime_ns"] is None:
                 continue
-
+            
             for chapter in classic.get("chapters", []):
-                original_filename = f"{chapter['number']:02d}_{chapter['title']}.txt"
-                translation_filename = f"{chapter['number']:02d}_{chapter['title']}.md"
+                stem = f"{chapter['number']:02d}_{chapter['title']}"
+                entry = index.get_chapter(book_id, stem)
+                if not entry or not entry.get("source"):
+                    continue
                 
-                # Construct the full path to the original file
-                original_file_path = source_dir / "原文" / original_filename
-                translation_file_path = translation_dir / translation_filename
-
-                is_translated = False
-                if translation_file_path.exists():
-                    try:
-                        with open(translation_file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            if '[此處應為現代中文翻譯]' not in content and len(content.strip()) > 500:
-                                is_translated = True
-                    except Exception:
-                        pass
-
-                if original_file_path.exists() and not is_translated:
-                    try:
-                        # This creates a path relative to the `docs/source_texts` directory
-                        relative_path = original_file_path.relative_to(base_source_path)
-                        untranslated_files.append(str(relative_path).replace('\\', '/'))
-                    except ValueError:
-                        # Fallback for cases where the path logic might fail
-                        # This part might need adjustment if paths are not consistent
-                        folder_name = source_dir.name
-                        relative_fallback = f"{folder_name}/原文/{original_filename}"
-                        untranslated_files.append(relative_fallback.replace('\\', '/'))
+                is_translated = (bool(entry.get("translation"))
+                                 and not index.has_markers(entry, (TRANSLATION_PLACEHOLDER,))
+                                 and entry.get("translation_chars", 0) > 500)
+                
+                if not is_translated:
+                    # 相對於 docs/source_texts 的路徑
+                    untranslated_files.append(f"{book_id}/原文/{stem}.txt")
 
         return untranslated_files
 
@@ -408,14 +544,3 @@ def get_tracker() -> ClassicTracker:
     if _tracker_instance is None:
         _tracker_instance = ClassicTracker()
     return _tracker_instance
-
-
-# 全域追蹤器實例
-_tracker_instance = None
-
-def get_tracker() -> ClassicTracker:
-    """獲取全域追蹤器實例"""
-    global _tracker_instance
-    if _tracker_instance is None:
-        _tracker_instance = ClassicTracker()
-    return _tracker_instance
\ No newline at end of file
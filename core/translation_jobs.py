@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - AI 翻譯工作佇列
+
+批量 AI 翻譯的排程與檢查點：
+- TranslationJobQueue 將每個檔案的狀態與嘗試次數保存到 data/cache/translation_jobs/，
+  批量翻譯中斷後以相同參數重新執行時，已完成的檔案直接略過
+- TranslationWorkerPool 以固定數量的工作執行緒同時翻譯多個檔案，
+  失敗的工作依指數退避重試，進度以 (已完成, 總數, 檔名) 回報；
+  可依規劃將多個短章節合併成一個工作，合併翻譯失敗的檔案改為逐檔翻譯
+- 請求頻率由呼叫端在實際送出模型請求前以共享的 RateLimiter 控制
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class PermanentJobError(Exception):
+    """不需重試的工作失敗（如檔案中沒有原文）"""
+
+
+class TranslationJobQueue:
+    """可續傳的翻譯工作佇列（執行緒安全）"""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCESS = "success"
+    STATUS_FAILED = "failed"
+
+    def __init__(self, batch_key: str, queue_dir: Path = None):
+        """
+        初始化佇列（同一批次的佇列檔存在時自動載入）
+
+        Args:
+            batch_key: 批次識別字串（如目錄與檔案模式），決定佇列檔名
+            queue_dir: 佇列檔目錄
+        """
+        self.batch_key = batch_key
+        self.queue_dir = Path(queue_dir or "data/cache/translation_jobs")
+        digest = hashlib.sha1(batch_key.encode('utf-8')).hexdigest()[:16]
+        self.queue_file = self.queue_dir / f"{digest}.json"
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """載入佇列；上次中斷時執行中的工作恢復為待處理"""
+        self.data = None
+        if self.queue_file.exists():
+            try:
+                with open(self.queue_file, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                self.data = None
+
+        if not self.data or self.data.get("batch_key") != self.batch_key:
+            self.data = {
+                "batch_key": self.batch_key,
+                "created": datetime.now().isoformat(),
+                "last_updated": datetime.now().isoformat(),
+                "jobs": {}
+            }
+
+        for job in self.data["jobs"].values():
+            if job["status"] == self.STATUS_RUNNING:
+                job["status"] = self.STATUS_PENDING
+
+    def save(self) -> None:
+        """原子性地儲存佇列"""
+        # 取快照與寫檔之間不可穿插其他執行緒的寫入，否則較舊的快照可能覆蓋較新的
+        with self._save_lock:
+            with self._lock:
+                self.data["last_updated"] = datetime.now().isoformat()
+                content = json.dumps(self.data, ensure_ascii=False, indent=2)
+
+            self.queue_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = self.queue_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_file, self.queue_file)
+
+    def discard(self) -> None:
+        """刪除佇列檔（批次全部成功後不需要續傳）"""
+        try:
+            self.queue_file.unlink()
+        except FileNotFoundError:
+            pass
+
+    def add_jobs(self, paths: Iterable[Path], retry_failed: bool = True) -> None:
+        """
+        登記工作；已登記的檔案保留原狀態
+
+        Args:
+            paths: 要翻譯的檔案
+            retry_failed: 上次失敗的工作是否重新排入（嘗試次數歸零）
+        """
+        with self._lock:
+            jobs = self.data["jobs"]
+            for path in paths:
+                job = jobs.setdefault(str(path), {"status": self.STATUS_PENDING, "attempts": 0})
+                if retry_failed and job["status"] == self.STATUS_FAILED:
+                    job.update(status=self.STATUS_PENDING, attempts=0)
+                    job.pop("error", None)
+        self.save()
+
+    def pending(self) -> List[Path]:
+        """尚未完成的工作，依登記順序"""
+        with self._lock:
+            return [Path(path) for path, job in self.data["jobs"].items()
+                    if job["status"] in (self.STATUS_PENDING, self.STATUS_RUNNING)]
+
+    def count(self, status: str) -> int:
+        """指定狀態的工作數"""
+        with self._lock:
+            return sum(1 for job in self.data["jobs"].values() if job["status"] == status)
+
+    def __len__(self) -> int:
+        return len(self.data["jobs"])
+
+    def mark(self, path: Path, status: str, error: str = None) -> None:
+        """更新工作狀態並立即保存"""
+        with self._lock:
+            job = self.data["jobs"].setdefault(str(path), {"status": status, "attempts": 0})
+            job["status"] = status
+            job["updated"] = datetime.now().isoformat()
+            if status == self.STATUS_RUNNING:
+                job["attempts"] += 1
+            if error:
+                job["error"] = error
+            else:
+                job.pop("error", None)
+        self.save()
+
+    def results(self) -> List[Dict]:
+        """每個工作的最終狀態（batch_translate_directory 的 files 欄位格式）"""
+        with self._lock:
+            return [{"file": path, "status": job["status"], "attempts": job["attempts"]}
+                    for path, job in self.data["jobs"].items()]
+
+
+class TranslationWorkerPool:
+    """以工作執行緒池執行佇列中的翻譯工作"""
+
+    def __init__(self, worker: Callable[[Path], bool], max_workers: int = 4,
+                 max_retries: int = 3, retry_backoff: float = 5.0,
+                 progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                 batch_worker: Optional[Callable[[List[Path]], Dict[Path, bool]]] = None):
+        """
+        初始化工作池
+
+        Args:
+            worker: 翻譯單一檔案，成功返回 True；返回 False 或拋出例外視為可重試的失敗，
+                PermanentJobError 則直接記為失敗
+            max_workers: 同時進行的翻譯數
+            max_retries: 每個工作在首次嘗試之外的最大重試次數
+            retry_backoff: 第一次重試前的等待秒數，之後每次加倍（另加最多 10% 隨機抖動）
+            progress_callback: 每完成一個工作時以 (已完成, 總數, 檔名) 呼叫
+            batch_worker: 一次翻譯多個檔案，返回 {檔案: 是否成功}；未成功的檔案改由 worker 逐一處理
+        """
+        self.worker = worker
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.progress_callback = progress_callback
+        self.batch_worker = batch_worker
+        self._progress_lock = threading.Lock()
+        self._completed = 0
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """要求停止：執行中的工作完成後不再取新工作（未完成的工作保留在佇列中）"""
+        self._stop.set()
+
+    def run(self, queue: TranslationJobQueue,
+            plan: Optional[Callable[[List[Path]], List[List[Path]]]] = None) -> Dict[str, int]:
+        """
+        執行佇列中所有未完成的工作
+
+        Args:
+            queue: 工作佇列
+            plan: 將待處理檔案分組，每組由一個工作執行緒處理（多於一個檔案的組交給 batch_worker）
+
+        Returns:
+            {"success": 本次成功數, "failed": 本次失敗數, "skipped": 先前已完成而略過的數量}
+        """
+        pending = queue.pending()
+        total = len(queue)
+        skipped = queue.count(TranslationJobQueue.STATUS_SUCCESS)
+        self._completed = skipped
+        self._stop.clear()
+
+        if self.progress_callback:
+            self.progress_callback(self._completed, total, "")
+
+        counts = {"success": 0, "failed": 0, "skipped": skipped}
+        if not pending:
+            return counts
+
+        units = plan(pending) if plan else [[path] for path in pending]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(units))) as executor:
+            try:
+                for outcomes in executor.map(lambda unit: self._run_unit(queue, unit, total), units):
+                    for success in outcomes:
+                        if success is not None:
+                            counts["success" if success else "failed"] += 1
+            except KeyboardInterrupt:
+                # 等待執行中的工作結束，其餘工作留在佇列中供下次續傳
+                self.stop()
+                raise
+        return counts
+
+    def _run_unit(self, queue: TranslationJobQueue, unit: List[Path], total: int) -> List[Optional[bool]]:
+        """執行一組工作：多個檔案時先合併翻譯一次，其餘檔案再逐一處理"""
+        if len(unit) == 1 or self.batch_worker is None:
+            return [self._run_job(queue, path, total) for path in unit]
+
+        if self._stop.is_set():
+            return [self._run_job(queue, path, total) for path in unit]
+
+        for path in unit:
+            queue.mark(path, TranslationJobQueue.STATUS_RUNNING)
+        try:
+            results = self.batch_worker(unit) or {}
+        except Exception:
+            results = {}
+
+        outcomes = []
+        for path in unit:
+            if results.get(path):
+                queue.mark(path, TranslationJobQueue.STATUS_SUCCESS)
+                self._report(total, path)
+                outcomes.append(True)
+            else:
+                outcomes.append(self._run_job(queue, path, total))
+        return outcomes
+
+    def _run_job(self, queue: TranslationJobQueue, path: Path, total: int) -> Optional[bool]:
+        """執行單一工作（含重試），停止時返回 None"""
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if self._stop.is_set():
+                queue.mark(path, TranslationJobQueue.STATUS_PENDING)
+                return None
+            if attempt > 0:
+                delay = self.retry_backoff * (2 ** (attempt - 1))
+                # 等待期間收到停止要求時立即結束
+                if self._stop.wait(delay * (1 + random.random() * 0.1)):
+                    queue.mark(path, TranslationJobQueue.STATUS_PENDING)
+                    return None
+
+            queue.mark(path, TranslationJobQueue.STATUS_RUNNING)
+            try:
+                if self.worker(path):
+                    queue.mark(path, TranslationJobQueue.STATUS_SUCCESS)
+                    self._report(total, path)
+                    return True
+                error = "翻譯失敗"
+            except PermanentJobError as e:
+                error = str(e)
+                break
+            except Exception as e:
+                error = str(e) or type(e).__name__
+
+        queue.mark(path, TranslationJobQueue.STATUS_FAILED, error)
+        self._report(total, path)
+        return False
+
+    def _report(self, total: int, path: Path) -> None:
+        with self._progress_lock:
+            self._completed += 1
+            if self.progress_callback:
+                self.progress_callback(self._completed, total, path.name)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 翻譯記憶
+
+道藏中大量重複的套語（開經偈、「太上曰」開頭、結經讚頌等）只需要翻譯一次：
+- 以段落（行）為單位保存「原文 → 譯文」，以去除標點與空白後的正規化文字為鍵，完全相同的段落直接取用
+- 以漢字二元組（bigram）倒排索引找出相似段落（Dice 係數），作為翻譯時的參考上下文
+- 保存到 data/cache/translation_memory.json，載入時重建索引
+"""
+
+import json
+import os
+import threading
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .text_stats import PUNCTUATION_RUN_PATTERN
+
+
+# 出現在超過此數量段落中的二元組對找相似段落幫助不大，略過以限制比對成本
+_COMMON_GRAM_LIMIT = 2000
+
+
+def normalize_segment(text: str) -> str:
+    """正規化段落：全形半形統一、去除標點與空白"""
+    text = unicodedata.normalize('NFKC', text)
+    text = PUNCTUATION_RUN_PATTERN.sub('', text)
+    return ''.join(text.split())
+
+
+def split_segments(text: str) -> List[str]:
+    """
+    將文本切成段落（每個非空行為一段）
+
+    原文檔案每段一行、段間空行；偈頌在原文中逐句分段，譯文中常只以換行分隔，
+    以行為單位兩者才能逐段對齊
+    """
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _bigrams(key: str) -> set:
+    if len(key) < 2:
+        return {key} if key else set()
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+class TranslationMemory:
+    """段落層級的翻譯記憶（執行緒安全）"""
+
+    def __init__(self, memory_file: Path = None, min_chars: int = 8):
+        """
+        初始化翻譯記憶
+
+        Args:
+            memory_file: 保存檔案，None 表示只在記憶體中保存
+            min_chars: 正規化後少於此字數的段落（如單獨的標題）不收錄也不查詢
+        """
+        self.memory_file = Path(memory_file) if memory_file else None
+        self.min_chars = min_chars
+
+        self._entries = {}
+        self._keys = []
+        self._key_ids = {}
+        self._grams = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.stats = {"lookups": 0, "hits": 0, "hit_chars": 0}
+        self.load()
+
+    def load(self) -> None:
+        """載入記憶並重建相似度索引"""
+        entries = {}
+        if self.memory_file is not None and self.memory_file.exists():
+            try:
+                with open(self.memory_file, 'r', encoding='utf-8') as f:
+                    entries = json.load(f).get("entries", {})
+            except (json.JSONDecodeError, FileNotFoundError, AttributeError):
+                entries = {}
+
+        with self._lock:
+            self._entries = {}
+            self._keys = []
+            self._key_ids = {}
+            self._grams = {}
+            for key, entry in entries.items():
+                self._insert(key, entry)
+            self._dirty = False
+
+    def save(self) -> None:
+        """原子性地儲存（沒有變更時不寫入）"""
+        if self.memory_file is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            content = json.dumps({"entries": self._entries}, ensure_ascii=False, separators=(',', ':'))
+            self._dirty = False
+
+            self.memory_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.memory_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_file, self.memory_file)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _insert(self, key: str, entry: Dict) -> None:
+        """加入或更新一筆記錄（呼叫者需持有鎖）"""
+        if key not in self._key_ids:
+            key_id = len(self._keys)
+            self._keys.append(key)
+            self._key_ids[key] = key_id
+            for gram in _bigrams(key):
+                self._grams.setdefault(gram, []).append(key_id)
+        self._entries[key] = entry
+
+    def add(self, source: str, translation: str, origin: str = "") -> bool:
+        """
+        收錄一個段落的譯文
+
+        Returns:
+            bool: 是否收錄（過短或譯文為空時不收錄）
+        """
+        key = normalize_segment(source)
+        translation = translation.strip()
+        if len(key) < self.min_chars or not translation:
+            return False
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing and existing["translation"] == translation:
+                return True
+            self._insert(key, {
+                "source": source.strip(),
+                "translation": translation,
+                "origin": origin,
+                "updated": datetime.now().isoformat()
+            })
+            self._dirty = True
+        return True
+
+    def add_aligned(self, source_text: str, translation_text: str, origin: str = "") -> int:
+        """
+        收錄逐段對應的原文與譯文（段落數不同時無法對齊，不收錄）
+
+        Returns:
+            int: 收錄的段落數
+        """
+        sources = split_segments(source_text)
+        translations = split_segments(translation_text)
+        if not sources or len(sources) != len(translations):
+            return 0
+        return sum(self.add(source, translation, origin) for source, translation in zip(sources, translations))
+
+    def lookup(self, segment: str) -> Optional[str]:
+        """完全相符（正規化後）的段落譯文"""
+        key = normalize_segment(segment)
+        if len(key) < self.min_chars:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            self.stats["lookups"] += 1
+            if entry is not None:
+                self.stats["hits"] += 1
+                self.stats["hit_chars"] += len(key)
+                return entry["translation"]
+        return None
+
+    def search(self, segment: str, threshold: float = 0.6, limit: int = 3) -> List[Tuple[float, str, str]]:
+        """
+        相似段落
+
+        Returns:
+            [(相似度, 原文, 譯文)]，依相似度由高到低，不含完全相符的段落
+        """
+        key = normalize_segment(segment)
+        grams = _bigrams(key)
+        if len(key) < self.min_chars or not grams:
+            return []
+
+        with self._lock:
+            counts = Counter()
+            for gram in grams:
+                postings = self._grams.get(gram)
+                if postings and len(postings) <= _COMMON_GRAM_LIMIT:
+                    counts.update(postings)
+
+            # 共有二元組數的上限決定 Dice 係數的上限，先以此排除
+            minimum_shared = threshold * len(grams) / 2
+            matches = []
+            for key_id, shared in counts.most_common():
+                if shared < minimum_shared:
+                    break
+                candidate = self._keys[key_id]
+                if candidate == key:
+                    continue
+                score = 2 * len(grams & _bigrams(candidate)) / (len(grams) + len(_bigrams(candidate)))
+                if score >= threshold:
+                    entry = self._entries[candidate]
+                    matches.append((round(score, 3), entry["source"], entry["translation"]))
+
+        matches.sort(key=lambda match: match[0], reverse=True)
+        return matches[:limit]
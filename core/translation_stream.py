@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+道教經典翻譯系統 - 串流翻譯輸出
+
+模型輸出以片段陸續到達時：
+- TranslationStream 累積輸出並找出「### 現代中文翻譯」中已完成（其後已換行）的譯文段落
+- TranslationCheckpoints 保存每段原文已完成的譯文段落（請求成功後保存完整結果），
+  請求中途逾時或中斷後，重試時只需翻譯其餘段落；分段翻譯時已成功的分段不再重新請求
+- PartialTemplateWriter 將從頭連續完成的段落依原文順序寫入翻譯模板，翻譯進行中即可查看
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from .translation_memory import split_segments
+
+
+# 未完成的譯文之前加上的說明（與佔位文字一起放在譯文最前面，進度掃描不會把檔案當作已翻譯）
+PARTIAL_NOTICE = "> ⏳ 翻譯進行中：已完成 {done}/{total} 段"
+
+_TRANSLATION_HEADING = re.compile(r'###\s*現代中文翻譯[ \t]*\n')
+_NEXT_SECTION = re.compile(r'^###', re.MULTILINE)
+
+
+def completed_paragraphs(output: str) -> List[str]:
+    """
+    串流輸出中已完成的譯文段落
+
+    譯文段落以行為單位（與 split_segments 相同）；最後一行在收到換行之前可能仍在生成，
+    下一個「###」標題出現後譯文部分才算全部完成
+    """
+    match = _TRANSLATION_HEADING.search(output)
+    if not match:
+        return []
+    body = output[match.end():]
+    end = _NEXT_SECTION.search(body)
+    if end:
+        return split_segments(body[:end.start()])
+    return split_segments(body[:body.rfind('\n') + 1])
+
+
+class TranslationStream:
+    """一個請求的串流輸出：已完成的譯文段落增加時呼叫 on_paragraphs(全部已完成段落)"""
+
+    def __init__(self, on_paragraphs: Callable[[List[str]], None]):
+        self.on_paragraphs = on_paragraphs
+        self.output = ""
+        self.completed = 0
+
+    def feed(self, delta: str) -> None:
+        """加入一個輸出片段"""
+        self.output += delta
+        # 段落只在換行時完成，沒有換行的片段不需重新解析
+        if '\n' not in delta:
+            return
+        paragraphs = completed_paragraphs(self.output)
+        if len(paragraphs) > self.completed:
+            self.completed = len(paragraphs)
+            self.on_paragraphs(paragraphs)
+
+    def reset(self) -> None:
+        """改用其他後端重新請求時清除已累積的輸出"""
+        self.output = ""
+        self.completed = 0
+
+
+class TranslationCheckpoints:
+    """串流翻譯的檢查點（以原文雜湊為鍵，執行緒安全）"""
+
+    def __init__(self, checkpoint_dir: Path = None):
+        self.checkpoint_dir = Path(checkpoint_dir or "data/cache/translation_checkpoints")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _path(self, digest: str) -> Path:
+        return self.checkpoint_dir / f"{digest[:16]}.json"
+
+    def load(self, text: str) -> Tuple[List[str], Optional[str]]:
+        """
+        原文的檢查點
+
+        Returns:
+            (已完成的譯文段落, 請求成功時的完整結果)；沒有檢查點時為 ([], None)
+        """
+        digest = self._digest(text)
+        try:
+            with open(self._path(digest), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return [], None
+        if data.get("source_digest") != digest:
+            return [], None
+        return list(data.get("paragraphs", [])), data.get("result")
+
+    def save(self, text: str, paragraphs: List[str], result: str = None) -> None:
+        """原子性地保存已完成的段落（請求成功時連同完整結果）"""
+        digest = self._digest(text)
+        content = json.dumps({
+            "source_digest": digest,
+            "paragraphs": paragraphs,
+            "result": result,
+            "updated": datetime.now().isoformat()
+        }, ensure_ascii=False, indent=2)
+
+        with self._lock:
+            self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            checkpoint_file = self._path(digest)
+            temp_file = checkpoint_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_file, checkpoint_file)
+
+    def clear(self, text: str) -> None:
+        """整段原文翻譯完成後刪除檢查點"""
+        try:
+            self._path(self._digest(text)).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class PartialTemplateWriter:
+    """
+    將部分譯文依原文順序寫入翻譯模板
+
+    原文的每個段落是一個位置：翻譯記憶命中的段落一開始就已填入，其餘位置依請求順序
+    （分段翻譯時每段各佔連續的位置）由串流輸出填入。過長的段落被切到多個分段時，
+    以 subdivide 將該位置分成多個部分，全部完成後直接相接。只寫出從頭連續完成的段落，
+    且兩次寫入至少間隔 interval 秒。
+    """
+
+    def __init__(self, write: Callable[[List[str], int], None], interval: float = 2.0):
+        """
+        Args:
+            write: write(從頭連續完成的段落, 總段數)，負責實際寫檔
+            interval: 兩次寫入的最短間隔秒數
+        """
+        self.write = write
+        self.interval = interval
+        self.slots = []
+        self._open = []
+        self._written = 0
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def layout(self, slots: List[Optional[str]]) -> None:
+        """設定各位置（None 表示待翻譯），重新翻譯時可再次呼叫"""
+        with self._lock:
+            self.slots = list(slots)
+            # 待翻譯位置：(段落位置, 部分索引)，未分部分時部分索引為 None
+            self._open = [(index, None) for index, slot in enumerate(self.slots) if slot is None]
+            self._written = 0
+
+    def subdivide(self, open_index: int, parts: int) -> None:
+        """將第 open_index 個待翻譯位置分成 parts 個部分（之後的待翻譯位置順延）"""
+        with self._lock:
+            position, _ = self._open[open_index]
+            self.slots[position] = [None] * parts
+            self._open[open_index:open_index + 1] = [(position, part) for part in range(parts)]
+
+    def fill(self, offset: int, paragraphs: List[str]) -> None:
+        """從第 offset 個待翻譯位置起依序填入段落"""
+        with self._lock:
+            for (position, part), paragraph in zip(self._open[offset:], paragraphs):
+                if part is None:
+                    self.slots[position] = paragraph
+                else:
+                    self.slots[position][part] = paragraph
+            self._flush(force=False)
+
+    def flush(self) -> None:
+        """立即寫出目前完成的部分（翻譯失敗時保留已完成的段落）"""
+        with self._lock:
+            self._flush(force=True)
+
+    def _flush(self, force: bool) -> None:
+        prefix = []
+        for slot in self.slots:
+            if isinstance(slot, list):
+                if None in slot:
+                    break
+                slot = ''.join(slot)
+            if slot is None:
+                break
+            prefix.append(slot)
+        if not prefix or (not force and len(prefix) <= self._written):
+            return
+        now = time.monotonic()
+        if not force and now - self._last_write < self.interval:
+            return
+        self.write(prefix, len(self.slots))
+        self._written = len(prefix)
+        self._last_write = now
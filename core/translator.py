@@ -6,17 +6,32 @@
 整合原有的 auto_translator.py 功能，提供統一的翻譯介面
 """
 
+import asyncio
+import os
 import requests
 import re
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 from .tracker import ClassicTracker
 from .file_monitor import FileMonitor
+from .rate_limiter import RateLimiter
+from .async_http import AsyncFetcher
+from .http_cache import CachingAdapter, get_response_cache, set_offline_mode
+from .page_store import Page, PageStore
+from .chapter_prober import ChapterProber
+from .book_manifest import BookManifest
+from .file_hasher import get_file_hasher
+from .text_stats import analyze_text
+from .html_backend import resolve_backend, chapter_paragraphs
+
+# 翻譯模板中尚未翻譯的標記；不含這些標記的既有模板視為已有人工或AI翻譯
+TEMPLATE_PLACEHOLDERS = ("[此處應為現代中文翻譯]", "🔄 待翻譯")
 
 # 確保safe_print在所有地方都可用
 try:
@@ -43,7 +58,12 @@ class TranslationEngine:
     def __init__(self, config: Dict = None):
         """初始化翻譯引擎"""
         self.config = config or self._load_default_config()
+        self.response_cache = self._create_response_cache()
         self.session = self._create_session()
+        self.rate_limiter = self._create_rate_limiter()
+        self.parser_backend = resolve_backend(self.config.get("html_parser", "lxml"))
+        self.page_store = PageStore(self._get, parser=self.parser_backend)
+        self.prober = self._create_prober()
         self.tracker = ClassicTracker()
         self.file_monitor = FileMonitor()
         
@@ -60,52 +80,155 @@ class TranslationEngine:
             "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             "request_delay": 2,
             "max_retries": 3,
-            "timeout": 10
+            "timeout": 10,
+            "max_workers": 1,
+            "requests_per_second": None,
+            "burst": 1,
+            "http_backend": "requests",
+            "per_host_limit": 4,
+            "http_cache": True,
+            "cache_dir": "data/cache/http",
+            "cache_ttl": 86400,
+            "cache_max_mb": 500,
+            "offline": False,
+            "html_parser": "lxml",
+            "probe_workers": 8,
+            "probe_requests_per_second": None,
+            "probe_miss_limit": 5,
+            "resume": True,
+            "manifest_dir": "data/manifests",
+            "incremental": True
         }
         
+    def _create_response_cache(self):
+        """創建共享的HTTP回應快取（http_cache 關閉時返回 None）"""
+        if self.config.get("offline"):
+            set_offline_mode(True)
+            
+        if not self.config.get("http_cache", True):
+            return None
+            
+        return get_response_cache(
+            self.config.get("cache_dir", "data/cache/http"),
+            ttl=self.config.get("cache_ttl", 86400),
+            max_bytes=int(self.config.get("cache_max_mb", 500) * 1024 * 1024)
+        )
+        
     def _create_session(self) -> requests.Session:
         """創建HTTP會話"""
         session = requests.Session()
         session.headers.update({
             'User-Agent': self.config["user_agent"]
         })
+        
+        # 連線池大小需容納所有工作執行緒
+        pool_size = max(10, self.config.get("max_workers", 1))
+        if self.response_cache is not None:
+            adapter = CachingAdapter(self.response_cache,
+                                     pool_connections=pool_size, pool_maxsize=pool_size)
+        else:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
         return session
         
+    def _create_rate_limiter(self) -> RateLimiter:
+        """創建共享的請求速率限制器（未指定速率時由 request_delay 推算）"""
+        burst = self.config.get("burst", 1)
+        rate = self.config.get("requests_per_second")
+        if rate is None:
+            return RateLimiter.from_delay(self.config.get("request_delay", 0), burst)
+        return RateLimiter(rate, burst)
+        
+    def _create_prober(self) -> ChapterProber:
+        """創建章節探測器（probe_requests_per_second 為 None 時與一般請求共用限制器）"""
+        workers = self.config.get("probe_workers", 8)
+        rate = self.config.get("probe_requests_per_second")
+        rate_limiter = self.rate_limiter if rate is None else RateLimiter(rate, workers)
+        return ChapterProber(self.session, rate_limiter=rate_limiter, cache=self.response_cache,
+                             max_workers=workers, timeout=5)
+        
+    def create_async_fetcher(self) -> AsyncFetcher:
+        """創建與本引擎設定一致的非同步抓取器（與同步路徑共用速率限制器）"""
+        return AsyncFetcher(
+            headers={'User-Agent': self.config["user_agent"]},
+            timeout=self.config.get("timeout", 10),
+            max_retries=self.config.get("max_retries", 3),
+            per_host_limit=self.config.get("per_host_limit", 4),
+            rate_limiter=self.rate_limiter,
+            cache=self.response_cache
+        )
+        
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """經速率限制器發送GET請求（可由快取直接回應時不消耗令牌）"""
+        if not self._served_from_cache(url):
+            self.rate_limiter.acquire()
+        return self.session.get(url, **kwargs)
+        
+    def _served_from_cache(self, url: str) -> bool:
+        """請求能否不經網路由快取回應"""
+        if self.response_cache is None:
+            return False
+        prepared_url = self.session.prepare_request(requests.Request('GET', url)).url
+        return self.response_cache.can_serve(prepared_url)
+        
     def extract_book_id(self, url: str) -> Optional[str]:
         """從URL提取書籍ID"""
         match = re.search(r'/book/([^/?]+)', url)
         return match.group(1) if match else None
         
+    def _fetch_page(self, url: str, timeout: float = None):
+        """經本次流程的頁面存放區取得頁面，同一網址只下載和解析一次"""
+        return self.page_store.get(url, timeout=timeout or self.config["timeout"])
+        
     def get_book_info(self, book_url: str) -> Dict:
         """獲取書籍基本資訊"""
         try:
-            response = self.session.get(book_url, timeout=self.config["timeout"])
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            book_id = self.extract_book_id(book_url)
+            page = self._fetch_page(book_url)
+            page.raise_for_status()
+            return self._parse_book_info(page.soup, book_url)
             
-            # 提取書籍標題
-            book_title = self._extract_title(soup, book_id)
-            
-            # 提取作者資訊
-            author = self._extract_author(soup)
+        except Exception as e:
+            safe_print(f"⚠️  獲取書籍資訊失敗: {e}")
+            return self._fallback_book_info(book_url)
             
-            return {
-                'id': book_id,
-                'title': book_title,
-                'author': author,
-                'url': book_url
-            }
+    async def get_book_info_async(self, book_url: str, fetcher: AsyncFetcher) -> Dict:
+        """獲取書籍基本資訊（非同步版本）"""
+        try:
+            page = await self._fetch_page_async(book_url, fetcher)
+            if page.status_code != 200:
+                raise RuntimeError(f"HTTP {page.status_code}")
+            return self._parse_book_info(page.soup, book_url)
             
         except Exception as e:
             safe_print(f"⚠️  獲取書籍資訊失敗: {e}")
-            return {
-                'id': self.extract_book_id(book_url),
-                'title': self.extract_book_id(book_url),
-                'author': "未知作者",
-                'url': book_url
-            }     
+            return self._fallback_book_info(book_url)
+            
+    def _parse_book_info(self, soup: BeautifulSoup, book_url: str) -> Dict:
+        """從已解析的書籍頁面提取基本資訊"""
+        book_id = self.extract_book_id(book_url)
+        
+        # 提取書籍標題
+        book_title = self._extract_title(soup, book_id)
+        
+        # 提取作者資訊
+        author = self._extract_author(soup)
+        
+        return {
+            'id': book_id,
+            'title': book_title,
+            'author': author,
+            'url': book_url
+        }
+        
+    def _fallback_book_info(self, book_url: str) -> Dict:
+        """無法取得書籍頁面時的預設資訊"""
+        return {
+            'id': self.extract_book_id(book_url),
+            'title': self.extract_book_id(book_url),
+            'author': "未知作者",
+            'url': book_url
+        }
        
     def _extract_title(self, soup: BeautifulSoup, book_id: str) -> str:
         """提取書籍標題"""
@@ -179,9 +302,9 @@ class TranslationEngine:
         safe_print(f"🔍 正在獲取章節列表...")
         
         try:
-            response = self.session.get(book_url, timeout=self.config["timeout"])
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            page = self._fetch_page(book_url)
+            page.raise_for_status()
+            soup = page.soup
             
             # 1. 從HTML結構中解析可見的章節
             visible_chapters = self._parse_hierarchical_chapters(soup)
@@ -201,6 +324,40 @@ class TranslationEngine:
         except Exception as e:
             safe_print(f"❌ 獲取章節列表失敗: {e}")
             return []
+            
+    async def get_chapter_list_async(self, book_url: str, fetcher: AsyncFetcher) -> List[Dict]:
+        """獲取章節列表（非同步版本）
+        
+        書籍頁面以非同步方式下載；隱藏章節的動態發現仍走同步路徑，
+        放到執行緒中執行以免阻塞事件迴圈。
+        """
+        safe_print(f"🔍 正在獲取章節列表...")
+        
+        try:
+            page = await self._fetch_page_async(book_url, fetcher)
+            if page.status_code != 200:
+                raise RuntimeError(f"HTTP {page.status_code}")
+            soup = page.soup
+            
+            visible_chapters = self._parse_hierarchical_chapters(soup)
+            
+            if visible_chapters:
+                safe_print(f"📋 從HTML獲取 {len(visible_chapters)} 個可見章節")
+                
+                loop = asyncio.get_event_loop()
+                all_chapters = await loop.run_in_executor(
+                    None, self._discover_hidden_chapters, visible_chapters
+                )
+                
+                safe_print(f"✅ 總共發現 {len(all_chapters)} 個章節（包含隱藏章節）")
+                return all_chapters
+            else:
+                safe_print("⚠️  未找到章節，嘗試傳統方式...")
+                return self._get_chapters_traditional(soup)
+                
+        except Exception as e:
+            safe_print(f"❌ 獲取章節列表失敗: {e}")
+            return []
     
     def _parse_hierarchical_chapters(self, soup: BeautifulSoup) -> List[Dict]:
         """解析層級章節結構"""
@@ -383,7 +540,12 @@ class TranslationEngine:
         
         if missing_ids:
             safe_print(f"🔎 探測 {len(missing_ids)} 個可能的缺失章節...")
-            discovered_chapters = self._probe_chapter_ids(missing_ids)
+            # 已知範圍內的空缺全部探測；超出最大ID的部分連續未命中即停止
+            inner_ids = [i for i in missing_ids if i < max_id]
+            tail_ids = [i for i in missing_ids if i > max_id]
+            discovered_chapters = self._probe_chapter_ids(inner_ids)
+            discovered_chapters += self._probe_chapter_ids(
+                tail_ids, stop_after=self.config.get("probe_miss_limit", 5))
             
             if discovered_chapters:
                 safe_print(f"✅ 發現 {len(discovered_chapters)} 個隱藏章節")
@@ -404,11 +566,12 @@ class TranslationEngine:
         
         try:
             # 策略1: 從書籍頁面的JavaScript數據中提取
-            book_url = f"{self.config['base_url']}/book/{self.current_book['id']}"
-            response = self.session.get(book_url, timeout=self.config["timeout"])
+            # 優先使用 get_chapter_list 剛載入的書籍頁面，避免重複下載和解析
+            book_url = self.current_book.get('url') or f"{self.config['base_url']}/book/{self.current_book['id']}"
+            page = self._fetch_page(book_url)
             
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+            if page.status_code == 200:
+                soup = page.soup
                 
                 # 嘗試從JavaScript數據中提取完整章節列表
                 additional_chapters = self._extract_chapters_from_scripts(soup)
@@ -534,7 +697,7 @@ class TranslationEngine:
         for endpoint in api_endpoints:
             try:
                 api_url = self.config["base_url"] + endpoint
-                response = self.session.get(api_url, timeout=5)
+                response = self._get(api_url, timeout=5)
                 
                 if response.status_code == 200:
                     try:
@@ -638,56 +801,74 @@ class TranslationEngine:
         
         return chapters
     
-    def _probe_chapter_ids(self, chapter_ids: List[int]) -> List[Dict]:
-        """探測指定的數字章節ID"""
-        discovered = []
-        
-        for chapter_id in chapter_ids:
-            chapter_key = f"{self.current_book['id']}_{chapter_id}"
-            test_url = f"{self.config['base_url']}/book/{self.current_book['id']}/chapter/{chapter_key}"
+    def _probe_chapter_ids(self, chapter_ids: List[int], stop_after: Optional[int] = None) -> List[Dict]:
+        """
+        並行探測指定的數字章節ID（只下載存在章節的頁面）
+        
+        Args:
+            chapter_ids: 依序排列的候選數字ID
+            stop_after: 連續未命中這麼多個即停止，None 表示探測全部
+        """
+        if not chapter_ids:
+            return []
             
+        book_id = self.current_book['id']
+        urls = {}
+        for chapter_id in chapter_ids:
+            chapter_key = f"{book_id}_{chapter_id}"
+            urls[f"{self.config['base_url']}/book/{book_id}/chapter/{chapter_key}"] = chapter_key
+        
+        def fetch(url: str):
             try:
-                response = self.session.get(test_url, timeout=5)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # 嘗試提取標題
-                    title_elem = soup.find('h1', class_='Goq6DYSE')
-                    if title_elem:
-                        title = title_elem.get_text().strip()
-                        
-                        # 嘗試從內容中提取實際的品名
-                        content = self._extract_content_from_html(soup, title)
-                        if content and content.get('content'):
-                            actual_title = self._extract_actual_title_from_content(
-                                content['content'], title
-                            )
-                            
-                            discovered.append({
-                                'number': len(discovered) + 1,  # 臨時編號
-                                'title': actual_title,
-                                'original_title': title,
-                                'url': test_url,
-                                'chapter_id': chapter_key,
-                                'level': 2 if '品' in actual_title else 1,
-                                'is_volume': '卷' in actual_title,
-                                'is_chapter': '品' in actual_title or '章' in actual_title,
-                                'discovered': True  # 標記為動態發現的章節
-                            })
-                            
-                            safe_print(f"  ✅ 發現: {actual_title} ({chapter_key})")
-                        else:
-                            safe_print(f"  ⚠️  {chapter_key}: 無有效內容")
-                    else:
-                        safe_print(f"  ❌ {chapter_key}: 無標題")
-                else:
-                    safe_print(f"  ❌ {chapter_key}: HTTP {response.status_code}")
-                    
+                return self._fetch_page(url, timeout=5)
             except Exception as e:
-                safe_print(f"  ❌ {chapter_key}: {e}")
+                return e
+        
+        hits = self.prober.probe(urls, fetch=fetch, stop_after=stop_after)
+        
+        discovered = []
+        for test_url, page in hits:
+            chapter_key = urls[test_url]
+            
+            if isinstance(page, Exception):
+                safe_print(f"  ❌ {chapter_key}: {page}")
+                continue
+            if page.status_code != 200:
+                safe_print(f"  ❌ {chapter_key}: HTTP {page.status_code}")
+                continue
+            
+            # 嘗試提取標題
+            title_elem = page.soup.find('h1', class_='Goq6DYSE')
+            if not title_elem:
+                safe_print(f"  ❌ {chapter_key}: 無標題")
+                continue
+            title = title_elem.get_text().strip()
+            
+            # 嘗試從內容中提取實際的品名
+            content = self._extract_content_from_page(page, title)
+            if not (content and content.get('content')):
+                safe_print(f"  ⚠️  {chapter_key}: 無有效內容")
+                continue
+            
+            actual_title = self._extract_actual_title_from_content(content['content'], title)
             
-            # 添加延遲避免被封鎖
-            time.sleep(1)
+            discovered.append({
+                'number': len(discovered) + 1,  # 臨時編號
+                'title': actual_title,
+                'original_title': title,
+                'url': test_url,
+                'chapter_id': chapter_key,
+                'level': 2 if '品' in actual_title else 1,
+                'is_volume': '卷' in actual_title,
+                'is_chapter': '品' in actual_title or '章' in actual_title,
+                'discovered': True  # 標記為動態發現的章節
+            })
+            
+            safe_print(f"  ✅ 發現: {actual_title} ({chapter_key})")
+        
+        missed = len(chapter_ids) - len(hits)
+        if missed:
+            safe_print(f"  ➖ {missed} 個ID不存在或未探測（提前停止）")
         
         return discovered
     
@@ -708,65 +889,60 @@ class TranslationEngine:
         
     def crawl_chapter(self, chapter_info: Dict) -> Optional[Dict]:
         """爬取單一章節（支持層級結構和內容去重）"""
-        from .unicode_handler import safe_print
+        processed_content = self.fetch_chapter(chapter_info)
+        if processed_content and not processed_content.get('skipped'):
+            self._save_source_text(processed_content, chapter_info['number'])
+        return processed_content
+        
+    def fetch_chapter(self, chapter_info: Dict) -> Optional[Dict]:
+        """
+        下載並解析單一章節內容（不寫入檔案，可在工作執行緒中呼叫）
+        
+        Returns:
+            章節內容；刻意略過的章節返回帶有 'skipped' 的記錄，失敗時返回 None
+        """
         level_prefix = "  " * (chapter_info.get('level', 1) - 1)
         safe_print(f"📖 {level_prefix}爬取: {chapter_info['title']} (Level {chapter_info.get('level', 1)})")
         
         try:
             # 嘗試API端點
-            api_url = f"{self.config['base_url']}/api/book/{self.current_book['id']}/chapter/{chapter_info['chapter_id']}"
-            
-            response = self.session.get(api_url, timeout=self.config["timeout"])
+            response = self._get(self._chapter_api_url(chapter_info), timeout=self.config["timeout"])
             if response.status_code == 200:
-                try:
-                    data = response.json()
-                    content = self._extract_content_from_api_response(data)
-                    if content:
-                        # 從內容中提取實際的品名
-                        actual_title = self._extract_actual_title_from_content(content, chapter_info['title'])
-                        
-                        content_data = {
-                            'title': actual_title,
-                            'original_title': chapter_info['title'],
-                            'content': content,
-                            'level': chapter_info.get('level', 1),
-                            'is_volume': chapter_info.get('is_volume', False),
-                            'is_chapter': chapter_info.get('is_chapter', False),
-                            'chapter_id': chapter_info['chapter_id']
-                        }
-                        
-                        # 檢查內容重複並處理
-                        processed_content = self._process_content_duplication(content_data, chapter_info)
-                        if processed_content:
-                            self._save_source_text(processed_content, chapter_info['number'])
-                            return processed_content
-                        else:
-                            safe_print(f"  ⚠️  跳過重複內容: {actual_title}")
-                            return None
-                            
-                except json.JSONDecodeError:
-                    pass
+                found, content_data = self._chapter_from_api_text(response.text, chapter_info)
+                if found:
+                    return content_data
             
             # 如果API失敗，嘗試直接訪問頁面
-            response = self.session.get(chapter_info['url'], timeout=self.config["timeout"])
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                content_data = self._extract_content_from_html(soup, chapter_info['title'])
+            page = self._fetch_page(chapter_info['url'])
+            if page.status_code == 200:
+                found, content_data = self._chapter_from_html(page, chapter_info)
+                if found:
+                    return content_data
+            
+            safe_print(f"❌ 無法提取章節內容: {chapter_info['title']}")
+            return None
                 
-                if content_data:
-                    content_data['level'] = chapter_info.get('level', 1)
-                    content_data['is_volume'] = chapter_info.get('is_volume', False)
-                    content_data['is_chapter'] = chapter_info.get('is_chapter', False)
-                    content_data['chapter_id'] = chapter_info['chapter_id']
-                    
-                    # 檢查內容重複並處理
-                    processed_content = self._process_content_duplication(content_data, chapter_info)
-                    if processed_content:
-                        self._save_source_text(processed_content, chapter_info['number'])
-                        return processed_content
-                    else:
-                        safe_print(f"  ⚠️  跳過重複內容: {content_data['title']}")
-                        return None
+        except Exception as e:
+            safe_print(f"❌ 爬取章節失敗: {e}")
+            return None
+            
+    async def fetch_chapter_async(self, chapter_info: Dict, fetcher: AsyncFetcher) -> Optional[Dict]:
+        """下載並解析單一章節內容（非同步版本，不寫入檔案）"""
+        level_prefix = "  " * (chapter_info.get('level', 1) - 1)
+        safe_print(f"📖 {level_prefix}爬取: {chapter_info['title']} (Level {chapter_info.get('level', 1)})")
+        
+        try:
+            response = await fetcher.get(self._chapter_api_url(chapter_info))
+            if response.status_code == 200:
+                found, content_data = self._chapter_from_api_text(response.text, chapter_info)
+                if found:
+                    return content_data
+            
+            page = await self._fetch_page_async(chapter_info['url'], fetcher)
+            if page.status_code == 200:
+                found, content_data = self._chapter_from_html(page, chapter_info)
+                if found:
+                    return content_data
             
             safe_print(f"❌ 無法提取章節內容: {chapter_info['title']}")
             return None
@@ -775,6 +951,193 @@ class TranslationEngine:
             safe_print(f"❌ 爬取章節失敗: {e}")
             return None
             
+    async def crawl_chapter_async(self, chapter_info: Dict, fetcher: AsyncFetcher) -> Optional[Dict]:
+        """爬取單一章節（非同步版本）"""
+        processed_content = await self.fetch_chapter_async(chapter_info, fetcher)
+        if processed_content and not processed_content.get('skipped'):
+            self._save_source_text(processed_content, chapter_info['number'])
+        return processed_content
+        
+    async def _fetch_page_async(self, url: str, fetcher: AsyncFetcher):
+        """非同步取得頁面，並放入頁面存放區供其他階段共用"""
+        page = self.page_store.peek(url)
+        if page is None:
+            response = await fetcher.get(url)
+            page = self.page_store.put(url, response.status_code, response.text)
+        return page
+        
+    def _chapter_api_url(self, chapter_info: Dict) -> str:
+        """章節內容API網址"""
+        return f"{self.config['base_url']}/api/book/{self.current_book['id']}/chapter/{chapter_info['chapter_id']}"
+        
+    def _chapter_from_api_text(self, text: str, chapter_info: Dict) -> Tuple[bool, Optional[Dict]]:
+        """
+        從API回應解析章節內容
+        
+        Returns:
+            (是否取得內容, 去重處理後的內容)；內容被判定重複而略過時，
+            內容為帶有 'skipped' 的記錄（見 _skipped_chapter）
+        """
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return False, None
+            
+        content = self._extract_content_from_api_response(data)
+        if not content:
+            return False, None
+            
+        # 從內容中提取實際的品名
+        actual_title = self._extract_actual_title_from_content(content, chapter_info['title'])
+        
+        content_data = {
+            'title': actual_title,
+            'original_title': chapter_info['title'],
+            'content': content,
+            'level': chapter_info.get('level', 1),
+            'is_volume': chapter_info.get('is_volume', False),
+            'is_chapter': chapter_info.get('is_chapter', False),
+            'chapter_id': chapter_info['chapter_id']
+        }
+        
+        # 檢查內容重複並處理
+        processed_content = self._process_content_duplication(content_data, chapter_info)
+        if not processed_content:
+            safe_print(f"  ⚠️  跳過重複內容: {actual_title}")
+            return True, self._skipped_chapter(actual_title)
+        return True, processed_content
+        
+    def _chapter_from_html(self, page: Page, chapter_info: Dict) -> Tuple[bool, Optional[Dict]]:
+        """從章節頁面提取內容，回傳格式同 _chapter_from_api_text"""
+        content_data = self._extract_content_from_page(page, chapter_info['title'])
+        
+        if not content_data:
+            return False, None
+            
+        content_data['level'] = chapter_info.get('level', 1)
+        content_data['is_volume'] = chapter_info.get('is_volume', False)
+        content_data['is_chapter'] = chapter_info.get('is_chapter', False)
+        content_data['chapter_id'] = chapter_info['chapter_id']
+        
+        # 檢查內容重複並處理
+        processed_content = self._process_content_duplication(content_data, chapter_info)
+        if not processed_content:
+            safe_print(f"  ⚠️  跳過重複內容: {content_data['title']}")
+            return True, self._skipped_chapter(content_data['title'])
+        return True, processed_content
+        
+    @staticmethod
+    def _skipped_chapter(title: str) -> Dict:
+        """刻意略過（內容與品重複的卷）的章節記錄，不寫入原文檔案"""
+        return {'title': title, 'skipped': True, 'reason': "卷內容與品重複"}
+            
+    def crawl_chapters(self, chapters: List[Dict], manifest: BookManifest = None) -> int:
+        """
+        批量爬取章節並生成翻譯模板
+        
+        max_workers > 1 時以執行緒池並行下載，請求頻率由共享的速率限制器控制；
+        檔案寫入與 FileMonitor 記錄仍在主執行緒中依章節順序進行，
+        因此輸出與序列模式完全一致。
+        
+        Args:
+            chapters: 要處理的章節
+            manifest: 處理清單，每個章節完成或失敗後立即寫入檢查點
+        
+        Returns:
+            int: 成功處理的章節數
+        """
+        max_workers = self.config.get("max_workers", 1)
+        success_count = 0
+        executor = None
+        futures = []
+        
+        if max_workers > 1:
+            safe_print(f"⚡ 並行爬取模式: {max_workers} 個工作執行緒")
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            futures = [executor.submit(self.fetch_chapter, chapter) for chapter in chapters]
+        
+        try:
+            for index, chapter in enumerate(chapters):
+                safe_print(f"\n🔄 處理第 {chapter['number']} 章...")
+                
+                # 爬取原文（並行模式下依順序取回結果）
+                if executor is not None:
+                    content_data = futures[index].result()
+                else:
+                    content_data = self.fetch_chapter(chapter)
+                    
+                if self._store_chapter(chapter, content_data, manifest):
+                    success_count += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+                
+        return success_count
+        
+    async def crawl_chapters_async(self, chapters: List[Dict], manifest: BookManifest = None) -> int:
+        """
+        以 aiohttp 後端批量爬取章節並生成翻譯模板
+        
+        所有章節同時排入事件迴圈，實際並行度由每主機連線上限與速率限制器決定；
+        寫檔仍依章節順序進行，輸出與序列模式一致。
+        
+        Returns:
+            int: 成功處理的章節數
+        """
+        success_count = 0
+        
+        async with self.create_async_fetcher() as fetcher:
+            tasks = [asyncio.ensure_future(self.fetch_chapter_async(chapter, fetcher))
+                     for chapter in chapters]
+            
+            try:
+                for chapter, task in zip(chapters, tasks):
+                    safe_print(f"\n🔄 處理第 {chapter['number']} 章...")
+                    
+                    content_data = await task
+                    if self._store_chapter(chapter, content_data, manifest):
+                        success_count += 1
+            finally:
+                for task in tasks:
+                    task.cancel()
+                    
+        return success_count
+        
+    def _store_chapter(self, chapter: Dict, content_data: Optional[Dict],
+                       manifest: BookManifest = None) -> bool:
+        """寫入原文與翻譯模板，並在清單中記錄結果（略過的章節記為略過，不算成功）"""
+        if not content_data:
+            if manifest is not None:
+                manifest.mark_failed(chapter, "無法提取章節內容")
+            return False
+            
+        if content_data.get('skipped'):
+            if manifest is not None:
+                manifest.mark_skipped(chapter, content_data.get('reason'))
+            return False
+            
+        file_path, changed = self._save_source_text(content_data, chapter['number'])
+        # 生成翻譯模板（原文未變更且模板已存在時略過）
+        if changed or not self._template_path(content_data, chapter['number']).exists():
+            self.generate_translation_template(content_data, chapter['number'])
+        
+        if manifest is not None:
+            manifest.mark_done(chapter, file_path.name, self.tracker.generate_file_hash(file_path))
+        return True
+            
+    def _extract_content_from_page(self, page: Page, title: str) -> Optional[Dict]:
+        """從頁面提取正文；lxml-xpath 後端直接以 XPath 提取，不建立 BeautifulSoup"""
+        if self.parser_backend == 'lxml-xpath':
+            content_parts = chapter_paragraphs(page.tree)
+            if content_parts:
+                return {
+                    'title': title,
+                    'content': '\n\n'.join(content_parts)
+                }
+            return None
+            
+        return self._extract_content_from_html(page.soup, title)
+            
     def _extract_content_from_html(self, soup: BeautifulSoup, title: str) -> Optional[Dict]:
         """從HTML中提取內容"""
 
@@ -1108,8 +1471,16 @@ class TranslationEngine:
         
         return '\n'.join(summary_lines)
         
-    def _save_source_text(self, content_data: Dict, chapter_number: int) -> None:
-        """儲存原文（支持層級結構）"""
+    def _save_source_text(self, content_data: Dict, chapter_number: int) -> Tuple[Path, bool]:
+        """
+        儲存原文（支持層級結構）
+        
+        增量模式下，若新內容的雜湊值與追蹤系統記錄的 file_hash 相同，
+        則不重寫檔案也不記錄檔案操作。
+        
+        Returns:
+            (檔案路徑, 是否實際寫入)
+        """
         # 使用實際提取的標題
         title = content_data.get('title', content_data.get('original_title', f'章節{chapter_number}'))
         level = content_data.get('level', 1)
@@ -1121,15 +1492,27 @@ class TranslationEngine:
         filename = f"{chapter_number:02d}_{clean_title}.txt"
         file_path = self.source_dir / filename
         
+        text = f"# {title}\n\n"
+        
+        # 根據內容類型添加說明
+        content_type = content_data.get('content_type', 'full_content')
+        if content_type == 'volume_summary':
+            text += "**說明：** 本文件為卷的概述，具體品的內容請參考對應的品文件。\n\n"
+        
+        text += content_data['content']
+        
+        # 文字模式寫入時換行會轉為系統換行符，雜湊值需以相同位元組計算
+        hasher = get_file_hasher()
+        digest = hasher.hash_bytes(text.replace('\n', os.linesep).encode('utf-8'))
+        
+        if self.config.get("incremental", True) and self._source_unchanged(file_path, digest, chapter_number):
+            safe_print(f"⏸️  {level_prefix}內容未變更，略過: {filename}")
+            return file_path, False
+        
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(f"# {title}\n\n")
-            
-            # 根據內容類型添加說明
-            content_type = content_data.get('content_type', 'full_content')
-            if content_type == 'volume_summary':
-                f.write("**說明：** 本文件為卷的概述，具體品的內容請參考對應的品文件。\n\n")
-            
-            f.write(content_data['content'])
+            f.write(text)
+        # 內容的雜湊值已知，後續 FileMonitor 與追蹤系統不必再讀取檔案
+        hasher.record(file_path, digest)
             
         # 記錄檔案操作
         self.file_monitor.track_file_write(file_path, "source_text", {
@@ -1144,18 +1527,63 @@ class TranslationEngine:
         
         level_indicator = f" (Level {level})" if level > 1 else ""
         safe_print(f"✅ {level_prefix}已儲存: {filename}{level_indicator}")
+        return file_path, True
+        
+    def _source_unchanged(self, file_path: Path, digest: str, chapter_number: int) -> bool:
+        """
+        原文檔案是否已存在且雜湊值為 digest
+        
+        以磁碟上檔案本身的雜湊值為準（未變更的檔案由雜湊快取直接回應），
+        本機被修改或損壞的檔案會重新寫入；追蹤系統記錄的 file_hash 只用於快速判斷
+        遠端內容已變更（記錄與 digest 不同時不必計算檔案雜湊）。
+        """
+        if not file_path.exists():
+            return False
+            
+        if self.current_book:
+            recorded = self.tracker.get_chapter_hash(self.current_book['id'], chapter_number)
+            if recorded is not None and recorded != digest:
+                return False
+        return self.tracker.generate_file_hash(file_path) == digest
+        
+    def _template_path(self, content_data: Dict, chapter_number: int) -> Path:
+        """翻譯模板的檔案路徑"""
+        title = content_data.get('title', content_data.get('original_title', f'章節{chapter_number}'))
+        clean_title = re.sub(r'[<>:"/\\|?*]', '_', title)
+        return self.translation_dir / f"{chapter_number:02d}_{clean_title}.md"
+        
+    def _template_has_translation(self, file_path: Path) -> bool:
+        """既有的翻譯模板是否已填入人工或AI翻譯"""
+        if not file_path.exists():
+            return False
+        try:
+            existing = file_path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            # 無法確認時保守地視為已有翻譯
+            return True
+        return not any(marker in existing for marker in TEMPLATE_PLACEHOLDERS)
+        
+    def generate_translation_template(self, content_data: Dict, chapter_number: int) -> bool:
+        """
+        生成翻譯模板（支持層級結構）
         
-    def generate_translation_template(self, content_data: Dict, chapter_number: int) -> None:
-        """生成翻譯模板（支持層級結構）"""
+        既有模板已填入翻譯時不會覆寫。
+        
+        Returns:
+            bool: 是否實際寫入
+        """
         title = content_data.get('title', content_data.get('original_title', f'章節{chapter_number}'))
         level = content_data.get('level', 1)
         level_prefix = "  " * (level - 1) if level > 1 else ""
         
-        safe_print(f"🤖 {level_prefix}生成翻譯模板: {title}")
+        file_path = self._template_path(content_data, chapter_number)
+        filename = file_path.name
         
-        clean_title = re.sub(r'[<>:"/\\|?*]', '_', title)
-        filename = f"{chapter_number:02d}_{clean_title}.md"
-        file_path = self.translation_dir / filename
+        if self._template_has_translation(file_path):
+            safe_print(f"🔒 {level_prefix}模板已有翻譯，保留: {filename}")
+            return False
+        
+        safe_print(f"🤖 {level_prefix}生成翻譯模板: {title}")
         
         # 根據層級和類型調整模板內容
         structure_info = ""
@@ -1164,6 +1592,8 @@ class TranslationEngine:
         elif content_data.get('is_chapter'):
             structure_info = f"\n**結構層級：** 品/章 (Level {level})"
         
+        stats = analyze_text(content_data['content'])
+        
         markdown_content = f"""# {title}
 
 ## 原文
@@ -1174,7 +1604,7 @@ class TranslationEngine:
 
 [此處應為現代中文翻譯]
 
-原文字數：{len(content_data['content'])} 字{structure_info}
+原文字數：{stats['cjk_chars']} 字（{stats['paragraphs']} 段）{structure_info}
 建議：請使用AI翻譯工具或人工翻譯此段落。
 
 翻譯要點：
@@ -1221,6 +1651,7 @@ class TranslationEngine:
         
         level_indicator = f" (Level {level})" if level > 1 else ""
         safe_print(f"✅ {level_prefix}已生成翻譯模板: {filename}{level_indicator}")
+        return True
         
     def create_project_readme(self, chapters: List[Dict]) -> None:
         """建立專案說明檔案"""
@@ -1283,111 +1714,181 @@ class TranslationEngine:
             
         safe_print(f"✅ 已建立專案說明: {readme_path}")
         
-    def translate_book(self, book_url: str) -> bool:
-        """翻譯整本書籍的主要流程"""
-        safe_print("🚀 啟動道教經典翻譯系統 v2.0")
-        safe_print("=" * 50)
-        
-        try:
-            # 1. 獲取書籍資訊
-            book_info = self.get_book_info(book_url)
-            safe_print(f"📚 書籍：{book_info['title']}")
-            safe_print(f"👤 作者：{book_info['author']}")
-            
-            # 2. 設定專案結構
-            self.setup_project_structure(book_info)
-            
-            # 3. 設置當前書籍（用於動態發現章節）
+    async def _fetch_book_async(self, book_url: str) -> Tuple[Dict, List[Dict]]:
+        """以 aiohttp 後端獲取書籍資訊與章節列表（書籍頁面經頁面存放區只下載一次）"""
+        async with self.create_async_fetcher() as fetcher:
+            book_info = await self.get_book_info_async(book_url, fetcher)
+            # 隱藏章節的動態發現需要目前書籍
             self.current_book = book_info
-            
-            # 4. 獲取章節列表（包含動態發現）
+            chapters = await self.get_chapter_list_async(book_url, fetcher)
+        return book_info, chapters
+        
+    def _discover_book_chapters(self, book_url: str, chapters: List[Dict] = None) -> List[Dict]:
+        """
+        獲取章節列表並進行章節ID分析與子章節發現，返回重新編號後的完整章節列表
+        
+        Args:
+            chapters: 已取得的章節列表（aiohttp 後端），None 時由書籍頁面獲取
+        """
+        # 4. 獲取章節列表（包含動態發現）
+        if chapters is None:
             chapters = self.get_chapter_list(book_url)
-            if not chapters:
-                safe_print("❌ 無法獲取章節列表，程序終止")
-                return False
+        if not chapters:
+            return []
+            
+        safe_print(f"📋 找到 {len(chapters)} 個初始章節")
+        
+        # 5. 智能章節ID分析
+        safe_print("\n🔍 開始智能章節ID分析...")
+        id_pattern = self._analyze_chapter_id_patterns(chapters)
+        
+        # 6. 智能子章節發現階段
+        safe_print(f"\n🔍 開始智能子章節發現階段...")
+        safe_print(f"📊 使用策略: {id_pattern['strategy']}")
+        all_chapters = chapters.copy()
+        discovered_sub_chapters = []
+        
+        for chapter in chapters:
+            if chapter.get('level', 1) == 1:  # 只檢查頂級章節
+                level_prefix = "  " * (chapter.get('level', 1) - 1)
+                safe_print(f"{level_prefix}🔍 檢查章節: {chapter['title']}")
                 
-            safe_print(f"📋 找到 {len(chapters)} 個初始章節")
-            
-            # 5. 智能章節ID分析
-            safe_print("\n🔍 開始智能章節ID分析...")
-            id_pattern = self._analyze_chapter_id_patterns(chapters)
-            
-            # 6. 智能子章節發現階段
-            safe_print(f"\n🔍 開始智能子章節發現階段...")
-            safe_print(f"📊 使用策略: {id_pattern['strategy']}")
-            all_chapters = chapters.copy()
-            discovered_sub_chapters = []
-            
-            for chapter in chapters:
-                if chapter.get('level', 1) == 1:  # 只檢查頂級章節
-                    level_prefix = "  " * (chapter.get('level', 1) - 1)
-                    safe_print(f"{level_prefix}🔍 檢查章節: {chapter['title']}")
-                    
-                    try:
-                        # 訪問章節頁面進行智能分析
-                        response = self.session.get(chapter['url'], timeout=self.config["timeout"])
-                        if response.status_code == 200:
-                            soup = BeautifulSoup(response.text, 'html.parser')
-                            
-                            # 智能發現子章節
-                            sub_chapters = self._smart_discover_sub_chapters(soup, chapter)
+                try:
+                    # 訪問章節頁面進行智能分析
+                    # 頁面會留在存放區，稍後爬取章節時不再重新下載
+                    page = self._fetch_page(chapter['url'])
+                    if page.status_code == 200:
+                        soup = page.soup
+                        
+                        # 智能發現子章節
+                        sub_chapters = self._smart_discover_sub_chapters(soup, chapter)
+                        
+                        if sub_chapters:
+                            safe_print(f"{level_prefix}   ✅ 發現 {len(sub_chapters)} 個子章節")
                             
-                            if sub_chapters:
-                                safe_print(f"{level_prefix}   ✅ 發現 {len(sub_chapters)} 個子章節")
+                            # 為子章節分配編號並添加到總列表
+                            for sub_chapter in sub_chapters:
+                                sub_chapter['number'] = len(all_chapters) + 1
+                                all_chapters.append(sub_chapter)
+                                discovered_sub_chapters.append(sub_chapter)
                                 
-                                # 為子章節分配編號並添加到總列表
-                                for sub_chapter in sub_chapters:
-                                    sub_chapter['number'] = len(all_chapters) + 1
-                                    all_chapters.append(sub_chapter)
-                                    discovered_sub_chapters.append(sub_chapter)
-                                    
-                                    sub_level_prefix = "  " * (sub_chapter.get('level', 2) - 1)
-                                    safe_print(f"{sub_level_prefix}     📄 {sub_chapter['title']} (Level {sub_chapter['level']})")
-                            else:
-                                safe_print(f"{level_prefix}   ⚠️  未發現子章節")
+                                sub_level_prefix = "  " * (sub_chapter.get('level', 2) - 1)
+                                safe_print(f"{sub_level_prefix}     📄 {sub_chapter['title']} (Level {sub_chapter['level']})")
                         else:
-                            safe_print(f"{level_prefix}   ❌ 無法訪問頁面: HTTP {response.status_code}")
-                            
-                    except Exception as e:
-                        safe_print(f"{level_prefix}   ❌ 檢查子章節時出錯: {e}")
-                    
-                    # 添加延遲避免請求過快
-                    time.sleep(1)
-            
-            safe_print(f"\n📊 智能發現結果:")
-            safe_print(f"   初始章節: {len(chapters)}")
-            safe_print(f"   發現子章節: {len(discovered_sub_chapters)}")
-            safe_print(f"   總章節數: {len(all_chapters)}")
-            
-            if discovered_sub_chapters:
-                safe_print(f"\n🤖 智能發現的子章節:")
-                for sub_chapter in discovered_sub_chapters:
-                    sub_level_prefix = "  " * (sub_chapter.get('level', 2) - 1)
-                    safe_print(f"{sub_level_prefix}- {sub_chapter['title']} (父章節: {sub_chapter.get('parent_title', '未知')})")
-            
-            # 使用包含子章節的完整列表
-            chapters = all_chapters
-            
-            # 重新編號所有章節
-            for i, chapter in enumerate(chapters, 1):
-                chapter['number'] = i
-                
-            safe_print(f"\n📋 最終章節總數: {len(chapters)}")
+                            safe_print(f"{level_prefix}   ⚠️  未發現子章節")
+                    else:
+                        safe_print(f"{level_prefix}   ❌ 無法訪問頁面: HTTP {page.status_code}")
+                        
+                except Exception as e:
+                    safe_print(f"{level_prefix}   ❌ 檢查子章節時出錯: {e}")
+        
+        safe_print(f"\n📊 智能發現結果:")
+        safe_print(f"   初始章節: {len(chapters)}")
+        safe_print(f"   發現子章節: {len(discovered_sub_chapters)}")
+        safe_print(f"   總章節數: {len(all_chapters)}")
+        
+        if discovered_sub_chapters:
+            safe_print(f"\n🤖 智能發現的子章節:")
+            for sub_chapter in discovered_sub_chapters:
+                sub_level_prefix = "  " * (sub_chapter.get('level', 2) - 1)
+                safe_print(f"{sub_level_prefix}- {sub_chapter['title']} (父章節: {sub_chapter.get('parent_title', '未知')})")
+        
+        # 使用包含子章節的完整列表
+        chapters = all_chapters
+        
+        # 重新編號所有章節
+        for i, chapter in enumerate(chapters, 1):
+            chapter['number'] = i
             
-            # 7. 批量爬取和翻譯
-            success_count = 0
-            for chapter in chapters:
-                safe_print(f"\n🔄 處理第 {chapter['number']} 章...")
+        safe_print(f"\n📋 最終章節總數: {len(chapters)}")
+        return chapters
+        
+    def _load_manifest(self, book_url: str, resume: bool) -> Optional[BookManifest]:
+        """載入書籍的處理清單；不繼續時清空清單重新開始"""
+        book_id = self.extract_book_id(book_url)
+        if not book_id:
+            return None
+            
+        manifest = BookManifest(book_id, self.config.get("manifest_dir", "data/manifests"))
+        if not resume:
+            manifest.reset()
+        return manifest
+        
+    def translate_book(self, book_url: str, resume: bool = None,
+                       refresh_discovery: bool = False) -> bool:
+        """
+        翻譯整本書籍的主要流程
+        
+        每本書的發現結果與章節狀態記錄在處理清單（檢查點）中，
+        中斷後重新執行會略過已完成的章節，只重試失敗或未處理的章節。
+        
+        Args:
+            book_url: 書籍網址
+            resume: 是否從檢查點繼續，None 時使用設定中的 resume；False 時重新開始
+            refresh_discovery: 即使檢查點已有章節列表，也重新執行發現階段
+        """
+        safe_print("🚀 啟動道教經典翻譯系統 v2.0")
+        safe_print("=" * 50)
+        
+        if resume is None:
+            resume = self.config.get("resume", True)
+        
+        # 每次流程使用新的頁面存放區
+        self.page_store.clear()
+        
+        try:
+            manifest = self._load_manifest(book_url, resume)
+            
+            if manifest is not None and manifest.has_discovery() and not refresh_discovery:
+                # 由檢查點恢復書籍資訊與章節列表，不重新下載
+                book_info = manifest.book_info
+                chapters = manifest.chapters
+                self.setup_project_structure(book_info)
                 
-                # 爬取原文
-                content_data = self.crawl_chapter(chapter)
-                if content_data:
-                    # 生成翻譯模板
-                    self.generate_translation_template(content_data, chapter['number'])
-                    success_count += 1
+                safe_print(f"♻️  由檢查點恢復：{book_info['title']}")
+                safe_print(f"📋 章節總數: {len(chapters)}（已完成 {manifest.get_statistics()['done']}）")
+            else:
+                # 1. 獲取書籍資訊（aiohttp 後端時連同章節列表一起獲取）
+                initial_chapters = None
+                if self.config.get("http_backend") == "aiohttp":
+                    book_info, initial_chapters = asyncio.run(self._fetch_book_async(book_url))
+                else:
+                    book_info = self.get_book_info(book_url)
+                safe_print(f"📚 書籍：{book_info['title']}")
+                safe_print(f"👤 作者：{book_info['author']}")
+                
+                # 2. 設定專案結構
+                self.setup_project_structure(book_info)
+                
+                # 3. 設置當前書籍（用於動態發現章節）
+                self.current_book = book_info
+                
+                # 4-6. 獲取章節列表、章節ID分析與子章節發現
+                chapters = self._discover_book_chapters(book_url, initial_chapters)
+                if not chapters:
+                    safe_print("❌ 無法獲取章節列表，程序終止")
+                    return False
                     
-                # 添加延遲避免被封鎖
-                time.sleep(self.config["request_delay"])
+                if manifest is not None:
+                    manifest.set_discovery(book_info, chapters)
+            
+            # 7. 批量爬取和翻譯（略過檢查點中已完成的章節）
+            pending = chapters
+            if manifest is not None:
+                pending = manifest.pending_chapters(chapters, self.source_dir)
+                if len(pending) < len(chapters):
+                    safe_print(f"⏭️  略過 {len(chapters) - len(pending)} 個已完成章節，"
+                               f"處理其餘 {len(pending)} 個")
+            
+            if self.config.get("http_backend") == "aiohttp":
+                success_count = asyncio.run(self.crawl_chapters_async(pending, manifest))
+            else:
+                success_count = self.crawl_chapters(pending, manifest)
+                
+            if manifest is not None:
+                # 略過的章節不再處理，但不算成功
+                success_count = (len(chapters) - len(manifest.pending_chapters(chapters, self.source_dir))
+                                 - manifest.get_statistics()['skipped'])
                 
             # 8. 建立專案文檔
             self.create_project_readme(chapters)
@@ -1426,4 +1927,8 @@ class TranslationEngine:
             
         except Exception as e:
             safe_print(f"❌ 翻譯過程發生錯誤: {e}")
-            return False
\ No newline at end of file
+            return False
+            
+        finally:
+            self.page_store.clear()
+            self.file_monitor.flush()
\ No newline at end of file
@@ -11,6 +11,7 @@
 """
 
 import requests
+import sys
 import time
 import random
 from bs4 import BeautifulSoup
@@ -18,17 +19,25 @@ from fake_useragent import UserAgent
 from pathlib import Path
 import logging
 
+# 由 crawler/ 目錄直接執行時也能找到 core
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.async_http import AsyncFetcher
+from core.http_cache import install_cache
+
 class BaseCrawler:
     """爬蟲基礎類別"""
     
-    def __init__(self, delay_range=(1, 3)):
+    def __init__(self, delay_range=(1, 3), use_cache=True):
         """
         初始化爬蟲
         
         Args:
             delay_range: 請求間隔時間範圍（秒）
+            use_cache: 是否使用共享的HTTP回應快取（data/cache/http）
         """
         self.session = requests.Session()
+        self.cache = install_cache(self.session) if use_cache else None
         self.ua = UserAgent()
         self.delay_range = delay_range
         self.setup_logging()
@@ -87,6 +96,48 @@ class BaseCrawler:
         self.logger.error(f"所有重試都失敗: {url}")
         return None
         
+    def create_async_fetcher(self, per_host_limit=4, max_retries=3):
+        """
+        建立非同步抓取器
+        
+        Args:
+            per_host_limit: 每個主機的最大並行連線數
+            max_retries: 最大重試次數
+            
+        Returns:
+            AsyncFetcher 物件（需以 async with 開啟）
+        """
+        headers = self.get_random_headers()
+        # aiohttp 會自行處理壓縮與連線管理
+        headers.pop('Accept-Encoding', None)
+        headers.pop('Connection', None)
+        return AsyncFetcher(headers=headers, timeout=10, max_retries=max_retries,
+                            per_host_limit=per_host_limit, cache=self.cache)
+        
+    async def make_request_async(self, url, fetcher):
+        """
+        發送非同步 HTTP 請求（重試與退避由 fetcher 處理）
+        
+        Args:
+            url: 目標網址
+            fetcher: 已開啟的 AsyncFetcher
+            
+        Returns:
+            FetchResult 物件或 None
+        """
+        try:
+            response = await fetcher.get(url, headers={'User-Agent': self.ua.random})
+            if not response.ok:
+                self.logger.error(f"請求失敗: {url} - HTTP {response.status_code}")
+                return None
+                
+            self.logger.info(f"成功請求: {url}")
+            return response
+            
+        except Exception as e:
+            self.logger.error(f"所有重試都失敗: {url} - {e}")
+            return None
+        
     def parse_html(self, html_content):
         """
         解析 HTML 內容
@@ -12,7 +12,8 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
+import sys
+import asyncio
 import time
 import json
 import os
@@ -21,15 +22,30 @@ from pathlib import Path
 from datetime import datetime
 import logging
 
+# 由 crawler/ 目錄直接執行時也能找到 core
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.async_http import AsyncFetcher
+from core.rate_limiter import RateLimiter
+from core.http_cache import install_cache
+from core.text_stats import count_cjk
+from core.html_backend import (resolve_backend, make_soup, parse_tree,
+                               catalog_items, first_text, meta_content)
+
 class ShidianCrawler:
     """師典古籍網站爬蟲"""
     
-    def __init__(self, delay=2):
+    def __init__(self, delay=2, use_async=False, per_host_limit=4, use_cache=True,
+                 html_parser='lxml'):
         """
         初始化爬蟲
         
         Args:
             delay: 請求間隔時間（秒）
+            use_async: 是否使用 aiohttp 非同步後端爬取章節
+            per_host_limit: 非同步模式下每個主機的最大並行連線數
+            use_cache: 是否使用共享的HTTP回應快取（data/cache/http）
+            html_parser: HTML解析後端（lxml / html.parser / lxml-xpath）
         """
         self.base_url = "https://www.shidianguji.com"
         self.delay = delay
@@ -41,6 +57,10 @@ class ShidianCrawler:
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self.cache = install_cache(self.session) if use_cache else None
+        self.use_async = use_async
+        self.per_host_limit = per_host_limit
+        self.parser_backend = resolve_backend(html_parser)
         self.setup_logging()
     
     def setup_logging(self):
@@ -65,7 +85,7 @@ class ShidianCrawler:
         Returns:
             dict: 書籍資訊字典，包含章節列表
         """
-        url = f"{self.base_url}/book/{book_id}?page_from=bookshelf&mode=book"
+        url = self._book_url(book_id)
         
         try:
             self.logger.info(f"正在獲取書籍資訊: {book_id}")
@@ -76,79 +96,136 @@ class ShidianCrawler:
                 self.logger.error(f"請求失敗，狀態碼: {response.status_code}")
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            return self._parse_book_info(response.text, book_id, url)
             
-            book_info = {
-                'book_id': book_id,
-                'url': url,
-                'title': '',
-                'author': '',
-                'dynasty': '',
-                'description': '',
-                'chapters': []
-            }
-            
-            # 提取書名
-            title_tag = soup.find('h1', class_='HbYW1Abi')
-            if title_tag:
-                book_info['title'] = title_tag.text.strip()
-                self.logger.info(f"✓ 書名: {book_info['title']}")
+        except Exception as e:
+            self.logger.error(f"✗ 獲取書籍資訊失敗: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
+    async def get_book_info_async(self, book_id, fetcher):
+        """
+        獲取書籍基本資訊和章節列表（非同步版本）
+        
+        Args:
+            book_id: 書籍編號（如 DZ1439）
+            fetcher: 已開啟的 AsyncFetcher
             
-            # 提取作者和朝代
-            author_tag = soup.find('span', class_='book-title-author')
-            if author_tag:
-                author_text = author_tag.text.strip()
-                book_info['author'] = author_text
-                
-                # 分離朝代和作者
-                if '[' in author_text and ']' in author_text:
-                    try:
-                        dynasty_part = author_text.split(']')[0].replace('[', '').strip()
-                        author_part = author_text.split(']')[1].replace('著', '').strip()
-                        book_info['dynasty'] = dynasty_part
-                        book_info['author'] = author_part
-                        self.logger.info(f"✓ 朝代: {dynasty_part}, 作者: {author_part}")
-                    except:
-                        pass
-            
-            # 提取摘要
-            desc_meta = soup.find('meta', {'name': 'description'})
-            if desc_meta and desc_meta.get('content'):
-                book_info['description'] = desc_meta['content'].strip()
-                self.logger.info(f"✓ 摘要: {book_info['description'][:80]}...")
+        Returns:
+            dict: 書籍資訊字典，包含章節列表
+        """
+        url = self._book_url(book_id)
+        
+        try:
+            self.logger.info(f"正在獲取書籍資訊: {book_id}")
+            response = await fetcher.get(url, timeout=15)
             
-            # 提取章節目錄
-            self.logger.info("正在提取章節目錄...")
-            chapter_items = soup.find_all('div', class_='semi-tree-option')
+            if response.status_code != 200:
+                self.logger.error(f"請求失敗，狀態碼: {response.status_code}")
+                return None
             
-            for idx, item in enumerate(chapter_items, 1):
-                a_tag = item.find('a')
-                if a_tag:
-                    chapter_name = a_tag.text.strip()
-                    chapter_url = a_tag.get('href', '')
-                    
-                    if chapter_url and not chapter_url.startswith('http'):
-                        chapter_url = self.base_url + chapter_url
-                    
-                    chapter_info = {
-                        'index': idx,
-                        'name': chapter_name,
-                        'url': chapter_url,
-                        'content': ''
-                    }
-                    
-                    book_info['chapters'].append(chapter_info)
-                    self.logger.info(f"  {idx}. {chapter_name}")
-            
-            self.logger.info(f"✓ 總共找到 {len(book_info['chapters'])} 個章節")
-            return book_info
+            return self._parse_book_info(response.text, book_id, url)
             
         except Exception as e:
             self.logger.error(f"✗ 獲取書籍資訊失敗: {e}")
-            import traceback
-            traceback.print_exc()
             return None
     
+    def _book_url(self, book_id):
+        """書籍頁面網址"""
+        return f"{self.base_url}/book/{book_id}?page_from=bookshelf&mode=book"
+    
+    def _parse_book_info(self, html, book_id, url):
+        """
+        從書籍頁面 HTML 解析書籍資訊和章節目錄
+        
+        Args:
+            html: 頁面 HTML
+            book_id: 書籍編號
+            url: 書籍頁面網址
+            
+        Returns:
+            dict: 書籍資訊字典
+        """
+        # lxml-xpath 後端直接以 XPath 提取，不建立 BeautifulSoup
+        if self.parser_backend == 'lxml-xpath':
+            tree = parse_tree(html)
+            title_text = first_text(tree, 'h1', 'HbYW1Abi')
+            author_text = first_text(tree, 'span', 'book-title-author')
+            description = meta_content(tree, 'description')
+            catalog = catalog_items(tree)
+        else:
+            soup = make_soup(html, self.parser_backend)
+            title_tag = soup.find('h1', class_='HbYW1Abi')
+            title_text = title_tag.text if title_tag else None
+            author_tag = soup.find('span', class_='book-title-author')
+            author_text = author_tag.text if author_tag else None
+            desc_meta = soup.find('meta', {'name': 'description'})
+            description = desc_meta.get('content') if desc_meta else None
+            catalog = []
+            for item in soup.find_all('div', class_='semi-tree-option'):
+                a_tag = item.find('a')
+                catalog.append((a_tag.text.strip(), a_tag.get('href', '')) if a_tag else None)
+        
+        book_info = {
+            'book_id': book_id,
+            'url': url,
+            'title': '',
+            'author': '',
+            'dynasty': '',
+            'description': '',
+            'chapters': []
+        }
+        
+        # 提取書名
+        if title_text is not None:
+            book_info['title'] = title_text.strip()
+            self.logger.info(f"✓ 書名: {book_info['title']}")
+        
+        # 提取作者和朝代
+        if author_text is not None:
+            author_text = author_text.strip()
+            book_info['author'] = author_text
+            
+            # 分離朝代和作者
+            if '[' in author_text and ']' in author_text:
+                try:
+                    dynasty_part = author_text.split(']')[0].replace('[', '').strip()
+                    author_part = author_text.split(']')[1].replace('著', '').strip()
+                    book_info['dynasty'] = dynasty_part
+                    book_info['author'] = author_part
+                    self.logger.info(f"✓ 朝代: {dynasty_part}, 作者: {author_part}")
+                except:
+                    pass
+        
+        # 提取摘要
+        if description:
+            book_info['description'] = description.strip()
+            self.logger.info(f"✓ 摘要: {book_info['description'][:80]}...")
+        
+        # 提取章節目錄
+        self.logger.info("正在提取章節目錄...")
+        
+        for idx, item in enumerate(catalog, 1):
+            if item:
+                chapter_name, chapter_url = item
+                
+                if chapter_url and not chapter_url.startswith('http'):
+                    chapter_url = self.base_url + chapter_url
+                
+                chapter_info = {
+                    'index': idx,
+                    'name': chapter_name,
+                    'url': chapter_url,
+                    'content': ''
+                }
+                
+                book_info['chapters'].append(chapter_info)
+                self.logger.info(f"  {idx}. {chapter_name}")
+        
+        self.logger.info(f"✓ 總共找到 {len(book_info['chapters'])} 個章節")
+        return book_info
+    
     def get_chapter_content(self, chapter_url, chapter_name=""):
         """
         獲取章節內容
@@ -171,67 +248,108 @@ class ShidianCrawler:
                 self.logger.warning(f"  ✗ 請求失敗，狀態碼: {response.status_code}")
                 return None
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            return self._parse_chapter_content(response.text, chapter_url)
             
-            # 提取章節標題
-            title = ""
-            title_tag = soup.find('h1')
-            if title_tag:
-                title = title_tag.text.strip()
+        except Exception as e:
+            self.logger.error(f"  ✗ 爬取失敗: {e}")
+            return None
+    
+    async def get_chapter_content_async(self, chapter_url, chapter_name="", fetcher=None):
+        """
+        獲取章節內容（非同步版本）
+        
+        Args:
+            chapter_url: 章節 URL
+            chapter_name: 章節名稱（用於日誌）
+            fetcher: 已開啟的 AsyncFetcher
             
-            # 提取正文內容 - 使用 article 或 main 標籤
-            content = ""
+        Returns:
+            dict: 包含標題和內容的字典
+        """
+        try:
+            if chapter_name:
+                self.logger.info(f"正在爬取: {chapter_name}")
             
-            # 優先使用 article 標籤
-            article_tag = soup.find('article')
-            if article_tag:
-                # 移除導航和其他非內容元素
-                for nav in article_tag.find_all(['nav', 'header', 'footer']):
-                    nav.decompose()
-                
-                content = article_tag.get_text(separator='\n', strip=True)
-            
-            # 如果沒有 article，嘗試 main 標籤
-            if not content:
-                main_tag = soup.find('main')
-                if main_tag:
-                    for nav in main_tag.find_all(['nav', 'header', 'footer']):
-                        nav.decompose()
-                    content = main_tag.get_text(separator='\n', strip=True)
-            
-            # 如果還是沒有，嘗試其他常見的內容容器
-            if not content:
-                content_selectors = [
-                    ('div', {'class': 'chapter-content'}),
-                    ('div', {'class': 'content'}),
-                    ('div', {'class': 'article-content'}),
-                    ('div', {'class': 'text-content'}),
-                ]
-                
-                for tag_name, attrs in content_selectors:
-                    content_tag = soup.find(tag_name, attrs)
-                    if content_tag:
-                        content = content_tag.get_text(separator='\n', strip=True)
-                        break
-            
-            if content:
-                # 清理內容
-                lines = [line.strip() for line in content.split('\n') if line.strip()]
-                content = '\n'.join(lines)
-                self.logger.info(f"  ✓ 成功，內容長度: {len(content)} 字")
-            else:
-                self.logger.warning(f"  ✗ 未找到內容")
+            response = await fetcher.get(chapter_url, timeout=15)
+            
+            if response.status_code != 200:
+                self.logger.warning(f"  ✗ 請求失敗，狀態碼: {response.status_code}")
+                return None
             
-            return {
-                'title': title,
-                'content': content,
-                'url': chapter_url
-            }
+            return self._parse_chapter_content(response.text, chapter_url)
             
         except Exception as e:
             self.logger.error(f"  ✗ 爬取失敗: {e}")
             return None
     
+    def _parse_chapter_content(self, html, chapter_url):
+        """
+        從章節頁面 HTML 解析標題和正文
+        
+        Args:
+            html: 頁面 HTML
+            chapter_url: 章節 URL
+            
+        Returns:
+            dict: 包含標題和內容的字典
+        """
+        soup = make_soup(html, self.parser_backend)
+        
+        # 提取章節標題
+        title = ""
+        title_tag = soup.find('h1')
+        if title_tag:
+            title = title_tag.text.strip()
+        
+        # 提取正文內容 - 使用 article 或 main 標籤
+        content = ""
+        
+        # 優先使用 article 標籤
+        article_tag = soup.find('article')
+        if article_tag:
+            # 移除導航和其他非內容元素
+            for nav in article_tag.find_all(['nav', 'header', 'footer']):
+                nav.decompose()
+            
+            content = article_tag.get_text(separator='\n', strip=True)
+        
+        # 如果沒有 article，嘗試 main 標籤
+        if not content:
+            main_tag = soup.find('main')
+            if main_tag:
+                for nav in main_tag.find_all(['nav', 'header', 'footer']):
+                    nav.decompose()
+                content = main_tag.get_text(separator='\n', strip=True)
+        
+        # 如果還是沒有，嘗試其他常見的內容容器
+        if not content:
+            content_selectors = [
+                ('div', {'class': 'chapter-content'}),
+                ('div', {'class': 'content'}),
+                ('div', {'class': 'article-content'}),
+                ('div', {'class': 'text-content'}),
+            ]
+            
+            for tag_name, attrs in content_selectors:
+                content_tag = soup.find(tag_name, attrs)
+                if content_tag:
+                    content = content_tag.get_text(separator='\n', strip=True)
+                    break
+        
+        if content:
+            # 清理內容
+            lines = [line.strip() for line in content.split('\n') if line.strip()]
+            content = '\n'.join(lines)
+            self.logger.info(f"  ✓ 成功，內容長度: {len(content)} 字")
+        else:
+            self.logger.warning(f"  ✗ 未找到內容")
+        
+        return {
+            'title': title,
+            'content': content,
+            'url': chapter_url
+        }
+    
     def crawl_all_chapters(self, book_info):
         """
         爬取所有章節內容
@@ -270,6 +388,54 @@ class ShidianCrawler:
         
         return book_info
     
+    def create_async_fetcher(self):
+        """建立與本爬蟲標頭一致的非同步抓取器"""
+        return AsyncFetcher(
+            headers=self.headers,
+            timeout=15,
+            per_host_limit=self.per_host_limit,
+            rate_limiter=RateLimiter.from_delay(self.delay),
+            cache=self.cache
+        )
+    
+    async def crawl_all_chapters_async(self, book_info):
+        """
+        爬取所有章節內容（非同步版本）
+        
+        章節同時排入事件迴圈，並行度由每主機連線上限控制，
+        請求間隔改由共享的速率限制器維持。
+        
+        Args:
+            book_info: 書籍資訊字典
+            
+        Returns:
+            dict: 更新後的書籍資訊（包含章節內容）
+        """
+        if not book_info or not book_info.get('chapters'):
+            self.logger.warning("沒有章節資訊")
+            return book_info
+        
+        total = len(book_info['chapters'])
+        self.logger.info(f"\n開始非同步爬取 {total} 個章節...")
+        self.logger.info("=" * 60)
+        
+        async with self.create_async_fetcher() as fetcher:
+            results = await asyncio.gather(*[
+                self.get_chapter_content_async(chapter['url'], chapter['name'], fetcher)
+                for chapter in book_info['chapters']
+            ])
+        
+        success_count = 0
+        for chapter, chapter_data in zip(book_info['chapters'], results):
+            if chapter_data and chapter_data['content']:
+                chapter['content'] = chapter_data['content']
+                success_count += 1
+        
+        self.logger.info("\n" + "=" * 60)
+        self.logger.info(f"✓ 爬取完成: {success_count}/{total} 章成功")
+        
+        return book_info
+    
     def crawl_book(self, book_id, generate_templates=True):
         """
         爬取完整書籍（資訊 + 所有章節）
@@ -291,7 +457,10 @@ class ShidianCrawler:
             return None
         
         # 步驟2: 爬取所有章節
-        book_info = self.crawl_all_chapters(book_info)
+        if self.use_async:
+            book_info = asyncio.run(self.crawl_all_chapters_async(book_info))
+        else:
+            book_info = self.crawl_all_chapters(book_info)
         
         # 步驟3: 自動保存和生成模板
         if book_info:
@@ -418,7 +587,7 @@ class ShidianCrawler:
 
 [此處應為現代中文翻譯]
 
-原文字數：{len(content)} 字
+原文字數：{count_cjk(content)} 字
 
 建議：請使用 AI 翻譯工具或人工翻譯此段落。
 
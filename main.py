@@ -67,6 +67,8 @@ info         - 顯示系統資訊
 範例用法:
 python main.py translate --book "https://www.shidianguji.com/book/DZ0001"
 python main.py translate --interactive
+python main.py translate --book "https://www.shidianguji.com/book/DZ0001" --offline
+python main.py translate --book "https://www.shidianguji.com/book/DZ0001" --fresh
 python main.py monitor dashboard
 python main.py monitor watch 30
 python main.py info
@@ -82,6 +84,9 @@ python main.py info
     translate_parser.add_argument('--batch', action='store_true', help='批量翻譯')
     translate_parser.add_argument('--status', '-s', action='store_true', help='顯示狀態')
     translate_parser.add_argument('--interactive', '-i', action='store_true', help='互動模式')
+    translate_parser.add_argument('--offline', action='store_true', help='離線模式：只從HTTP快取重播，不連線網路')
+    translate_parser.add_argument('--fresh', action='store_true', help='忽略檢查點，從頭重新處理整本書')
+    translate_parser.add_argument('--refresh-discovery', action='store_true', help='重新發現章節列表（保留已完成章節）')
 
     # 監控子命令
     monitor_parser = subparsers.add_parser('monitor', help='監控功能')
@@ -107,9 +112,14 @@ python main.py info
 
     # 執行對應的子命令
     if args.command == 'translate':
+        if args.offline:
+            from core.http_cache import set_offline_mode
+            set_offline_mode(True)
+            safe_print("📴 離線模式：所有請求將由快取回應")
         cli = EasyCLI()
         if args.book:
-            cli.translate_book(args.book)
+            cli.translate_book(args.book, resume=not args.fresh,
+                               refresh_discovery=args.refresh_discovery)
         elif args.list:
             cli.list_books()
         elif args.batch:
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""測試共用設定：讓 core 與 tools 可直接匯入"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
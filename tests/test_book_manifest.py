@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""core.book_manifest 的測試"""
+
+from core.book_manifest import BookManifest
+
+
+def _chapters():
+    return [{'number': i, 'title': f'第{i}章', 'url': f'http://example.com/c/{i}'} for i in (1, 2, 3)]
+
+
+def test_skipped_chapters_are_not_pending(tmp_path):
+    source_dir = tmp_path / 'src'
+    source_dir.mkdir()
+    (source_dir / '001.txt').write_text('道', encoding='utf-8')
+    chapters = _chapters()
+
+    manifest = BookManifest('B1', tmp_path / 'manifests')
+    manifest.mark_done(chapters[0], '001.txt', 'hash')
+    manifest.mark_skipped(chapters[1], '卷內容與品重複')
+    manifest.mark_failed(chapters[2], '無法提取章節內容')
+
+    # 重新載入後狀態仍保留
+    reloaded = BookManifest('B1', tmp_path / 'manifests')
+    assert reloaded.pending_chapters(chapters, source_dir) == [chapters[2]]
+    stats = reloaded.get_statistics()
+    assert (stats['done'], stats['skipped'], stats['failed']) == (1, 1, 1)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""core.catalogue_store 的測試"""
+
+import json
+
+import pytest
+
+from core.catalogue_store import open_catalogue_store
+
+
+def _record(title, chapter_count):
+    return {
+        "book_info": {"title": title, "author": "佚名"},
+        "folder_name": title,
+        "chapter_count": chapter_count,
+        "total_characters": chapter_count * 100,
+        "category": "經",
+        "tags": ["經"],
+        "chapters": [{"number": n, "title": f"第{n}章", "file_hash": f"h{n}"}
+                     for n in range(1, chapter_count + 1)],
+        "translation_status": {"completed_chapters": 0, "total_chapters": chapter_count}
+    }
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_failed_transaction_rolls_back(tmp_path, backend):
+    store = open_catalogue_store(tmp_path, backend)
+    store.put_classic("a", _record("甲經", 1))
+    store.save()
+
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.put_classic("a", _record("甲經", 3))
+            store.put_classic("b", _record("乙經", 2))
+            store.save()
+            raise RuntimeError("中斷")
+
+    assert store.get_classic("b") is None
+    assert store.get_classic("a")["chapter_count"] == 1
+    assert store.get_chapter_hash("a", 3) is None
+    assert store.aggregate_totals()["total_classics"] == 1
+    store.close()
+
+    # 重新開啟後讀到的也是交易前的內容
+    reopened = open_catalogue_store(tmp_path, backend)
+    assert [classic_id for classic_id, _ in reopened.iter_classics()] == ["a"]
+    assert reopened.get_chapter_hash("a", 1) == "h1"
+    reopened.close()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_nested_transaction_commits_once(tmp_path, backend):
+    store = open_catalogue_store(tmp_path, backend)
+
+    with store.transaction():
+        store.put_classic("a", _record("甲經", 1))
+        with store.transaction():
+            store.put_classic("b", _record("乙經", 2))
+            store.save()
+        store.save()
+
+    store.close()
+    reopened = open_catalogue_store(tmp_path, backend)
+    assert sorted(classic_id for classic_id, _ in reopened.iter_classics()) == ["a", "b"]
+    assert reopened.aggregate_totals()["total_chapters"] == 3
+    reopened.close()
+
+
+def test_json_store_recovers_from_write_ahead_file(tmp_path):
+    store = open_catalogue_store(tmp_path, "json")
+    store.put_classic("a", _record("甲經", 1))
+    store.save()
+
+    # 在寫入預寫檔途中中斷：主檔保持原狀
+    store.wal_file.write_text('{"classics": {"b"', encoding='utf-8')
+    reopened = open_catalogue_store(tmp_path, "json")
+    assert [classic_id for classic_id, _ in reopened.iter_classics()] == ["a"]
+    assert not reopened.wal_file.exists()
+
+    # 預寫檔完整但尚未取代主檔：載入時套用
+    reopened.put_classic("b", _record("乙經", 2))
+    store.wal_file.write_text(json.dumps(reopened.to_dict(), ensure_ascii=False), encoding='utf-8')
+    recovered = open_catalogue_store(tmp_path, "json")
+    assert sorted(classic_id for classic_id, _ in recovered.iter_classics()) == ["a", "b"]
+
+
+def test_json_store_keeps_corrupt_file(tmp_path):
+    (tmp_path / "classics.json").write_text('{"classics": ', encoding='utf-8')
+
+    store = open_catalogue_store(tmp_path, "json")
+
+    assert list(store.iter_classics()) == []
+    corrupt_files = list(tmp_path.glob("classics.corrupt-*.json"))
+    assert len(corrupt_files) == 1
+    assert corrupt_files[0].read_text(encoding='utf-8') == '{"classics": '
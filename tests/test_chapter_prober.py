@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""core.chapter_prober 的測試"""
+
+import http.server
+import threading
+
+import pytest
+import requests
+
+from core.chapter_prober import ChapterProber
+from core.http_cache import ResponseCache, set_offline_mode
+
+
+@pytest.fixture
+def server():
+    """記錄收到的請求的本機伺服器"""
+    received = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def _reply(self, send_body):
+            received.append((self.command, self.path))
+            body = b'<html>ok</html>'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            self._reply(True)
+
+        def do_HEAD(self):
+            self._reply(False)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", received
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def offline():
+    set_offline_mode(True)
+    yield
+    set_offline_mode(False)
+
+
+def test_online_probe_sends_head(server, tmp_path):
+    base, received = server
+    prober = ChapterProber(requests.Session(), cache=ResponseCache(tmp_path))
+
+    assert prober.exists(f"{base}/a")
+    assert received == [('HEAD', '/a')]
+
+
+def test_offline_probe_never_uses_network(server, tmp_path, offline):
+    base, received = server
+    cache = ResponseCache(tmp_path)
+    cache.store(f"{base}/cached", 200, {'Content-Type': 'text/html'}, b'<html></html>')
+    prober = ChapterProber(requests.Session(), cache=cache)
+
+    assert prober.exists(f"{base}/cached")
+    assert not prober.exists(f"{base}/a")
+    assert received == []
+
+
+def test_offline_probe_without_cache_is_a_miss(server, offline):
+    base, received = server
+    prober = ChapterProber(requests.Session())
+
+    assert not prober.exists(f"{base}/a")
+    assert received == []
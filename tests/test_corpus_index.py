@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""core.corpus_index 的測試"""
+
+import os
+
+from core.corpus_index import CorpusIndex, SOURCE_SUBDIR
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+def _bump_mtime(path):
+    """保證目錄 mtime 改變（避免檔案系統時間精度造成誤判）"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _make_index(tmp_path):
+    return CorpusIndex(tmp_path / "source", tmp_path / "translations",
+                       index_file=tmp_path / "corpus_index.json", max_workers=2)
+
+
+def test_refresh_rereads_only_changed_files(tmp_path):
+    source_dir = tmp_path / "source" / "book" / SOURCE_SUBDIR
+    translation_dir = tmp_path / "translations" / "book"
+    _write(source_dir / "001_道經.txt", "道可道，非常道。")
+    _write(source_dir / "002_德經.txt", "上德不德，是以有德。")
+    _write(translation_dir / "001_道經.md", "## 翻譯\n\n[此處應為現代中文翻譯]\n")
+
+    index = _make_index(tmp_path)
+    assert index.refresh() == {"books": 1, "rescanned_dirs": 2, "read_files": 3}
+    assert index.get_chapter("book", "001_道經")["char_count"] == 6
+    assert index.template_files() == [translation_dir / "001_道經.md"]
+
+    assert index.refresh() == {"books": 1, "rescanned_dirs": 0, "read_files": 0}
+
+    # 就地修改翻譯檔案：目錄不需重新列出，只重新讀取該檔案
+    _write(translation_dir / "001_道經.md", "## 翻譯\n\n可以言說的道，不是恆常的道。\n")
+    assert index.refresh() == {"books": 1, "rescanned_dirs": 0, "read_files": 1}
+    assert index.template_files() == []
+
+    # 刪除原文檔案：重新列出目錄，章節只剩翻譯側
+    (source_dir / "002_德經.txt").unlink()
+    _bump_mtime(source_dir)
+    assert index.refresh() == {"books": 1, "rescanned_dirs": 1, "read_files": 0}
+    assert index.get_chapter("book", "002_德經") is None
+    assert [chapter["stem"] for chapter in index.source_chapters("book")] == ["001_道經"]
+
+    # 由索引檔重新載入後沿用記錄，不重新讀取
+    reloaded = _make_index(tmp_path)
+    assert reloaded.refresh() == {"books": 1, "rescanned_dirs": 0, "read_files": 0}
+    assert reloaded.get_chapter("book", "001_道經") == index.get_chapter("book", "001_道經")
+
+
+def test_update_files_touches_only_given_paths(tmp_path):
+    source_dir = tmp_path / "source" / "book" / SOURCE_SUBDIR
+    translation_dir = tmp_path / "translations" / "book"
+    _write(source_dir / "001_道經.txt", "道可道，非常道。")
+
+    index = _make_index(tmp_path)
+    index.refresh()
+
+    _write(translation_dir / "001_道經.md", "🔄 待翻譯\n")
+    assert index.update_files([translation_dir / "001_道經.md", tmp_path / "unrelated.md"]) == 1
+    assert index.has_translations("book")
+    assert index.has_markers(index.get_chapter("book", "001_道經"))
+
+    (translation_dir / "001_道經.md").unlink()
+    assert index.update_files([translation_dir / "001_道經.md"]) == 0
+    assert not index.has_translations("book")
+    assert index.get_chapter("book", "001_道經")["source_hash"]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""core.file_monitor 的測試"""
+
+from core.file_monitor import FileMonitor
+
+
+def _monitor(path, **kwargs):
+    return FileMonitor(data_dir=path, flush_threshold=1, flush_interval=0, **kwargs)
+
+
+def _write(tmp_path, monitor, count, prefix):
+    for index in range(count):
+        target = tmp_path / f"{prefix}{index}.txt"
+        target.write_text("道" * 50, encoding='utf-8')
+        monitor.track_file_write(target, "source_text")
+
+
+def test_total_operations_survives_rotation(tmp_path):
+    monitor = _monitor(tmp_path / "logs", max_log_bytes=600, max_rotated=1)
+    _write(tmp_path, monitor, 12, "a")
+
+    stats = monitor.get_statistics()
+    assert stats["total_operations"] == 12
+    assert stats["total_operations"] == monitor.metadata["total_operations"]
+    assert stats["retained_operations"] < 12
+    assert sum(stats["file_types"].values()) == stats["retained_operations"]
+
+
+def test_statistics_follow_writes_from_another_instance(tmp_path):
+    first = _monitor(tmp_path / "logs")
+    second = _monitor(tmp_path / "logs")
+    _write(tmp_path, first, 2, "a")
+    assert first.get_statistics()["total_operations"] == 2
+
+    _write(tmp_path, second, 3, "b")
+    stats = first.get_statistics()
+    assert stats["total_operations"] == 5
+    assert stats["retained_operations"] == 5
+
+
+def test_unchanged_log_is_not_reread(tmp_path, monkeypatch):
+    monitor = _monitor(tmp_path / "logs")
+    _write(tmp_path, monitor, 2, "a")
+    monitor.get_statistics()
+
+    reads = []
+    original = monitor._read_metadata
+    monkeypatch.setattr(monitor, "_read_metadata", lambda: reads.append(1) or original())
+    monitor.get_statistics()
+    monitor.get_recent_operations(5)
+    assert reads == []
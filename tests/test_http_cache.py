@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""core.http_cache 的測試"""
+
+import json
+
+from core.http_cache import ResponseCache
+
+
+def _store(cache, name, size):
+    return cache.store(f"http://example.com/{name}", 200, {'Content-Type': 'text/html'}, b'x' * size)
+
+
+def test_total_bytes_and_lru_eviction(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=1000)
+    for name in 'abcd':
+        _store(cache, name, 300)
+
+    # 超過上限時淘汰最久未使用的項目
+    assert cache.lookup("http://example.com/a") is None
+    assert cache.total_bytes == sum(entry['size'] for entry in cache.index.values())
+    assert cache.total_bytes <= 900
+
+    # 取代既有項目時不重複計算
+    _store(cache, 'd', 100)
+    assert cache.total_bytes == sum(entry['size'] for entry in cache.index.values())
+
+
+def test_index_writes_are_batched_and_flushed(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.save_index()
+    entry = _store(cache, 'a', 10)
+
+    with open(tmp_path / "index.json", encoding='utf-8') as f:
+        assert json.load(f) == {}
+
+    cache.read_body(entry)
+    cache.flush()
+    with open(tmp_path / "index.json", encoding='utf-8') as f:
+        saved = json.load(f)[entry['key']]
+    assert saved['last_access'] == entry['last_access']
+
+    reloaded = ResponseCache(tmp_path)
+    assert reloaded.total_bytes == 10
+    assert reloaded.lookup("http://example.com/a") is not None
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""tools.monitor_cli.LiveDashboard 的測試"""
+
+import io
+import threading
+
+from monitor_cli import LiveDashboard
+
+
+class FakeTracker:
+    def __init__(self):
+        self.calls = []
+
+    def get_all_classics(self):
+        return {}
+
+    def refresh_translation_progress(self, paths):
+        self.calls.append(("refresh", threading.get_ident(), [p.name for p in paths]))
+
+    def load_tracker_data(self):
+        self.calls.append(("load", threading.get_ident(), None))
+
+
+def test_tracker_updates_run_on_the_dashboard_thread():
+    tracker = FakeTracker()
+    dashboard = LiveDashboard(tracker, file_monitor=None, output=io.StringIO())
+    operations = [
+        {"file_path": "docs/source_texts/b/原文/001.txt", "file_type": "source_text", "operation": "create"},
+        {"file_path": "docs/translations/b/001.md", "file_type": "translation", "operation": "modify"},
+    ]
+
+    # 監看執行緒只排入事件，不觸碰追蹤器
+    watcher = threading.Thread(target=dashboard.on_file_operations, args=(operations,))
+    watcher.start()
+    watcher.join()
+    assert tracker.calls == []
+
+    kind, payload = dashboard.events.get_nowait()
+    dashboard.handle_event(kind, payload)
+
+    main = threading.get_ident()
+    assert tracker.calls == [("load", main, None), ("refresh", main, ["001.md"])]
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""core.page_store 的測試"""
+
+from core.page_store import PageStore
+
+
+class FakeResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+
+def test_error_responses_are_not_stored():
+    responses = [FakeResponse(503, 'busy'), FakeResponse(200, '<html>ok</html>')]
+    calls = []
+
+    def fetch(url, **kwargs):
+        calls.append(url)
+        return responses.pop(0)
+
+    store = PageStore(fetch)
+
+    assert store.get('http://example.com/book').status_code == 503
+    page = store.get('http://example.com/book')
+    assert page.status_code == 200
+    assert store.get('http://example.com/book') is page
+    assert calls == ['http://example.com/book'] * 2
+    assert len(store) == 1
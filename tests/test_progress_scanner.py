@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""core.progress_scanner 的測試"""
+
+import os
+
+from core.progress_scanner import TRANSLATION_PLACEHOLDER, TranslationProgressScanner
+
+
+def _scan(tmp_path, text):
+    path = tmp_path / "chapter.md"
+    path.write_text(text, encoding='utf-8')
+    scanner = TranslationProgressScanner(cache_file=tmp_path / "cache.json")
+    return scanner.scan([path])[os.path.abspath(path)]
+
+
+def test_similar_heading_is_not_taken_as_translation_heading(tmp_path):
+    source = "道可道，非常道。" * 300
+    text = (f"# 測試\n\n## 翻譯說明\n\n說明文字。\n\n## 原文\n\n{source}\n\n"
+            f"## 翻譯 \r\n\n{TRANSLATION_PLACEHOLDER}\n")
+
+    result = _scan(tmp_path, text)
+
+    assert result["placeholder"] is True
+    assert not TranslationProgressScanner.is_translated(result, 500)
+
+
+def test_translated_large_file(tmp_path):
+    source = "道可道，非常道。" * 300
+    text = f"# 測試\n\n## 原文\n\n{source}\n\n## 翻譯\n\n{'可以說出來的道，就不是恆常的道。' * 100}\n"
+
+    result = _scan(tmp_path, text)
+
+    assert result["placeholder"] is False
+    assert TranslationProgressScanner.is_translated(result, 500)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""core.term_matcher 的測試"""
+
+import random
+
+from core.term_matcher import TermMatcher
+
+
+def _naive_counts(terms, text):
+    """逐一術語、逐一位置比對（含重疊出現）"""
+    counts = {}
+    for term in terms:
+        count = sum(1 for start in range(len(text)) if text.startswith(term, start))
+        if count:
+            counts[term] = count
+    return counts
+
+
+def test_overlapping_and_nested_terms():
+    matcher = TermMatcher(["太上", "太上老君", "老君", "君", "", "太上"])
+
+    assert len(matcher) == 4
+    assert matcher.counts("太上老君說太上") == {"太上": 2, "太上老君": 1, "老君": 1, "君": 1}
+    assert matcher.find("老君曰") == ["老君", "君"]
+    assert matcher.index("老君") == 2
+
+
+def test_matches_naive_scan_on_random_text():
+    rng = random.Random(7)
+    alphabet = "道德經太上老君元始天尊玄靈寶"
+    terms = list({''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(300)})
+    matcher = TermMatcher(terms)
+
+    for _ in range(20):
+        text = ''.join(rng.choice(alphabet + "，。 ") for _ in range(500))
+        assert matcher.counts(text) == _naive_counts(terms, text)
+        assert matcher.find(text) == [term for term in terms if term in text]
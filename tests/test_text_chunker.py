@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""core.text_chunker 的測試"""
+
+from core.text_chunker import join_chunks, pack_items, split_chunks, split_text
+from core.text_stats import estimate_tokens
+
+
+def _rejoin(planned):
+    return join_chunks([chunk for _, chunk in planned], [separator for separator, _ in planned])
+
+
+def test_paragraphs_that_fit_are_not_split():
+    paragraph = '甲乙丙丁戊己庚辛。' * 5
+    text = '\n\n'.join([paragraph] * 10)
+
+    chunks = split_text(text, 100)
+
+    assert len(chunks) == 5
+    for chunk in chunks:
+        assert chunk.split('\n\n') == [paragraph, paragraph]
+    assert _rejoin(split_chunks(text, 100)) == text
+
+
+def test_oversized_paragraph_is_split_at_sentences_and_rejoined_without_blank_line():
+    long_paragraph = '長段落甲乙丙丁戊己庚辛壬癸。' * 30
+    text = '\n\n'.join(['前言。', long_paragraph, '結尾。'])
+
+    planned = split_chunks(text, 60)
+
+    assert all(estimate_tokens(chunk) <= 60 for _, chunk in planned)
+    assert planned[0] == ('', '前言。')
+    # 長段落的各部分之間沒有空白行
+    assert [separator for separator, _ in planned[2:-1]] == [''] * (len(planned) - 3)
+    assert _rejoin(planned) == text
+    assert _rejoin(planned).count('\n\n') == 2
+
+
+def test_line_break_inside_oversized_paragraph_is_kept():
+    verse = '\n'.join(['道可道非常道名可名非常名。' * 2] * 6)
+    planned = split_chunks(verse, 40)
+
+    assert len(planned) > 1
+    assert set(separator for separator, _ in planned[1:]) <= {'', '\n'}
+    assert _rejoin(planned) == verse
+
+
+def test_short_text_is_a_single_chunk():
+    assert split_text('  道可道。  ', 100) == ['道可道。']
+    assert split_text('', 100) == []
+
+
+def test_pack_items_respects_token_and_item_limits():
+    sizes = [300, 400, 500, 100, 100, 100, 2000, 50]
+
+    groups = pack_items(sizes, max_tokens=1000, max_items=3)
+
+    assert groups == [[0, 1], [2, 3, 4], [5], [6], [7]]
+    # 分組保持原順序且涵蓋所有項目
+    assert [index for group in groups for index in group] == list(range(len(sizes)))
+
+
+def test_pack_items_oversized_item_is_its_own_group():
+    assert pack_items([50, 5000, 50], max_tokens=100, max_items=10) == [[0], [1], [2]]
+    assert pack_items([], max_tokens=100, max_items=10) == []
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""core.translation_jobs 的測試"""
+
+from pathlib import Path
+
+from core.translation_jobs import TranslationJobQueue, TranslationWorkerPool
+
+Queue = TranslationJobQueue
+
+
+def test_reload_resets_running_jobs(tmp_path):
+    paths = [Path(f"{name}.md") for name in "abcd"]
+    queue = Queue("batch", tmp_path)
+    queue.add_jobs(paths)
+    queue.mark(paths[0], Queue.STATUS_RUNNING)
+    queue.mark(paths[0], Queue.STATUS_SUCCESS)
+    queue.mark(paths[1], Queue.STATUS_RUNNING)
+    queue.mark(paths[2], Queue.STATUS_FAILED, "逾時")
+
+    # 模擬程序在 b 執行中被中斷
+    resumed = Queue("batch", tmp_path)
+    assert resumed.pending() == [paths[1], paths[3]]
+    assert resumed.count(Queue.STATUS_RUNNING) == 0
+    assert resumed.count(Queue.STATUS_SUCCESS) == 1
+
+    resumed.add_jobs(paths, retry_failed=False)
+    assert resumed.pending() == [paths[1], paths[3]]
+    resumed.add_jobs(paths)
+    assert resumed.pending() == paths[1:]
+    assert {result["file"]: result["attempts"] for result in resumed.results()} == {
+        "a.md": 1, "b.md": 1, "c.md": 0, "d.md": 0}
+
+    # 不同批次的佇列互不影響
+    assert len(Queue("other", tmp_path)) == 0
+
+
+def test_stopped_run_resumes_remaining_jobs(tmp_path):
+    paths = [Path(f"{name}.md") for name in "abcd"]
+    queue = Queue("batch", tmp_path)
+    queue.add_jobs(paths)
+
+    translated = []
+
+    def worker(path):
+        translated.append(path)
+        pool.stop()
+        return True
+
+    pool = TranslationWorkerPool(worker, max_workers=1)
+    assert pool.run(queue) == {"success": 1, "failed": 0, "skipped": 0}
+    assert translated == paths[:1]
+
+    resumed = Queue("batch", tmp_path)
+    assert resumed.pending() == paths[1:]
+
+    def failing_worker(path):
+        translated.append(path)
+        return False
+
+    progress = []
+    pool = TranslationWorkerPool(failing_worker, max_workers=2, max_retries=0,
+                                 progress_callback=lambda done, total, name: progress.append((done, total)))
+    assert pool.run(resumed) == {"success": 0, "failed": 3, "skipped": 1}
+    assert sorted(translated[1:]) == paths[1:]
+    assert progress[0] == (1, 4) and progress[-1] == (4, 4)
+    assert Queue("batch", tmp_path).count(Queue.STATUS_FAILED) == 3
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""core.translation_memory 的測試"""
+
+from core.translation_memory import TranslationMemory, normalize_segment
+
+
+OPENING = "無上甚深微妙法，百千萬劫難遭遇。"
+OPENING_TRANSLATION = "無上而深奧微妙的法門，在百千萬劫中也難以遇到。"
+
+
+def test_lookup_ignores_punctuation_and_width():
+    memory = TranslationMemory()
+    assert memory.add(OPENING, OPENING_TRANSLATION, origin="開經偈")
+
+    assert normalize_segment("無上甚深微妙法 百千萬劫難遭遇") == normalize_segment(OPENING)
+    assert memory.lookup("無上甚深微妙法，百千萬劫難遭遇！") == OPENING_TRANSLATION
+    assert memory.lookup("無上甚深微妙法") is None  # 過短的段落不查詢
+    assert memory.stats == {"lookups": 1, "hits": 1, "hit_chars": len(normalize_segment(OPENING))}
+
+    assert not memory.add("太上曰", "太上說")
+    assert not memory.add(OPENING, "  ")
+
+
+def test_add_aligned_requires_matching_segments():
+    memory = TranslationMemory()
+    source = f"{OPENING}\n\n我今見聞得受持，願解如來真實義。\n"
+    translation = f"{OPENING_TRANSLATION}\n我今天得以見聞並受持，願能理解如來的真實義理。\n"
+
+    assert memory.add_aligned(source, translation + "多出的一段譯文，無法逐段對齊。") == 0
+    assert memory.add_aligned(source, translation) == 2
+    assert len(memory) == 2
+
+    matches = memory.search("無上甚深微妙法，百千萬劫難相遇。")
+    assert [match[1] for match in matches] == [OPENING]
+    assert memory.search(OPENING) == []  # 完全相符的段落由 lookup 處理
+
+
+def test_save_and_reload(tmp_path):
+    memory_file = tmp_path / "translation_memory.json"
+    memory = TranslationMemory(memory_file)
+    memory.add(OPENING, OPENING_TRANSLATION)
+    memory.save()
+
+    reloaded = TranslationMemory(memory_file)
+    assert reloaded.lookup(OPENING) == OPENING_TRANSLATION
+    assert reloaded.search("無上甚深微妙法，百千萬劫難相遇。")[0][2] == OPENING_TRANSLATION
+
+    # 沒有變更時不重寫檔案
+    mtime = memory_file.stat().st_mtime_ns
+    reloaded.save()
+    assert memory_file.stat().st_mtime_ns == mtime
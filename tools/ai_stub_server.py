@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI 模型模擬伺服器
+
+提供 OpenAI 相容的 POST /v1/chat/completions 端點，以 core.ai_backends.StubModel
+產生確定性的翻譯輸出，可設定延遲、抖動與錯誤率，用於離線測量 http 後端的
+批量翻譯吞吐量與重試行為。支援 HTTP/1.1 持久連線；請求帶有 "stream": true 時
+以 server-sent events 逐行回傳輸出，模擬失敗的請求在輸出一半後中斷。
+
+使用方式：
+    python tools/ai_stub_server.py --port 8765 --latency 0.5 --error-rate 0.1
+    python tools/ai_translator.py -d docs/translations/某書 --backend http \\
+        --backend-url http://127.0.0.1:8765/v1/chat/completions
+"""
+
+import argparse
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.ai_backends import StubModel
+from core.unicode_handler import safe_print
+
+
+COMPLETIONS_PATH = "/v1/chat/completions"
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """chat/completions 請求處理器"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "requests": self.server.request_count})
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+
+        if self.path != COMPLETIONS_PATH:
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        try:
+            request = json.loads(body)
+            prompt = "\n".join(message.get("content", "") for message in request["messages"])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self._send_json(400, {"error": {"message": "invalid request"}})
+            return
+
+        with self.server.lock:
+            self.server.request_count += 1
+
+        if request.get("stream"):
+            self._stream_completion(prompt)
+            return
+
+        output = self.server.model.respond(prompt)
+        if output is None:
+            self._send_json(503, {"error": {"message": "simulated failure"}})
+            return
+
+        self._send_json(200, {
+            "object": "chat.completion",
+            "model": "stub",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": output},
+                         "finish_reason": "stop"}]
+        })
+
+    def _send_chunk(self, data: bytes) -> None:
+        """以 chunked transfer encoding 送出一段資料（空資料表示結束）"""
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_event(self, payload) -> None:
+        data = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+        self._send_chunk(f"data: {data}\n\n".encode('utf-8'))
+
+    def _start_event_stream(self) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+    def _stream_completion(self, prompt: str) -> None:
+        """以 server-sent events 逐行回傳輸出（尚未輸出就失敗時返回 503）"""
+        started = False
+
+        def emit(text: str) -> None:
+            nonlocal started
+            if not started:
+                self._start_event_stream()
+                started = True
+            self._send_event({"object": "chat.completion.chunk", "model": "stub",
+                              "choices": [{"index": 0, "delta": {"content": text}}]})
+
+        output = self.server.model.stream(prompt, emit)
+        if output is None and not started:
+            self._send_json(503, {"error": {"message": "simulated failure"}})
+            return
+        if not started:
+            self._start_event_stream()
+        if output is None:
+            self._send_event({"error": {"message": "simulated failure"}})
+        else:
+            self._send_event({"object": "chat.completion.chunk", "model": "stub",
+                              "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            self._send_event("[DONE]")
+        self._send_chunk(b"")
+
+
+class StubServer(ThreadingHTTPServer):
+    """模擬伺服器（每個連線一個執行緒）"""
+
+    daemon_threads = True
+
+    def __init__(self, address, model: StubModel, verbose: bool = False):
+        super().__init__(address, StubRequestHandler)
+        self.model = model
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.request_count = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{COMPLETIONS_PATH}"
+
+
+def start_stub_server(model: StubModel, host: str = "127.0.0.1", port: int = 0) -> StubServer:
+    """在背景執行緒啟動模擬伺服器（port 為 0 時自動選擇），以 server.shutdown() 停止"""
+    server = StubServer((host, port), model)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    """主函數"""
+    parser = argparse.ArgumentParser(description="AI 模型模擬伺服器")
+    parser.add_argument('--host', default='127.0.0.1', help='監聽位址')
+    parser.add_argument('--port', type=int, default=8765, help='監聽埠')
+    parser.add_argument('--latency', type=float, default=0.5, help='每個請求的基本延遲秒數')
+    parser.add_argument('--jitter', type=float, default=0.0, help='隨機增加的最大延遲秒數')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='請求失敗的機率（0–1）')
+    parser.add_argument('--seed', type=int, default=0, help='隨機種子')
+    parser.add_argument('--token-latency', type=float, default=0.0, help='每個輸出字元增加的延遲秒數')
+    parser.add_argument('--verbose', action='store_true', help='記錄每個請求')
+    args = parser.parse_args()
+
+    model = StubModel(args.latency, args.jitter, args.error_rate, args.seed, args.token_latency)
+    server = StubServer((args.host, args.port), model, verbose=args.verbose)
+    safe_print(f"🧪 模擬伺服器: {server.url}")
+    safe_print(f"   延遲 {args.latency}s（+{args.jitter}s），錯誤率 {args.error_rate:.0%}，種子 {args.seed}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        safe_print(f"\n👋 已停止，共處理 {server.request_count} 個請求")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
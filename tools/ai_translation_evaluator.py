@@ -1,25 +1,58 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-from core.unicode_handler import safe_print
 AI翻譯品質評估工具
 
 用於評估AI翻譯的品質和規範符合度
+- 術語表（可合併外部詞彙表）編譯成一個 Aho-Corasick 自動機，每個檔案只掃描一次
+- 批量評估以多個行程並行處理整個目錄，逐檔分數輸出為 JSONL 或 CSV 結果表
+
+使用方式：
+    python tools/ai_translation_evaluator.py docs/translations/某書/01_某章.md
+    python tools/ai_translation_evaluator.py docs/translations --glossary glossary.csv -o results.csv
 """
 
+import os
 import re
+import csv
 import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
+# 添加父目錄到路徑以便導入核心模組
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.term_matcher import TermMatcher
+from core.unicode_handler import safe_print
+
+
+# 批量評估結果表的欄位
+RESULT_FIELDS = ["file", "overall_score", "format_score", "content_score", "terminology_score",
+                 "grade", "terms_found", "issue_count", "issues", "suggestions", "error"]
+
+DEFAULT_RESULTS_FILE = Path("data/tracking/translation_evaluation.jsonl")
+
+# 檔案數少於此值時不值得啟動工作行程
+MIN_PARALLEL_FILES = 16
+
 
 class TranslationEvaluator:
     """翻譯品質評估器"""
     
-    def __init__(self):
-        """初始化評估器"""
+    def __init__(self, glossary_file: str = None):
+        """
+        初始化評估器
+
+        Args:
+            glossary_file: 外部詞彙表（JSON 或 CSV/TSV），與內建術語表合併
+        """
         self.load_terminology()
+        if glossary_file:
+            self.load_glossary(glossary_file)
         self.load_evaluation_rules()
         
     def load_terminology(self):
@@ -54,6 +87,55 @@ class TranslationEvaluator:
             "封建": {"category": "禁用", "reason": "政治色彩詞彙"},
             "老子說": {"category": "禁用", "correct": "太上老君說"}
         }
+        self.term_matcher = TermMatcher(self.terminology)
+        
+    def load_glossary(self, glossary_file: str) -> int:
+        """
+        合併外部詞彙表並重新編譯術語自動機
+        
+        支援格式：
+        - JSON：{"術語": {"category": ..., "alternatives": [...], "correct": ..., "reason": ...}}、
+          {"terms": {...}} 或 [{"term": "術語", ...}]
+        - CSV/TSV：標題列含 term，其餘欄位為 category、alternatives（以 | 或 、 分隔）、correct、reason
+        
+        Returns:
+            int: 載入的術語數
+        """
+        path = Path(glossary_file)
+        entries = {}
+        
+        if path.suffix.lower() == '.json':
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get("terms"), (dict, list)):
+                data = data["terms"]
+            if isinstance(data, dict):
+                items = [dict(info if isinstance(info, dict) else {}, term=term) for term, info in data.items()]
+            else:
+                items = [item for item in data if isinstance(item, dict)]
+        else:
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                delimiter = '\t' if path.suffix.lower() == '.tsv' else ','
+                items = list(csv.DictReader(f, delimiter=delimiter))
+                
+        for item in items:
+            term = (item.get("term") or "").strip()
+            if not term:
+                continue
+            info = {"category": (item.get("category") or "").strip() or "術語"}
+            alternatives = item.get("alternatives")
+            if isinstance(alternatives, str):
+                alternatives = [alt.strip() for alt in re.split(r'[|、]', alternatives) if alt.strip()]
+            if alternatives:
+                info["alternatives"] = list(alternatives)
+            for key in ("correct", "reason"):
+                if item.get(key):
+                    info[key] = str(item[key]).strip()
+            entries[term] = info
+            
+        self.terminology.update(entries)
+        self.term_matcher = TermMatcher(self.terminology)
+        return len(entries)
         
     def load_evaluation_rules(self):
         """載入評估規則"""
@@ -81,6 +163,7 @@ class TranslationEvaluator:
             "format_score": 0,
             "content_score": 0,
             "terminology_score": 0,
+            "terms_found": 0,
             "issues": [],
             "suggestions": []
         }
@@ -102,6 +185,7 @@ class TranslationEvaluator:
             # 術語檢查
             terminology_result = self.check_terminology(parsed["translation"])
             results["terminology_score"] = terminology_result["score"]
+            results["terms_found"] = len(terminology_result["terms"])
             results["issues"].extend(terminology_result["issues"])
             results["suggestions"].extend(terminology_result["suggestions"])
         
@@ -206,42 +290,45 @@ class TranslationEvaluator:
         suggestions = []
         score = 100
         
+        # 一次掃描找出譯文中出現的所有術語（依術語表順序）
+        found = self.term_matcher.find(translation)
+        
         # 檢查禁用詞彙
-        for term, info in self.terminology.items():
-            if info.get("category") == "禁用" and term in translation:
+        for term in found:
+            info = self.terminology[term]
+            if info.get("category") == "禁用":
                 issues.append(f"❌ 使用了不當詞彙: 「{term}」")
                 if "correct" in info:
                     suggestions.append(f"💡 建議將「{term}」改為「{info['correct']}」")
                 score -= 20
                 
-        # 檢查術語一致性
-        used_terms = {}
-        for term, info in self.terminology.items():
-            if info.get("category") != "禁用" and term in translation:
-                used_terms[term] = info
-                
         # 檢查是否有更好的術語選擇
-        for term, info in used_terms.items():
-            if "alternatives" in info and len(info["alternatives"]) > 1:
+        for term in found:
+            info = self.terminology[term]
+            if info.get("category") != "禁用" and len(info.get("alternatives", [])) > 1:
                 suggestions.append(f"💡 「{term}」可考慮使用: {', '.join(info['alternatives'])}")
                 
-        return {"score": max(0, score), "issues": issues, "suggestions": suggestions}
+        return {"score": max(0, score), "issues": issues, "suggestions": suggestions, "terms": found}
+        
+    @staticmethod
+    def grade(score: float) -> str:
+        """評級"""
+        if score >= 90:
+            return "優秀 ⭐⭐⭐⭐⭐"
+        elif score >= 80:
+            return "良好 ⭐⭐⭐⭐"
+        elif score >= 70:
+            return "及格 ⭐⭐⭐"
+        elif score >= 60:
+            return "待改進 ⭐⭐"
+        return "不及格 ⭐"
         
     def generate_evaluation_report(self, results: Dict) -> str:
         """生成評估報告"""
         score = results["overall_score"]
         
         # 評級
-        if score >= 90:
-            grade = "優秀 ⭐⭐⭐⭐⭐"
-        elif score >= 80:
-            grade = "良好 ⭐⭐⭐⭐"
-        elif score >= 70:
-            grade = "及格 ⭐⭐⭐"
-        elif score >= 60:
-            grade = "待改進 ⭐⭐"
-        else:
-            grade = "不及格 ⭐"
+        grade = self.grade(score)
             
         report = f"""# 📊 AI翻譯品質評估報告
 
@@ -295,9 +382,9 @@ class TranslationEvaluator:
         return report
 
 
-def evaluate_translation_file(file_path: str) -> None:
+def evaluate_translation_file(file_path: str, glossary_file: str = None) -> None:
     """評估翻譯檔案"""
-    evaluator = TranslationEvaluator()
+    evaluator = TranslationEvaluator(glossary_file)
     
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -319,22 +406,157 @@ def evaluate_translation_file(file_path: str) -> None:
         safe_print(f"❌ 評估失敗: {e}")
 
 
+def evaluate_file_row(evaluator: TranslationEvaluator, file_path: str) -> Dict:
+    """評估一個檔案並返回結果表的一列（讀取或評估失敗時記錄在 error 欄位）"""
+    row = {field: None for field in RESULT_FIELDS}
+    row["file"] = str(file_path)
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            results = evaluator.evaluate_translation(f.read())
+    except (OSError, UnicodeDecodeError) as e:
+        row["error"] = str(e)
+        return row
+        
+    for field in ("overall_score", "format_score", "content_score", "terminology_score"):
+        row[field] = round(results[field], 1)
+    row.update(grade=evaluator.grade(results["overall_score"]), terms_found=results["terms_found"],
+               issue_count=len(results["issues"]), issues=results["issues"],
+               suggestions=results["suggestions"])
+    return row
+
+
+# 工作行程中的評估器（每個行程只編譯一次術語自動機）
+_worker_evaluator = None
+
+
+def _init_worker(glossary_file: Optional[str]) -> None:
+    global _worker_evaluator
+    _worker_evaluator = TranslationEvaluator(glossary_file)
+
+
+def _evaluate_in_worker(file_path: str) -> Dict:
+    return evaluate_file_row(_worker_evaluator, file_path)
+
+
+def collect_translation_files(paths: Iterable[str], pattern: str = "*.md") -> List[Path]:
+    """展開檔案與目錄（目錄遞迴搜尋，略過評估報告）"""
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.extend(sorted(file for file in path.glob(f"**/{pattern}")
+                                if not file.name.endswith('.evaluation.md')))
+        elif path.exists():
+            files.append(path)
+    return files
+
+
+def write_results(rows: List[Dict], output: Path) -> None:
+    """寫出結果表：.csv 為 CSV（問題與建議以「；」串接），其他副檔名為 JSONL"""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.suffix.lower() == '.csv':
+        with open(output, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({key: "；".join(value) if isinstance(value, list) else value
+                                 for key, value in row.items()})
+    else:
+        with open(output, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def evaluate_files(files: Iterable[str], glossary_file: str = None, workers: int = None,
+                   output: Path = DEFAULT_RESULTS_FILE) -> List[Dict]:
+    """
+    批量評估翻譯檔案
+    
+    檔案數足夠時以多個行程並行評估（術語掃描與解析都是純 Python 的運算），
+    結果依輸入順序寫出結果表並顯示摘要
+    
+    Args:
+        files: 翻譯檔案
+        glossary_file: 外部詞彙表
+        workers: 工作行程數，預設為 CPU 數
+        output: 結果表路徑（.jsonl 或 .csv），None 表示不寫出
+        
+    Returns:
+        每個檔案的結果列
+    """
+    files = [str(file) for file in files]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    
+    if workers <= 1 or len(files) < MIN_PARALLEL_FILES:
+        evaluator = TranslationEvaluator(glossary_file)
+        rows = [evaluate_file_row(evaluator, file) for file in files]
+    else:
+        chunksize = max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(glossary_file,)) as executor:
+            rows = list(executor.map(_evaluate_in_worker, files, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    
+    if output is not None:
+        write_results(rows, Path(output))
+    print_summary(rows, elapsed, output)
+    return rows
+
+
+def print_summary(rows: List[Dict], elapsed: float, output: Path = None) -> None:
+    """顯示批量評估摘要"""
+    scored = [row for row in rows if row["error"] is None]
+    safe_print(f"📊 已評估 {len(scored)}/{len(rows)} 個檔案，耗時 {elapsed:.2f} 秒")
+    if scored:
+        average = sum(row["overall_score"] for row in scored) / len(scored)
+        safe_print(f"🎯 平均總分: {average:.1f}/100")
+        grades = {}
+        for row in scored:
+            grades[row["grade"]] = grades.get(row["grade"], 0) + 1
+        for grade, count in sorted(grades.items(), key=lambda item: -item[1]):
+            safe_print(f"   {grade}: {count} 個")
+        lowest = sorted(scored, key=lambda row: row["overall_score"])[:5]
+        safe_print("📉 分數最低的檔案:")
+        for row in lowest:
+            safe_print(f"   {row['overall_score']:5.1f}  {row['file']}")
+    failed = len(rows) - len(scored)
+    if failed:
+        safe_print(f"❌ 無法評估: {failed} 個")
+    if output is not None:
+        safe_print(f"📋 結果表: {output}")
+
+
 def main():
     """主函數"""
     import argparse
     
     parser = argparse.ArgumentParser(description="AI翻譯品質評估工具")
-    parser.add_argument("file", help="要評估的翻譯檔案路徑")
+    parser.add_argument("paths", nargs='+', help="要評估的翻譯檔案或目錄")
+    parser.add_argument("--glossary", "-g", help="外部詞彙表（JSON 或 CSV/TSV）")
+    parser.add_argument("--output", "-o", help=f"批量評估結果表（.jsonl 或 .csv，預設 {DEFAULT_RESULTS_FILE}）")
+    parser.add_argument("--workers", "-w", type=int, help="批量評估的工作行程數（預設為 CPU 數）")
+    parser.add_argument("--pattern", "-p", default="*.md", help="目錄中的檔案匹配模式")
     
     args = parser.parse_args()
     
-    if not Path(args.file).exists():
-        safe_print(f"❌ 檔案不存在: {args.file}")
+    missing = [path for path in args.paths if not Path(path).exists()]
+    if missing:
+        safe_print(f"❌ 檔案不存在: {', '.join(missing)}")
         return 1
         
-    evaluate_translation_file(args.file)
+    # 單一檔案且未指定結果表時產生評估報告
+    if len(args.paths) == 1 and Path(args.paths[0]).is_file() and not args.output:
+        evaluate_translation_file(args.paths[0], args.glossary)
+        return 0
+        
+    files = collect_translation_files(args.paths, args.pattern)
+    if not files:
+        safe_print("❌ 未找到翻譯檔案")
+        return 1
+    evaluate_files(files, args.glossary, args.workers, Path(args.output) if args.output else DEFAULT_RESULTS_FILE)
     return 0
 
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())
@@ -1,22 +1,45 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-from core.unicode_handler import safe_print
 生成式AI經文翻譯工具
 
 基於AI翻譯指導規範，使用生成式AI進行道教經文翻譯
-支援進度追蹤和品質評估
+支援進度追蹤和品質評估；批量翻譯以工作池並行執行，中斷後可續傳
+長章節依段落分段並行翻譯後依序重組，短章節合併成一個請求；
+提示詞的固定前綴每個會話只組裝一次；翻譯記憶中已有的段落直接取用，只翻譯新段落；
+模型輸出邊生成邊寫入模板並保存檢查點，請求中斷後重試時從最後完成的段落續譯
 """
 
+import os
 import re
 import json
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Generator
+from typing import Dict, List, Optional, Generator, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from datetime import datetime
-import subprocess
 import sys
 
+# 添加父目錄到路徑以便導入核心模組
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.progress_scanner import TRANSLATION_PLACEHOLDER
+from core.ai_backends import BACKENDS, CLIBackend, create_backend, streaming_summary
+from core.prompt_builder import PromptBuilder
+from core.rate_limiter import RateLimiter
+from core.text_chunker import join_chunks, pack_items, split_chunks
+from core.text_stats import estimate_tokens
+from core.translation_memory import TranslationMemory, split_segments
+from core.translation_jobs import PermanentJobError, TranslationJobQueue, TranslationWorkerPool
+from core.translation_stream import (PARTIAL_NOTICE, PartialTemplateWriter, TranslationCheckpoints,
+                                     TranslationStream)
+from core.unicode_handler import safe_print
+
+# 「## 翻譯」模板的譯文部分：到下一個二級標題或分隔線為止
+PLAIN_TRANSLATION_SECTION = re.compile(r'^(##[ \t]*翻譯[ \t]*\n)(.*?)(?=^##\s|^---[ \t]*$|\Z)',
+                                       re.DOTALL | re.MULTILINE)
+
 # 設置標準輸出編碼為 UTF-8
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = open(sys.stdout.fileno(), mode='w', encoding='utf-8', buffering=1)
@@ -25,11 +48,86 @@ if sys.stdout.encoding != 'utf-8':
 class AITranslator:
     """生成式AI翻譯器"""
     
-    def __init__(self):
-        """初始化翻譯器"""
+    def __init__(self, config: Dict = None):
+        """
+        初始化翻譯器
+
+        Args:
+            config: AI 翻譯設定（設定檔的 ai 區段），未指定的項目使用預設值
+        """
+        self.config = self._load_default_config()
+        self.config.update(config or {})
         self.load_translation_guidelines()
         self.load_terminology()
+        self.prompt_builder = PromptBuilder(self.guidelines, self.terminology)
+        self.memory = self._create_translation_memory()
+        self.checkpoints = self._create_checkpoints()
         self.progress_callback = None
+        self.rate_limiter = self._create_rate_limiter()
+        self.backend = create_backend(self.config)
+        fallback = self.config.get("fallback_backend")
+        self.fallback_backend = create_backend(self.config, fallback) if fallback else None
+        self.worker_pool = None
+        self.chunk_executor = None
+        self._stats_lock = threading.Lock()
+        self.request_stats = {"requests": 0, "failed": 0, "prompt_tokens": 0, "seconds": 0.0}
+        
+    def _load_default_config(self) -> Dict:
+        """載入預設配置"""
+        return {
+            "workers": 4,
+            "requests_per_minute": 30,
+            "max_retries": 3,
+            "retry_backoff": 5,
+            "timeout": 120,
+            "resume": True,
+            "job_queue_dir": "data/cache/translation_jobs",
+            "max_chunk_tokens": 2000,
+            "chunk_workers": 4,
+            "pack_threshold": 300,
+            "pack_max_tokens": 1500,
+            "pack_max_files": 6,
+            "translation_memory": True,
+            "memory_file": "data/cache/translation_memory.json",
+            "memory_min_chars": 8,
+            "memory_fuzzy_threshold": 0.6,
+            "memory_references": 3,
+            "backend": "gemini-cli",
+            "fallback_backend": None,
+            "backend_command": ["gemini", "chat"],
+            "backend_url": None,
+            "backend_model": "",
+            "stub_latency": 0.5,
+            "stub_jitter": 0.0,
+            "stub_error_rate": 0.0,
+            "stub_seed": 0,
+            "stub_token_latency": 0.0,
+            "persistent_command": None,
+            "persistent_backend": "genai",
+            "persistent_processes": None,
+            "health_check_interval": 60,
+            "streaming": True,
+            "checkpoint_dir": "data/cache/translation_checkpoints",
+            "partial_write_interval": 2.0,
+            "glossary_file": None
+        }
+        
+    def _create_rate_limiter(self) -> RateLimiter:
+        """創建所有工作執行緒共用的模型請求速率限制器（requests_per_minute 為 0 或 None 表示不限速）"""
+        per_minute = self.config.get("requests_per_minute") or 0
+        return RateLimiter(per_minute / 60, burst=self.config.get("workers", 1))
+        
+    def _create_translation_memory(self) -> Optional[TranslationMemory]:
+        """創建翻譯記憶（translation_memory 關閉時返回 None）"""
+        if not self.config.get("translation_memory", True):
+            return None
+        return TranslationMemory(self.config.get("memory_file"), self.config.get("memory_min_chars", 8))
+        
+    def _create_checkpoints(self) -> Optional[TranslationCheckpoints]:
+        """創建串流翻譯的檢查點（streaming 關閉時返回 None）"""
+        if not self.config.get("streaming", True):
+            return None
+        return TranslationCheckpoints(self.config.get("checkpoint_dir"))
         
     def load_translation_guidelines(self):
         """載入AI翻譯指導規範"""
@@ -89,107 +187,304 @@ class AITranslator:
         }
         
     def create_translation_prompt(self, original_text: str, context: Dict = None) -> str:
-        """創建翻譯提示詞"""
-        context = context or {}
+        """創建翻譯提示詞（固定前綴 + 上下文、出現的術語、翻譯記憶參考與原文）"""
+        return self.prompt_builder.build(original_text, context, self._memory_references(original_text))
         
-        prompt = f"""你是一位專業的道教經典翻譯專家。請根據以下指導規範翻譯古文：
-
-{self.guidelines}
-
-## 翻譯任務
-請將以下道教經典原文翻譯成現代中文：
-
-### 原文
-```
-{original_text.strip()}
-```
-
-### 上下文資訊
-- 經典名稱：{context.get('book_title', '未知')}
-- 章節：{context.get('chapter_title', '未知')}
-- 作者：{context.get('author', '未知')}
-
-## 翻譯要求
-1. 提供準確、流暢的現代中文翻譯
-2. 保持道教術語的專業性和一致性
-3. 必要時提供重要詞彙的註解
-4. 說明翻譯過程中的重點和難點
-
-## 輸出格式
-請按以下格式輸出：
-
-### 現代中文翻譯
-[翻譯內容]
-
-### 重要詞彙註解
-- **[術語1]**: [解釋]
-- **[術語2]**: [解釋]
-
-### 翻譯要點
-- [翻譯要點1]
-- [翻譯要點2]
-
-請開始翻譯："""
-        
-        return prompt
+    def _memory_references(self, text: str) -> List[Tuple[str, str]]:
+        """翻譯記憶中與原文各段相似的段落 [(原文, 譯文)]，最多 memory_references 筆"""
+        limit = self.config.get("memory_references", 3)
+        if self.memory is None or not limit:
+            return []
+            
+        threshold = self.config.get("memory_fuzzy_threshold", 0.6)
+        matches = {}
+        for segment in split_segments(text):
+            for score, source, translation in self.memory.search(segment, threshold, 1):
+                if score > matches.get(source, (0,))[0]:
+                    matches[source] = (score, translation)
+        best = sorted(matches.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [(source, translation) for source, (_, translation) in best]
         
     def translate_with_gemini(self, prompt: str) -> Optional[str]:
         """使用Gemini CLI進行翻譯"""
+        return CLIBackend(self.config.get("backend_command"), self.config.get("timeout", 120)).translate(prompt)
+        
+    def translate_with_openai(self, prompt: str) -> Optional[str]:
+        """使用OpenAI相容API進行翻譯（需設定 backend_url）"""
+        if not self.config.get("backend_url"):
+            safe_print("💡 OpenAI翻譯功能需要設定 backend_url")
+            return None
+        backend = create_backend(self.config, "http")
         try:
-            # 使用gemini命令行工具
-            cmd = ['gemini', 'chat']
-            
-            result = subprocess.run(
-                cmd,
-                input=prompt, # 將 prompt 通過標準輸入傳遞
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                timeout=120  # 2分鐘超時
-            )
-            
-            if result.returncode == 0:
-                safe_print(f"DEBUG: Gemini CLI Stdout: {result.stdout.strip()}")
-                return result.stdout.strip()
-            else:
-                safe_print(f"DEBUG: Gemini CLI Stderr: {result.stderr.strip()}")
-                safe_print(f"❌ Gemini CLI錯誤: {result.stderr}")
+            return backend.translate(prompt)
+        finally:
+            backend.close()
+            
+    def _request(self, prompt: str, stream: TranslationStream = None) -> Optional[str]:
+        """送出一個模型請求並記錄提示詞大小與耗時（指定 stream 時輸出片段陸續交給 stream）"""
+        # 所有工作執行緒共用請求額度
+        self.rate_limiter.acquire()
+        start = time.monotonic()
+        
+        on_delta = stream.feed if stream is not None else None
+        result = self.backend.translate_stream(prompt, on_delta)
+        
+        # 如果失敗，可以嘗試備用後端
+        if not result and self.fallback_backend is not None:
+            if stream is not None:
+                stream.reset()
+            # 備用後端的請求同樣計入請求額度
+            self.rate_limiter.acquire()
+            result = self.fallback_backend.translate_stream(prompt, on_delta)
+            
+        with self._stats_lock:
+            self.request_stats["requests"] += 1
+            self.request_stats["failed"] += 0 if result else 1
+            self.request_stats["prompt_tokens"] += self.prompt_builder.count_tokens(prompt)
+            self.request_stats["seconds"] += time.monotonic() - start
+        return result
+        
+    def _get_chunk_executor(self) -> ThreadPoolExecutor:
+        """長章節分段翻譯共用的執行緒池（所有工作共用，避免巢狀建立過多執行緒）"""
+        with self._stats_lock:
+            if self.chunk_executor is None:
+                self.chunk_executor = ThreadPoolExecutor(max_workers=max(1, self.config.get("chunk_workers", 4)))
+            return self.chunk_executor
+            
+    def translate_text(self, original_text: str, context: Dict = None, origin: str = "",
+                       writer: PartialTemplateWriter = None) -> Optional[str]:
+        """
+        翻譯文本
+        
+        先以翻譯記憶取用完全相符的段落，只翻譯其餘段落；
+        超過 max_chunk_tokens 時分段並行翻譯，再依原順序重組
+        
+        Args:
+            original_text: 原文
+            context: 上下文資訊
+            origin: 記錄在翻譯記憶中的來源（檔案路徑）
+            writer: 接收部分譯文的模板寫入器，None 表示完成後才寫入
+        """
+        segments = split_segments(original_text)
+        if self.memory is None:
+            if writer is not None:
+                writer.layout([None] * len(segments))
+            return self._translate_chunks(original_text, context, writer)
+            
+        hits = [self.memory.lookup(segment) for segment in segments]
+        novel = [segment for segment, hit in zip(segments, hits) if hit is None]
+        
+        if not novel:
+            safe_print(f"🧠 翻譯記憶命中全部 {len(segments)} 段，不需送出請求")
+            return self.merge_translation_results(["\n\n".join(hits)])
+            
+        if len(novel) < len(segments):
+            safe_print(f"🧠 翻譯記憶命中 {len(segments) - len(novel)}/{len(segments)} 段，只翻譯其餘 {len(novel)} 段")
+            if writer is not None:
+                writer.layout(hits)
+            result = self._translate_chunks("\n\n".join(novel), context, writer)
+            if not result:
                 return None
                 
-        except subprocess.TimeoutExpired:
-            safe_print("❌ 翻譯超時")
-            return None
-        except FileNotFoundError:
-            safe_print("❌ 未找到gemini命令，請確認已安裝Gemini CLI")
-            return None
-        except Exception as e:
-            safe_print(f"❌ 翻譯失敗: {e}")
-            return None
+            parts = self.parse_translation_result(result)
+            translated = split_segments(parts.get('translation') or result)
+            if len(translated) == len(novel):
+                for segment, translation in zip(novel, translated):
+                    self.memory.add(segment, translation, origin)
+                remaining = iter(translated)
+                merged = "\n\n".join(hit if hit is not None else next(remaining) for hit in hits)
+                return self._format_result(merged, parts.get('annotations', '').splitlines(),
+                                           parts.get('points', '').splitlines())
+                
+            # 譯文段落無法與原文對應時無法插回記憶中的段落，改為翻譯全文
+            safe_print("⚠️ 譯文段落數與原文不符，改為翻譯全文")
             
-    def translate_with_openai(self, prompt: str) -> Optional[str]:
-        """使用OpenAI API進行翻譯（備用方案）"""
-        try:
-            # 這裡可以添加OpenAI API調用
-            # 需要安裝openai庫並設置API密鑰
-            safe_print("💡 OpenAI翻譯功能需要額外配置")
-            return None
-        except Exception as e:
-            safe_print(f"❌ OpenAI翻譯失敗: {e}")
+        if writer is not None:
+            writer.layout([None] * len(segments))
+        result = self._translate_chunks(original_text, context, writer)
+        if result:
+            parts = self.parse_translation_result(result)
+            self.memory.add_aligned(original_text, parts.get('translation') or result, origin)
+        return result
+        
+    def _translate_chunks(self, original_text: str, context: Dict = None,
+                          writer: PartialTemplateWriter = None) -> Optional[str]:
+        """送出翻譯請求（超過 max_chunk_tokens 時分段並行翻譯，再依原順序重組）"""
+        planned = split_chunks(original_text, self.config.get("max_chunk_tokens", 2000))
+        separators = [separator for separator, _ in planned]
+        chunks = [chunk for _, chunk in planned]
+        
+        if len(chunks) <= 1:
+            result = self._translate_piece(original_text, context, writer)
+            if result and self.checkpoints is not None:
+                self.checkpoints.clear(original_text)
+            return result
+            
+        context = context or {}
+        safe_print(f"✂️  原文分為 {len(chunks)} 段並行翻譯")
+        # 每段的譯文依序填入寫入器中連續的位置；段落中途切開時該段落的位置分成多個部分
+        offsets = [0]
+        parts = []
+        for separator, chunk in planned:
+            count = len(split_segments(chunk))
+            offsets.append(offsets[-1] + count)
+            if separator == "" and parts:
+                parts[-1] += 1
+                count -= 1
+            parts.extend([1] * count)
+        if writer is not None:
+            for index in reversed(range(len(parts))):
+                if parts[index] > 1:
+                    writer.subdivide(index, parts[index])
+        futures = [self._get_chunk_executor().submit(self._translate_piece, chunk,
+                                                     dict(context, part=f"第 {i}/{len(chunks)} 段"),
+                                                     writer, offset)
+                   for i, (chunk, offset) in enumerate(zip(chunks, offsets), 1)]
+        results = [future.result() for future in futures]
+        
+        if not all(results):
+            safe_print(f"❌ {sum(1 for result in results if not result)}/{len(chunks)} 段翻譯失敗")
             return None
             
-    def translate_text(self, original_text: str, context: Dict = None) -> Optional[str]:
-        """翻譯文本"""
-        prompt = self.create_translation_prompt(original_text, context)
+        if self.checkpoints is not None:
+            for chunk in chunks:
+                self.checkpoints.clear(chunk)
+        return self.merge_translation_results(results, separators)
+        
+    def _translate_piece(self, text: str, context: Dict = None, writer: PartialTemplateWriter = None,
+                         offset: int = 0) -> Optional[str]:
+        """
+        以一個請求翻譯一段原文
         
-        # 首先嘗試Gemini CLI
-        result = self.translate_with_gemini(prompt)
+        串流時每完成一個譯文段落就更新檢查點與模板，成功後在檢查點保存完整結果
+        （由 _translate_chunks 在全部分段成功後刪除）；檢查點中已有完成的段落時
+        （上次請求中途失敗），只送出其餘段落，再與已完成的段落合併
         
-        # 如果失敗，可以嘗試其他AI服務
+        Args:
+            offset: 此段原文在寫入器待翻譯位置中的起點
+        """
+        if self.checkpoints is None:
+            return self._request(self.create_translation_prompt(text, context))
+            
+        segments = split_segments(text)
+        done, saved = self.checkpoints.load(text) if self.config.get("resume", True) else ([], None)
+        done = done[:len(segments)]
+        if done and writer is not None:
+            writer.fill(offset, done)
+        if saved:
+            return saved
+        if done:
+            safe_print(f"↩️  從檢查點續譯：已完成 {len(done)}/{len(segments)} 段")
+        if segments and len(done) == len(segments):
+            return self._format_result("\n\n".join(done), [], [])
+            
+        def on_paragraphs(paragraphs: List[str]) -> None:
+            completed = done + paragraphs
+            self.checkpoints.save(text, completed)
+            if writer is not None:
+                writer.fill(offset, completed)
+                
+        if done:
+            context = dict(context or {})
+            resumed = f"續譯第 {len(done) + 1}–{len(segments)} 段"
+            context['part'] = f"{context['part']}，{resumed}" if context.get('part') else resumed
+            prompt = self.create_translation_prompt("\n\n".join(segments[len(done):]), context)
+        else:
+            prompt = self.create_translation_prompt(text, context)
+            
+        result = self._request(prompt, TranslationStream(on_paragraphs))
         if not result:
-            result = self.translate_with_openai(prompt)
+            return None
             
+        if done:
+            parts = self.parse_translation_result(result)
+            translation = parts.get('translation') or result.strip()
+            result = self._format_result("\n\n".join(done + [translation]),
+                                         parts.get('annotations', '').splitlines(),
+                                         parts.get('points', '').splitlines())
+        parts = self.parse_translation_result(result)
+        self.checkpoints.save(text, split_segments(parts.get('translation') or result), result)
         return result
         
+    def merge_translation_results(self, results: List[str], separators: List[str] = None) -> str:
+        """
+        依序合併各段的翻譯結果（註解與要點去除重複項目）
+        
+        Args:
+            separators: split_chunks 記錄的各段之間的分隔，None 表示各段都是完整段落
+        """
+        translations = []
+        annotations = []
+        points = []
+        
+        for result in results:
+            parts = self.parse_translation_result(result)
+            # 未依格式輸出時整段視為譯文
+            translations.append(parts.get('translation') or result.strip())
+            for key, collected in (('annotations', annotations), ('points', points)):
+                for line in parts.get(key, '').splitlines():
+                    if line.strip() and line not in collected:
+                        collected.append(line)
+                        
+        if separators is None:
+            separators = [""] + ["\n\n"] * (len(translations) - 1)
+        return self._format_result(join_chunks(translations, separators), annotations, points)
+        
+    @staticmethod
+    def _format_result(translation: str, annotations: List[str], points: List[str]) -> str:
+        """組成與模型輸出相同格式的翻譯結果"""
+        annotations = [line for line in annotations if line.strip()]
+        points = [line for line in points if line.strip()]
+        merged = "### 現代中文翻譯\n" + translation + "\n"
+        if annotations:
+            merged += "\n### 重要詞彙註解\n" + "\n".join(annotations) + "\n"
+        if points:
+            merged += "\n### 翻譯要點\n" + "\n".join(points) + "\n"
+        return merged
+        
+    def _prepare_file(self, file_path: Path) -> Optional[Tuple[str, Dict, str]]:
+        """讀取翻譯模板並返回 (模板內容, 上下文, 原文)，沒有原文時返回 None"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+            
+        # 解析檔案資訊
+        context = self.extract_file_context(file_path, content)
+        
+        # 提取原文內容
+        original_text = self.extract_original_text(content)
+        if not original_text:
+            return None
+        return content, context, original_text
+        
+    def _create_partial_writer(self, target: Path, content: str) -> Optional[PartialTemplateWriter]:
+        """建立將部分譯文寫入模板的寫入器（未啟用串流時返回 None）"""
+        if self.checkpoints is None:
+            return None
+            
+        def write(paragraphs: List[str], total: int) -> None:
+            # 說明與佔位文字緊接在標題之後，進度掃描只檢查標題後固定大小的區段
+            translation = "\n\n".join([PARTIAL_NOTICE.format(done=len(paragraphs), total=total),
+                                        TRANSLATION_PLACEHOLDER] + paragraphs)
+            updated = self.update_translation_template(content, self._format_result(translation, [], []),
+                                                       completed=False)
+            temp_file = target.with_suffix('.partial.tmp')
+            try:
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    f.write(updated)
+                os.replace(temp_file, target)
+            except OSError as e:
+                safe_print(f"⚠️ 無法寫入部分譯文: {e}")
+                
+        return PartialTemplateWriter(write, self.config.get("partial_write_interval", 2.0))
+        
+    def _write_translation(self, file_path: Path, content: str, translation_result: str,
+                           output_path: str = None) -> None:
+        """更新翻譯模板並儲存"""
+        updated_content = self.update_translation_template(content, translation_result)
+        
+        with open(output_path or file_path, 'w', encoding='utf-8') as f:
+            f.write(updated_content)
+            
     def translate_file(self, file_path: str, output_path: str = None) -> bool:
         """翻譯單個檔案"""
         file_path = Path(file_path)
@@ -199,47 +494,194 @@ class AITranslator:
             return False
             
         try:
-            # 讀取原文
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # 解析檔案資訊
-            context = self.extract_file_context(file_path, content)
-            
-            # 提取原文內容
-            original_text = self.extract_original_text(content)
+            prepared = self._prepare_file(file_path)
             
-            if not original_text:
+            if not prepared:
                 safe_print(f"❌ 無法提取原文內容: {file_path}")
                 return False
                 
+            content, context, original_text = prepared
             safe_print(f"📝 開始翻譯: {file_path.name}")
-            safe_print(f"📊 原文字數: {len(original_text)} 字")
+            safe_print(f"📊 原文字數: {len(original_text)} 字（約 {estimate_tokens(original_text)} tokens）")
             
-            # 進行翻譯
-            translation_result = self.translate_text(original_text, context)
+            # 進行翻譯（串流時邊生成邊寫入模板）
+            writer = self._create_partial_writer(Path(output_path or file_path), content)
+            translation_result = self.translate_text(original_text, context, origin=str(file_path), writer=writer)
             
             if not translation_result:
+                if writer is not None:
+                    writer.flush()
                 safe_print(f"❌ 翻譯失敗: {file_path}")
                 return False
                 
-            # 更新翻譯模板
-            updated_content = self.update_translation_template(content, translation_result)
-            
-            # 儲存結果
-            if not output_path:
-                output_path = file_path
-                
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
+            # 更新翻譯模板並儲存結果
+            self._write_translation(file_path, content, translation_result, output_path)
                 
-            safe_print(f"✅ 翻譯完成: {output_path}")
+            safe_print(f"✅ 翻譯完成: {output_path or file_path}")
+            
+            # 批量翻譯時由 translate_files 在結束時統一儲存翻譯記憶
+            if self.memory is not None and self.worker_pool is None:
+                self.memory.save()
             return True
             
         except Exception as e:
             safe_print(f"❌ 翻譯檔案失敗: {e}")
             return False
             
+    def translate_packed_files(self, paths: List[Path]) -> Dict[Path, bool]:
+        """
+        將多個短章節合併成一個請求翻譯
+        
+        Returns:
+            {檔案: 是否成功}；回應無法依分隔標記拆分時全部視為失敗
+        """
+        results = {}
+        prepared = []
+        for path in paths:
+            data = self._prepare_file(path)
+            if not data:
+                continue
+            content, _, original = data
+            # 翻譯記憶可完整提供譯文的章節不需送出
+            hits = [self.memory.lookup(segment) for segment in split_segments(original)] if self.memory else [None]
+            if all(hit is not None for hit in hits):
+                safe_print(f"🧠 翻譯記憶命中全部段落: {path.name}")
+                self._write_translation(path, content, self.merge_translation_results(["\n\n".join(hits)]))
+                results[path] = True
+            else:
+                prepared.append((path, data))
+        if not prepared:
+            return results
+            
+        safe_print(f"📦 合併翻譯 {len(prepared)} 個短章節: " + "、".join(path.name for path, _ in prepared))
+        prompt = self.prompt_builder.build_packed([(original, context) for _, (_, context, original) in prepared])
+        response = self._request(prompt)
+        parts = self.prompt_builder.split_packed_response(response, len(prepared)) if response else None
+        
+        if parts is None:
+            safe_print("⚠️ 合併翻譯的回應無法拆分，改為逐檔翻譯")
+            return results
+            
+        for (path, (content, _, original)), part in zip(prepared, parts):
+            translation = self.parse_translation_result(part).get('translation')
+            if not translation:
+                results[path] = False
+                continue
+            if self.memory is not None:
+                self.memory.add_aligned(original, translation, str(path))
+            self._write_translation(path, content, part)
+            safe_print(f"✅ 翻譯完成: {path}")
+            results[path] = True
+        return results
+        
+    def _plan_batches(self, paths: List[Path]) -> List[List[Path]]:
+        """將同一目錄中相鄰的短章節分組合併翻譯，其餘章節各自成組"""
+        threshold = self.config.get("pack_threshold", 300)
+        max_files = self.config.get("pack_max_files", 6)
+        if not threshold or max_files <= 1:
+            return [[path] for path in paths]
+            
+        groups = []
+        run = []
+        run_sizes = []
+        
+        def flush_run():
+            for group in pack_items(run_sizes, self.config.get("pack_max_tokens", 1500), max_files):
+                groups.append([run[index] for index in group])
+            run.clear()
+            run_sizes.clear()
+            
+        for path in paths:
+            try:
+                prepared = self._prepare_file(path)
+            except OSError:
+                prepared = None
+            tokens = estimate_tokens(prepared[2]) if prepared else None
+            
+            if tokens is None or tokens > threshold:
+                flush_run()
+                groups.append([path])
+                continue
+            if run and run[-1].parent != path.parent:
+                flush_run()
+            run.append(path)
+            run_sizes.append(tokens)
+        flush_run()
+        return groups
+        
+    def print_request_summary(self) -> None:
+        """顯示本會話的請求統計"""
+        with self._stats_lock:
+            stats = dict(self.request_stats)
+        if not stats["requests"]:
+            return
+        prompt_stats = self.prompt_builder.stats
+        safe_print(f"📈 請求數: {stats['requests']}（失敗 {stats['failed']}）")
+        safe_print(f"📏 平均提示詞: 約 {stats['prompt_tokens'] // stats['requests']} tokens"
+                   f"（固定前綴 {self.prompt_builder.prefix_tokens} tokens，"
+                   f"可變部分平均 {prompt_stats['variable_tokens'] // max(1, prompt_stats['prompts'])} tokens）")
+        safe_print(f"⏱️  平均請求耗時: {stats['seconds'] / stats['requests']:.1f} 秒")
+        streaming = streaming_summary(self.backend.stats)
+        if streaming["first_token"]["mean"]:
+            speed = (f"，生成速度約 {streaming['tokens_per_second']:.0f} tokens/秒"
+                     if streaming["tokens_per_second"] else "")
+            safe_print(f"⚡ 首個輸出平均 {streaming['first_token']['mean']:.1f} 秒"
+                       f"（P95 {streaming['first_token']['p95']:.1f} 秒）{speed}")
+        
+    def print_memory_summary(self) -> None:
+        """顯示本會話的翻譯記憶命中統計"""
+        if self.memory is None or not self.memory.stats["lookups"]:
+            return
+        stats = self.memory.stats
+        safe_print(f"🧠 翻譯記憶: 命中 {stats['hits']}/{stats['lookups']} 段"
+                   f"（{stats['hits'] / stats['lookups'] * 100:.1f}%，省下約 {stats['hit_chars']} 字的翻譯），"
+                   f"記憶共 {len(self.memory)} 段")
+        
+    def extract_translation_text(self, content: str) -> str:
+        """從翻譯檔案中提取已完成的譯文（仍是模板時返回空字串）"""
+        match = re.search(r'##\s*📝\s*現代中文翻譯[^\n]*\n(.*?)(?=\n##\s|\Z)', content, re.DOTALL)
+        if not match:
+            match = re.search(r'^##\s*翻譯\s*\n(.*?)(?=\n##\s|\n---[ \t]*\n|\Z)', content, re.DOTALL | re.MULTILINE)
+        if not match:
+            return ""
+            
+        # 移除模板附加在譯文後的說明
+        text = re.split(r'\n原文字數[：:]', match.group(1))[0].strip()
+        if not text or TRANSLATION_PLACEHOLDER in text or "[請在此處填入翻譯內容]" in text:
+            return ""
+        return text
+        
+    def build_translation_memory(self, directory: str, pattern: str = "*.md") -> int:
+        """
+        以目錄中已完成的翻譯建立翻譯記憶（原文與譯文段數相同的檔案才能對齊收錄）
+        
+        Returns:
+            int: 收錄的段落數
+        """
+        if self.memory is None:
+            safe_print("❌ 翻譯記憶已在設定中關閉")
+            return 0
+            
+        added = 0
+        aligned_files = 0
+        files = sorted(Path(directory).glob(f"**/{pattern}"))
+        for file_path in files:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            original = self.extract_original_text(content)
+            translation = self.extract_translation_text(content)
+            if original and translation:
+                count = self.memory.add_aligned(original, translation, str(file_path))
+                added += count
+                aligned_files += 1 if count else 0
+                
+        self.memory.save()
+        safe_print(f"🧠 已從 {aligned_files}/{len(files)} 個檔案收錄 {added} 段，翻譯記憶共 {len(self.memory)} 段")
+        return added
+        
     def extract_file_context(self, file_path: Path, content: str) -> Dict:
         """從檔案路徑和內容提取上下文資訊"""
         context = {}
@@ -286,8 +728,17 @@ class AITranslator:
             
         return ""
         
-    def update_translation_template(self, original_content: str, translation_result: str) -> str:
-        """更新翻譯模板"""
+    def update_translation_template(self, original_content: str, translation_result: str,
+                                    completed: bool = True) -> str:
+        """
+        更新翻譯模板
+        
+        支援「## 📝 現代中文翻譯」模板（template_generator）與「## 翻譯」模板
+        （爬蟲與 easy_cli 產生，譯文處為佔位文字）
+        
+        Args:
+            completed: 是否為完整譯文；部分譯文只更新翻譯部分，不更新翻譯狀態
+        """
         # 解析翻譯結果
         translation_parts = self.parse_translation_result(translation_result)
         
@@ -297,6 +748,14 @@ class AITranslator:
             replacement = f"\\1\n{translation_parts['translation']}\n"
             original_content = re.sub(pattern, replacement, original_content, flags=re.DOTALL)
             
+            # 「## 翻譯」模板：取代到下一個標題或分隔線為止（含原文字數等模板說明）
+            original_content = PLAIN_TRANSLATION_SECTION.sub(
+                lambda match: f"{match.group(1)}\n{translation_parts['translation']}\n\n",
+                original_content, count=1)
+            
+        if not completed:
+            return original_content
+            
         # 更新詞彙註解
         if translation_parts.get('annotations'):
             pattern = r'(##\s*📚\s*重要詞彙註解.*?\n)(.*?)(?=##|\Z)'
@@ -309,10 +768,19 @@ class AITranslator:
             replacement = f"\\1\n{translation_parts['points']}\n"
             original_content = re.sub(pattern, replacement, original_content, flags=re.DOTALL)
             
+        # 「## 翻譯」模板的重要詞彙與翻譯要點（仍為待補充時才填入）
+        for label, key in (('重要詞彙', 'annotations'), ('翻譯要點', 'points')):
+            if translation_parts.get(key):
+                pattern = re.compile(rf'(\*\*{label}[：:]\*\*[ \t]*\n)(?:-\s*\[待補充[^\n]*\n?)+')
+                original_content = pattern.sub(
+                    lambda match: f"{match.group(1)}{translation_parts[key]}\n",
+                    original_content, count=1)
+                
         # 更新翻譯狀態
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         status_pattern = r'(\*\*翻譯狀態\*\*[：:]\s*)🔄 待翻譯'
         original_content = re.sub(status_pattern, f'\\1✅ 已完成 ({now})', original_content)
+        original_content = original_content.replace("*翻譯方式：自動生成模板*", f"*翻譯方式：AI翻譯 ({now})*")
         
         return original_content
         
@@ -345,40 +813,98 @@ class AITranslator:
             safe_print(f"❌ 目錄不存在: {directory}")
             return {"success": 0, "failed": 0, "files": []}
             
-        files = list(directory.glob(f"**/{pattern}"))
+        files = sorted(directory.glob(f"**/{pattern}"))
         
         if not files:
             safe_print(f"❌ 未找到符合條件的檔案: {directory}/{pattern}")
             return {"success": 0, "failed": 0, "files": []}
             
-        safe_print(f"🚀 開始批量翻譯: {len(files)} 個檔案")
+        return self.translate_files(files, batch_key=f"{directory.resolve()}|{pattern}")
         
-        results = {"success": 0, "failed": 0, "files": []}
+    def translate_files(self, files: List[Path], batch_key: str = None) -> Dict:
+        """
+        以工作池並行翻譯多個檔案
         
-        for i, file_path in enumerate(files, 1):
-            safe_print(f"\n📝 進度: {i}/{len(files)} - {file_path.name}")
+        工作狀態保存在佇列檔中；以相同 batch_key 重新執行時略過已完成的檔案，
+        全部成功後刪除佇列檔
+        
+        Args:
+            files: 要翻譯的檔案
+            batch_key: 批次識別字串，預設由檔案列表推算
             
-            if self.progress_callback:
-                self.progress_callback(i, len(files), file_path.name)
-                
-            success = self.translate_file(file_path)
+        Returns:
+            {"success": 成功數, "failed": 失敗數, "skipped": 續傳時略過的數量, "files": [...]}
+        """
+        files = [Path(file) for file in files]
+        if batch_key is None:
+            batch_key = "\n".join(sorted(str(file.resolve()) for file in files))
             
-            if success:
-                results["success"] += 1
-                results["files"].append({"file": str(file_path), "status": "success"})
-            else:
-                results["failed"] += 1
-                results["files"].append({"file": str(file_path), "status": "failed"})
-                
-            # 避免API限制，添加延遲
-            time.sleep(2)
+        queue = TranslationJobQueue(batch_key, self.config.get("job_queue_dir"))
+        if not self.config.get("resume", True):
+            queue.data["jobs"] = {}
+        queue.add_jobs(files)
+        
+        skipped = queue.count(TranslationJobQueue.STATUS_SUCCESS)
+        workers = self.config.get("workers", 4)
+        safe_print(f"🚀 開始批量翻譯: {len(files)} 個檔案（{workers} 個並行工作）")
+        if skipped:
+            safe_print(f"⏭️  續傳：略過先前已完成的 {skipped} 個檔案")
+            
+        self.worker_pool = TranslationWorkerPool(
+            self._translate_job,
+            max_workers=workers,
+            max_retries=self.config.get("max_retries", 3),
+            retry_backoff=self.config.get("retry_backoff", 5),
+            progress_callback=self.progress_callback,
+            batch_worker=self.translate_packed_files
+        )
+        try:
+            counts = self.worker_pool.run(queue, plan=self._plan_batches)
+        except KeyboardInterrupt:
+            safe_print("\n⏸️  批量翻譯已中斷，重新執行相同的批次即可續傳")
+            raise
+        finally:
+            self.worker_pool = None
+            if self.memory is not None:
+                self.memory.save()
+            
+        results = {
+            "success": counts["success"] + counts["skipped"],
+            "failed": counts["failed"],
+            "skipped": counts["skipped"],
+            "files": queue.results()
+        }
+        if results["failed"] == 0 and not queue.pending():
+            queue.discard()
             
         safe_print(f"\n🎉 批量翻譯完成!")
         safe_print(f"✅ 成功: {results['success']} 個")
         safe_print(f"❌ 失敗: {results['failed']} 個")
+        self.print_request_summary()
+        self.print_memory_summary()
         
         return results
         
+    def _translate_job(self, file_path: Path) -> bool:
+        """工作池執行的單一工作：沒有原文的檔案不重試"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except OSError as e:
+            raise PermanentJobError(f"無法讀取檔案: {e}")
+        if not self.extract_original_text(content):
+            raise PermanentJobError("無法提取原文內容")
+        return self.translate_file(file_path)
+        
+    def close(self):
+        """釋放後端連線與分段翻譯執行緒"""
+        self.backend.close()
+        if self.fallback_backend is not None:
+            self.fallback_backend.close()
+        if self.chunk_executor is not None:
+            self.chunk_executor.shutdown(wait=True)
+            self.chunk_executor = None
+            
     def set_progress_callback(self, callback):
         """設置進度回調函數"""
         self.progress_callback = callback
@@ -392,28 +918,34 @@ class TranslationProgressTracker:
         self.current_file = ""
         self.total_files = 0
         self.completed_files = 0
+        self.initial_completed = 0
         
-    def start_tracking(self, total_files: int):
-        """開始追蹤"""
+    def start_tracking(self, total_files: int, completed_files: int = 0):
+        """開始追蹤（completed_files 為續傳時已完成的數量，不計入速度估算）"""
         self.start_time = time.time()
         self.total_files = total_files
-        self.completed_files = 0
+        self.completed_files = completed_files
+        self.initial_completed = completed_files
         
     def update_progress(self, completed: int, total: int, current_file: str):
         """更新進度"""
+        if self.start_time is None:
+            self.start_tracking(total, completed)
+            
         self.completed_files = completed
         self.current_file = current_file
         
         if self.start_time:
             elapsed = time.time() - self.start_time
-            if completed > 0:
-                avg_time = elapsed / completed
+            done_this_run = completed - self.initial_completed
+            if done_this_run > 0:
+                avg_time = elapsed / done_this_run
                 remaining = (total - completed) * avg_time
                 eta = time.strftime('%H:%M:%S', time.gmtime(remaining))
             else:
                 eta = "計算中..."
                 
-            progress_percent = (completed / total) * 100
+            progress_percent = (completed / total) * 100 if total > 0 else 0
             
             safe_print(f"📊 進度: {completed}/{total} ({progress_percent:.1f}%)")
             safe_print(f"⏱️  已用時間: {time.strftime('%H:%M:%S', time.gmtime(elapsed))}")
@@ -431,15 +963,42 @@ def main():
     parser.add_argument("--directory", "-d", help="批量翻譯目錄")
     parser.add_argument("--pattern", "-p", default="*.md", help="檔案匹配模式")
     parser.add_argument("--output", "-o", help="輸出檔案路徑")
+    parser.add_argument("--workers", "-w", type=int, help="批量翻譯的並行工作數")
+    parser.add_argument("--rpm", type=float, help="每分鐘最多送出的模型請求數（0 表示不限速）")
+    parser.add_argument("--no-resume", action="store_true", help="忽略上次中斷的批次，重新翻譯所有檔案")
+    parser.add_argument("--build-memory", metavar="DIR", help="以目錄中已完成的翻譯建立翻譯記憶")
+    parser.add_argument("--no-memory", action="store_true", help="不使用翻譯記憶")
+    parser.add_argument("--backend", choices=BACKENDS, help="AI 模型後端")
+    parser.add_argument("--backend-url", help="http 後端的 chat/completions 網址")
+    parser.add_argument("--no-stream", action="store_true", help="完成後才寫入譯文（不保存部分譯文與檢查點）")
     
     args = parser.parse_args()
     
-    translator = AITranslator()
+    config = {}
+    if args.workers:
+        config["workers"] = args.workers
+    if args.rpm is not None:
+        config["requests_per_minute"] = args.rpm
+    if args.no_resume:
+        config["resume"] = False
+    if args.no_memory:
+        config["translation_memory"] = False
+    if args.backend:
+        config["backend"] = args.backend
+    if args.backend_url:
+        config["backend_url"] = args.backend_url
+    if args.no_stream:
+        config["streaming"] = False
+    translator = AITranslator(config)
     tracker = TranslationProgressTracker()
     
     # 設置進度回調
     translator.set_progress_callback(tracker.update_progress)
     
+    if args.build_memory:
+        translator.build_translation_memory(args.build_memory)
+        return 0
+        
     if args.file:
         # 翻譯單個檔案
         success = translator.translate_file(args.file, args.output)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI 常駐工作行程
+
+由 core/ai_process_pool.py 啟動，在整個批次中保持執行：模型用戶端只建立與認證一次，
+之後以標準輸入輸出上的 JSON Lines 協定逐一處理提示詞（協定見 core/ai_process_pool.py）。
+
+設定由環境變數 AI_WORKER_CONFIG（JSON）傳入，backend 指定行程內使用的後端（預設 genai）。
+標準輸出專供協定使用，其他訊息一律寫到標準錯誤。
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.ai_backends import create_backend
+from core.ai_process_pool import WORKER_CONFIG_ENV
+
+
+def main():
+    """主函數"""
+    protocol = sys.stdout
+    # 後端與 safe_print 的輸出不可混入協定
+    sys.stdout = sys.stderr
+
+    config = json.loads(os.environ.get(WORKER_CONFIG_ENV) or "{}")
+    config.setdefault("backend", "genai")
+    try:
+        backend = create_backend(config)
+    except (ImportError, ValueError) as e:
+        print(f"❌ 無法建立後端: {e}", file=sys.stderr)
+        return 1
+
+    def send(message: dict) -> None:
+        protocol.write(json.dumps(message, ensure_ascii=False) + "\n")
+        protocol.flush()
+
+    try:
+        for line in sys.stdin:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            kind = message.get("type")
+            request_id = message.get("id")
+
+            if kind == "ping":
+                send({"type": "pong", "id": request_id})
+            elif kind == "request":
+                result = backend.translate_stream(
+                    message.get("prompt", ""),
+                    lambda text: send({"type": "delta", "id": request_id, "text": text})
+                )
+                if result is None:
+                    send({"type": "error", "id": request_id, "message": f"{backend.name} 後端沒有返回結果"})
+                else:
+                    send({"type": "result", "id": request_id, "text": result})
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI 翻譯後端效能比較工具
+
+以實際的翻譯模板複本離線執行完整的批量翻譯流程（工作池、分段、合併、模板更新），
+比較各後端的延遲、首個輸出的等待時間、生成速度、吞吐量與重試次數：
+- stub: 行程內模擬模型
+- http: 透過本機模擬伺服器（tools/ai_stub_server.py）的 chat/completions API，
+        或以 --url 指定的實際端點
+- persistent: 常駐工作行程池，行程內使用模擬模型（測量行程間通訊的額外成本）
+- gemini-cli: 實際呼叫 Gemini CLI（需要已安裝並登入，預設不執行）
+
+使用方式：
+    python tools/benchmark_ai_backends.py
+    python tools/benchmark_ai_backends.py --files 100 --workers 8 --error-rate 0.1
+    python tools/benchmark_ai_backends.py --backends stub http --latency 1.0 --jitter 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+
+from core.ai_backends import BACKENDS, StubModel, latency_summary, streaming_summary
+from core.unicode_handler import safe_print
+from ai_stub_server import start_stub_server
+from ai_translator import AITranslator
+
+
+DEFAULT_SOURCE_DIR = Path("docs/translations")
+
+
+def collect_templates(source_dir: Path, limit: int) -> List[Path]:
+    """挑選含有可提取原文的翻譯模板"""
+    extractor = AITranslator({"translation_memory": False})
+    templates = []
+    for path in sorted(source_dir.glob("**/*.md")):
+        try:
+            content = path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            continue
+        if extractor.extract_original_text(content):
+            templates.append(path)
+            if len(templates) >= limit:
+                break
+    return templates
+
+
+def run_backend(backend: str, templates: List[Path], source_dir: Path, config: Dict) -> Dict:
+    """在暫存目錄中以指定後端批量翻譯模板複本"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = Path(temp_dir) / "translations"
+        for template in templates:
+            target = work_dir / template.relative_to(source_dir)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(template, target)
+
+        translator = AITranslator(dict(config, backend=backend,
+                                       job_queue_dir=str(Path(temp_dir) / "jobs"),
+                                       checkpoint_dir=str(Path(temp_dir) / "checkpoints")))
+        start = time.perf_counter()
+        # 逐檔輸出與效能無關，只保留統計
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = translator.batch_translate_directory(str(work_dir))
+        elapsed = time.perf_counter() - start
+        translator.close()
+
+    stats = translator.backend.stats
+    return {
+        "elapsed": elapsed,
+        "success": results["success"],
+        "failed": results["failed"],
+        "requests": stats["requests"],
+        "errors": stats["errors"],
+        "retries": sum(max(0, item.get("attempts", 1) - 1) for item in results["files"]),
+        "latency": latency_summary(stats),
+        "streaming": streaming_summary(stats)
+    }
+
+
+def main():
+    """主函數"""
+    parser = argparse.ArgumentParser(description="AI 翻譯後端效能比較")
+    parser.add_argument('--source-dir', type=Path, default=DEFAULT_SOURCE_DIR, help='翻譯模板目錄')
+    parser.add_argument('--files', type=int, default=40, help='使用的模板數量')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=['stub', 'http'],
+                        help='要比較的後端')
+    parser.add_argument('--url', help='http 後端使用的實際端點（未指定時啟動本機模擬伺服器）')
+    parser.add_argument('--workers', type=int, default=4, help='並行工作數')
+    parser.add_argument('--latency', type=float, default=0.3, help='模擬模型的基本延遲秒數')
+    parser.add_argument('--jitter', type=float, default=0.2, help='模擬模型隨機增加的最大延遲秒數')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='模擬模型的錯誤率')
+    parser.add_argument('--seed', type=int, default=0, help='隨機種子')
+    parser.add_argument('--token-latency', type=float, default=0.0005, help='模擬模型每個輸出字元的延遲秒數')
+    args = parser.parse_args()
+
+    templates = collect_templates(args.source_dir, args.files)
+    if not templates:
+        safe_print(f"❌ 找不到含原文的翻譯模板: {args.source_dir}")
+        return 1
+
+    config = {
+        "workers": args.workers,
+        "chunk_workers": args.workers,
+        "requests_per_minute": 0,
+        "retry_backoff": 0.1,
+        "translation_memory": False,
+        "stub_latency": args.latency,
+        "stub_jitter": args.jitter,
+        "stub_error_rate": args.error_rate,
+        "stub_seed": args.seed,
+        "stub_token_latency": args.token_latency,
+        "persistent_backend": "stub"
+    }
+
+    server = None
+    if 'http' in args.backends:
+        if args.url:
+            config["backend_url"] = args.url
+        else:
+            server = start_stub_server(StubModel(args.latency, args.jitter, args.error_rate, args.seed,
+                                                 args.token_latency))
+            config["backend_url"] = server.url
+
+    safe_print(f"📄 模板: {len(templates)} 個，並行工作: {args.workers}")
+    safe_print(f"🧪 模擬模型: 延遲 {args.latency}s（+{args.jitter}s），錯誤率 {args.error_rate:.0%}")
+    safe_print("-" * 98)
+    safe_print(f"   {'後端':<10} {'耗時':>8} {'檔案/秒':>8} {'請求':>6} {'錯誤':>6} {'重試':>6} "
+               f"{'平均':>8} {'P50':>8} {'P95':>8} {'首個輸出':>8} {'tok/s':>8}")
+
+    try:
+        for backend in args.backends:
+            result = run_backend(backend, templates, args.source_dir, config)
+            latency = result["latency"]
+            streaming = result["streaming"]
+            throughput = result["success"] / result["elapsed"] if result["elapsed"] > 0 else 0
+            speed = f"{streaming['tokens_per_second']:8.0f}" if streaming["tokens_per_second"] else f"{'-':>8}"
+            safe_print(f"   {backend:<10} {result['elapsed']:7.2f}s {throughput:8.2f} "
+                       f"{result['requests']:>6} {result['errors']:>6} {result['retries']:>6} "
+                       f"{latency['mean'] * 1000:6.0f}ms {latency['p50'] * 1000:6.0f}ms "
+                       f"{latency['p95'] * 1000:6.0f}ms {streaming['first_token']['mean'] * 1000:6.0f}ms {speed}"
+                       + (f"   ⚠️  失敗 {result['failed']} 個" if result['failed'] else ""))
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
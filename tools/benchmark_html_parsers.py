@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML解析後端效能比較工具
+
+以實際保存的師典古籍頁面為基礎，比較各解析後端處理一個章節頁面
+（正文提取 + 目錄提取）所需的時間：
+- html.parser: BeautifulSoup + Python 內建解析器
+- lxml:        BeautifulSoup + lxml
+- lxml-xpath:  lxml.html + XPath 快速路徑（不建立 BeautifulSoup）
+
+使用方式：
+    python tools/benchmark_html_parsers.py
+    python tools/benchmark_html_parsers.py --page my_page.html --rounds 50
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.unicode_handler import safe_print
+from core.html_backend import (PARSER_BACKENDS, lxml_available, make_soup, parse_tree,
+                               chapter_paragraphs, catalog_items)
+
+
+DEFAULT_PAGE = Path("tools/debug_DZ0336_structure.html")
+DEFAULT_TEXT_DIR = Path("docs/source_texts/太上洞玄灵宝业报因缘经_DZ0336/原文")
+
+
+def build_chapter_page(page_path: Path, text_dir: Path) -> str:
+    """
+    以保存的頁面為骨架（保留目錄、腳本等實際大小），
+    在 main.read-layout-main 中插入 article.chapter-reader 正文
+    """
+    html = page_path.read_text(encoding='utf-8')
+
+    paragraphs = []
+    if text_dir.exists():
+        for text_file in sorted(text_dir.glob("*.txt"))[:3]:
+            for line in text_file.read_text(encoding='utf-8').splitlines():
+                line = line.strip().lstrip('#').strip()
+                if line:
+                    paragraphs.append(line)
+    if not paragraphs:
+        paragraphs = ["道可道，非常道；名可名，非常名。"] * 200
+
+    article = '<article class="chapter-reader"><h1>章節標題測試</h1>' + \
+        ''.join(f'<p>{p}</p>' for p in paragraphs) + '</article>'
+
+    return re.sub(r'(<main[^>]*read-layout-main[^>]*>)', r'\1' + article, html, count=1)
+
+
+def parse_with_soup(html: str, backend: str):
+    """BeautifulSoup 路徑：與 TranslationEngine / ShidianCrawler 相同的提取邏輯"""
+    soup = make_soup(html, backend)
+
+    parts = []
+    main_content = soup.find('main', class_='read-layout-main')
+    if main_content:
+        article = main_content.find('article', class_='chapter-reader')
+        if article:
+            for element in article.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p']):
+                text = element.get_text().strip()
+                if text and len(text) > 3:
+                    parts.append(text)
+
+    catalog = []
+    for item in soup.find_all('div', class_='semi-tree-option'):
+        a_tag = item.find('a')
+        catalog.append((a_tag.text.strip(), a_tag.get('href', '')) if a_tag else None)
+
+    return parts, catalog
+
+
+def parse_with_xpath(html: str):
+    """XPath 快速路徑"""
+    tree = parse_tree(html)
+    return chapter_paragraphs(tree) or [], catalog_items(tree)
+
+
+def benchmark(html: str, backend: str, rounds: int) -> float:
+    """返回每個頁面的平均解析時間（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if backend == 'lxml-xpath':
+            parse_with_xpath(html)
+        else:
+            parse_with_soup(html, backend)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    """主函數"""
+    parser = argparse.ArgumentParser(description="HTML解析後端效能比較")
+    parser.add_argument('--page', type=Path, default=DEFAULT_PAGE, help='作為骨架的已保存頁面')
+    parser.add_argument('--text-dir', type=Path, default=DEFAULT_TEXT_DIR, help='填入正文的原文目錄')
+    parser.add_argument('--rounds', type=int, default=20, help='每個後端重複次數')
+    args = parser.parse_args()
+
+    if not args.page.exists():
+        safe_print(f"❌ 找不到頁面: {args.page}")
+        return 1
+
+    if not lxml_available():
+        safe_print("❌ 未安裝 lxml，無法比較 lxml 後端")
+        return 1
+
+    html = build_chapter_page(args.page, args.text_dir)
+
+    # 先確認各後端提取結果一致
+    reference = parse_with_soup(html, 'html.parser')
+    safe_print(f"📄 測試頁面: {len(html):,} 字元，正文 {len(reference[0])} 段，目錄 {len(reference[1])} 項")
+    for backend in PARSER_BACKENDS:
+        result = parse_with_xpath(html) if backend == 'lxml-xpath' else parse_with_soup(html, backend)
+        status = "✅" if result == reference else "⚠️  結果不同"
+        safe_print(f"   {backend:<12} {status}")
+
+    safe_print(f"\n⏱️  每個章節頁面平均解析時間（{args.rounds} 次）")
+    safe_print("-" * 40)
+    baseline = None
+    for backend in PARSER_BACKENDS:
+        elapsed = benchmark(html, backend, args.rounds)
+        baseline = baseline or elapsed
+        safe_print(f"   {backend:<12} {elapsed:8.2f} ms   ({baseline / elapsed:.1f}x)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
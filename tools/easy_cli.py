@@ -27,6 +27,7 @@ def safe_print(*args, **kwargs):
 
 import json
 import sys
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -35,6 +36,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from core import TranslationEngine, get_tracker
 from core.ai_engine import AIEngine
+from core.corpus_index import get_corpus_index
+from core.text_stats import count_cjk
 from core.unicode_handler import safe_print, get_unicode_handler
 
 
@@ -48,6 +51,7 @@ class EasyCLI:
         self.engine = TranslationEngine(self.config.get("translation", {}))
         self.tracker = get_tracker()
         self.ai_engine = AIEngine(self.config.get("ai", {}))
+        self.index = get_corpus_index()
         
     def _load_config(self) -> Dict:
         """載入配置"""
@@ -69,10 +73,62 @@ class EasyCLI:
                 "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
                 "request_delay": 2,
                 "max_retries": 3,
-                "timeout": 10
+                "timeout": 10,
+                "max_workers": 1,
+                "requests_per_second": None,
+                "burst": 1,
+                "http_backend": "requests",
+                "per_host_limit": 4,
+                "http_cache": True,
+                "cache_dir": "data/cache/http",
+                "cache_ttl": 86400,
+                "cache_max_mb": 500,
+                "offline": False,
+                "html_parser": "lxml",
+                "probe_workers": 8,
+                "probe_requests_per_second": None,
+                "probe_miss_limit": 5,
+                "resume": True,
+                "manifest_dir": "data/manifests",
+                "incremental": True
             },
             "ai": {
-                "api_key": "YOUR_AI_API_KEY_HERE"
+                "api_key": "YOUR_AI_API_KEY_HERE",
+                "workers": 4,
+                "requests_per_minute": 30,
+                "max_retries": 3,
+                "retry_backoff": 5,
+                "timeout": 120,
+                "resume": True,
+                "job_queue_dir": "data/cache/translation_jobs",
+                "max_chunk_tokens": 2000,
+                "chunk_workers": 4,
+                "pack_threshold": 300,
+                "pack_max_tokens": 1500,
+                "pack_max_files": 6,
+                "translation_memory": True,
+                "memory_file": "data/cache/translation_memory.json",
+                "memory_min_chars": 8,
+                "memory_fuzzy_threshold": 0.6,
+                "memory_references": 3,
+                "backend": "gemini-cli",
+                "fallback_backend": None,
+                "backend_command": ["gemini", "chat"],
+                "backend_url": None,
+                "backend_model": "",
+                "stub_latency": 0.5,
+                "stub_jitter": 0.0,
+                "stub_error_rate": 0.0,
+                "stub_seed": 0,
+                "stub_token_latency": 0.0,
+                "persistent_command": None,
+                "persistent_backend": "genai",
+                "persistent_processes": None,
+                "health_check_interval": 60,
+                "streaming": True,
+                "checkpoint_dir": "data/cache/translation_checkpoints",
+                "partial_write_interval": 2.0,
+                "glossary_file": None
             },
             "books": [],
             "output": {
@@ -147,13 +203,13 @@ class EasyCLI:
             safe_print(f"   📊 狀態: {status_text}")
             safe_print()
             
-    def translate_book(self, url: str) -> bool:
-        """翻譯單本書籍"""
+    def translate_book(self, url: str, **options) -> bool:
+        """翻譯單本書籍（options 傳給 TranslationEngine.translate_book，如 resume）"""
         safe_print("🚀 啟動道教經典翻譯系統")
         safe_print("=" * 50)
         
         try:
-            success = self.engine.translate_book(url)
+            success = self.engine.translate_book(url, **options)
             
             if success:
                 safe_print("\n🎉 翻譯完成！")
@@ -450,7 +506,9 @@ class EasyCLI:
             safe_print("💡 請先使用選項 2 或 3 爬取一些書籍")
             return
         
-        book_dirs = [d for d in docs_dir.iterdir() if d.is_dir() and (d / "原文").exists()]
+        # 只需要檔案列表，依目錄 mtime 判斷即可
+        self.index.refresh(check_files=False)
+        book_dirs = [docs_dir / book_id for book_id in self.index.book_ids(with_source=True)]
         
         if not book_dirs:
             safe_print("❌ 沒有找到包含原文的書籍目錄")
@@ -459,8 +517,8 @@ class EasyCLI:
         
         safe_print(f"📚 找到 {len(book_dirs)} 本書籍：")
         for i, book_dir in enumerate(book_dirs, 1):
-            source_files = list((book_dir / "原文").glob("*.txt"))
-            safe_print(f"{i}. {book_dir.name} ({len(source_files)} 個原文檔案)")
+            source_count = len(self.index.source_chapters(book_dir.name))
+            safe_print(f"{i}. {book_dir.name} ({source_count} 個原文檔案)")
         
         safe_print("\n請選擇操作：")
         safe_print("1. 為所有書籍生成翻譯模板")
@@ -503,23 +561,20 @@ class EasyCLI:
         """為指定書籍目錄生成翻譯模板"""
         from pathlib import Path
         
-        source_dir = book_dir / "原文"
         translation_dir = Path("docs/translations") / book_dir.name
         translation_dir.mkdir(parents=True, exist_ok=True)
         
-        source_files = list(source_dir.glob("*.txt"))
         generated_count = 0
         
-        for source_file in source_files:
-            translation_filename = f"{source_file.stem}.md"
-            translation_file_path = translation_dir / translation_filename
+        for chapter in self.index.source_chapters(book_dir.name):
+            translation_filename = f"{chapter['stem']}.md"
             
             # 如果翻譯模板已存在，跳過
-            if translation_file_path.exists():
+            if chapter.get("translation"):
                 safe_print(f"  ⏭️  跳過已存在的模板: {translation_filename}")
                 continue
             
-            self._create_single_translation_template(source_file, translation_dir)
+            self._create_single_translation_template(Path(chapter["source"]), translation_dir)
             safe_print(f"  ✅ 已生成: {translation_filename}")
             generated_count += 1
         
@@ -556,7 +611,6 @@ class EasyCLI:
     def _generate_templates_for_existing_sources(self) -> None:
         """為現有的原文檔案生成翻譯模板"""
         from pathlib import Path
-        from datetime import datetime
         
         # 查找所有原文目錄
         docs_dir = Path("docs/source_texts")
@@ -564,18 +618,17 @@ class EasyCLI:
             safe_print("❌ 沒有找到原文目錄")
             return
         
-        for book_dir in docs_dir.iterdir():
-            if book_dir.is_dir():
-                source_dir = book_dir / "原文"
-                if source_dir.exists():
-                    # 建立對應的翻譯目錄
-                    translation_dir = Path("docs/translations") / book_dir.name
-                    translation_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # 為每個原文檔案生成翻譯模板
-                    source_files = list(source_dir.glob("*.txt"))
-                    for source_file in source_files:
-                        self._create_single_translation_template(source_file, translation_dir)
+        self.index.refresh(check_files=False)
+        
+        for book_id in self.index.book_ids(with_source=True):
+            # 建立對應的翻譯目錄
+            translation_dir = Path("docs/translations") / book_id
+            translation_dir.mkdir(parents=True, exist_ok=True)
+            
+            # 為每個尚無翻譯檔案的原文生成翻譯模板
+            for chapter in self.index.source_chapters(book_id):
+                if not chapter.get("translation"):
+                    self._create_single_translation_template(Path(chapter["source"]), translation_dir)
     
     def _get_book_title_from_url(self, url: str) -> str:
         """從URL獲取書籍標題"""
@@ -657,7 +710,7 @@ class EasyCLI:
 ---
 
 **翻譯說明：**
-- 原文字數：{len(content)} 字
+- 原文字數：{count_cjk(content)} 字
 - 建議使用AI翻譯工具或人工翻譯
 - 保持原文意思，使用現代中文表達
 - 保留重要的古代術語，必要時添加註解
@@ -696,7 +749,7 @@ class EasyCLI:
             safe_print("💡 支援使用Gemini CLI進行專業道教經文翻譯")
             safe_print()
             
-            translator = AITranslator()
+            translator = AITranslator(self.config.get("ai", {}))
             tracker = TranslationProgressTracker()
             translator.set_progress_callback(tracker.update_progress)
             
@@ -822,23 +875,9 @@ class EasyCLI:
             safe_print("❌ 翻譯目錄不存在")
             return
             
-        untranslated_files = []
-        
-        for book_dir in translations_dir.iterdir():
-            if not book_dir.is_dir():
-                continue
-                
-            for file in book_dir.glob("*.md"):
-                try:
-                    with open(file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                    # 檢查是否已翻譯
-                    if "🔄 待翻譯" in content or "[請在此處填入翻譯內容]" in content:
-                        untranslated_files.append(file)
-                        
-                except Exception:
-                    continue
+        # 檢查是否已翻譯（只重新讀取有變更的檔案）
+        self.index.refresh()
+        untranslated_files = self.index.template_files(("🔄 待翻譯", "[請在此處填入翻譯內容]"))
                     
         if not untranslated_files:
             safe_print("✅ 所有檔案都已翻譯完成")
@@ -855,22 +894,14 @@ class EasyCLI:
         if translate_all in ['', 'y', 'yes', '是']:
             from ai_translator import AITranslator, TranslationProgressTracker
             
-            translator = AITranslator()
+            translator = AITranslator(self.config.get("ai", {}))
             tracker = TranslationProgressTracker()
             translator.set_progress_callback(tracker.update_progress)
             
             tracker.start_tracking(len(untranslated_files))
             
-            success_count = 0
-            for i, file in enumerate(untranslated_files, 1):
-                safe_print(f"\n📝 進度: {i}/{len(untranslated_files)} - {file.name}")
-                tracker.update_progress(i, len(untranslated_files), file.name)
-                
-                if translator.translate_file(str(file)):
-                    success_count += 1
-                    
-            safe_print(f"\n🎉 批量翻譯完成!")
-            safe_print(f"✅ 成功: {success_count}/{len(untranslated_files)} 個")
+            results = translator.translate_files(untranslated_files)
+            safe_print(f"✅ 成功: {results['success']}/{len(untranslated_files)} 個")
             
     def _evaluate_translation_quality(self) -> None:
         """翻譯品質評估"""
@@ -889,22 +920,25 @@ class EasyCLI:
         """評估單個檔案"""
         try:
             from ai_translation_evaluator import evaluate_translation_file
-            evaluate_translation_file(file_path)
+            evaluate_translation_file(file_path, self.config.get("ai", {}).get("glossary_file"))
         except ImportError:
             safe_print("❌ 無法載入翻譯評估器")
         except Exception as e:
             safe_print(f"❌ 評估失敗: {e}")
             
     def _batch_evaluate_translations(self, file_results: List[Dict]) -> None:
-        """批量評估翻譯品質"""
+        """批量評估翻譯品質（並行評估，逐檔分數寫入結果表）"""
         safe_print("\n📊 開始批量品質評估...")
         
-        success_files = [f for f in file_results if f['status'] == 'success']
+        success_files = [f['file'] for f in file_results if f['status'] == 'success']
         
-        for i, file_info in enumerate(success_files, 1):
-            safe_print(f"\n📊 評估進度: {i}/{len(success_files)} - {Path(file_info['file']).name}")
-            self._evaluate_file(file_info['file'])
+        try:
+            from ai_translation_evaluator import evaluate_files
+        except ImportError:
+            safe_print("❌ 無法載入翻譯評估器")
+            return
             
+        evaluate_files(success_files, self.config.get("ai", {}).get("glossary_file"))
         safe_print(f"\n🎉 批量評估完成! 共評估 {len(success_files)} 個檔案")
 
 
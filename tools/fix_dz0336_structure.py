@@ -13,13 +13,20 @@ from core.unicode_handler import safe_print
 但現在的文件只有卷的標題，缺少具體的品的內容。
 """
 
+import argparse
 import requests
 import re
 import json
+import sys
 import time
 from pathlib import Path
 from bs4 import BeautifulSoup
 
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.http_cache import install_cache, set_offline_mode
+from core.text_stats import count_cjk
+
 
 class DZ0336StructureFixer:
     """DZ0336結構修復器"""
@@ -30,6 +37,7 @@ class DZ0336StructureFixer:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        install_cache(self.session)
         
         # 根據meta description定義的預期結構
         self.expected_structure = {
@@ -428,7 +436,7 @@ class DZ0336StructureFixer:
 
 [此處應為現代中文翻譯]
 
-原文字數：{len(content)} 字
+原文字數：{count_cjk(content)} 字
 建議：請使用AI翻譯工具或人工翻譯此段落。
 
 翻譯要點：
@@ -463,6 +471,13 @@ class DZ0336StructureFixer:
 
 def main():
     """主函數"""
+    parser = argparse.ArgumentParser(description="修復 DZ0336 結構")
+    parser.add_argument('--offline', action='store_true', help='只使用HTTP快取，不連線網路')
+    args = parser.parse_args()
+    
+    if args.offline:
+        set_offline_mode(True)
+    
     fixer = DZ0336StructureFixer()
     
     success = fixer.fix_dz0336_structure()
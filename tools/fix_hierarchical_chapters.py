@@ -7,14 +7,20 @@ from core.unicode_handler import safe_print
 專門處理有層級結構的經典，如每卷包含多個品的情況
 """
 
+import argparse
 import requests
 import re
 import json
+import sys
 import time
 from pathlib import Path
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.http_cache import install_cache, set_offline_mode
+
 
 class HierarchicalChapterFixer:
     """層級章節修復器"""
@@ -25,6 +31,7 @@ class HierarchicalChapterFixer:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        install_cache(self.session)
         
     def analyze_hierarchical_structure(self, book_id):
         """分析層級結構"""
@@ -458,6 +465,13 @@ class HierarchicalChapterFixer:
 
 def main():
     """主函數"""
+    parser = argparse.ArgumentParser(description="修復層級章節工具")
+    parser.add_argument('--offline', action='store_true', help='只使用HTTP快取，不連線網路')
+    args = parser.parse_args()
+    
+    if args.offline:
+        set_offline_mode(True)
+    
     fixer = HierarchicalChapterFixer()
     
     # 修復 太上洞玄灵宝业报因缘经_DZ0336
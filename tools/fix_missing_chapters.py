@@ -7,14 +7,20 @@ from core.unicode_handler import safe_print
 專門用於修復 太上洞玄灵宝业报因缘经_DZ0336 等經典中缺失的品（章節）
 """
 
+import argparse
 import requests
 import re
 import json
+import sys
 import time
 from pathlib import Path
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.http_cache import install_cache, set_offline_mode
+
 
 class ChapterFixer:
     """章節修復器"""
@@ -25,6 +31,7 @@ class ChapterFixer:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        install_cache(self.session)
         
     def analyze_book_structure(self, book_id):
         """分析書籍結構，找出所有章節"""
@@ -370,6 +377,13 @@ class ChapterFixer:
 
 def main():
     """主函數"""
+    parser = argparse.ArgumentParser(description="修復缺失章節工具")
+    parser.add_argument('--offline', action='store_true', help='只使用HTTP快取，不連線網路')
+    args = parser.parse_args()
+    
+    if args.offline:
+        set_offline_mode(True)
+    
     fixer = ChapterFixer()
     
     # 修復 太上洞玄灵宝业报因缘经_DZ0336
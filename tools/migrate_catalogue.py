@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+經典目錄儲存後端遷移工具
+
+將 data/tracking/classics.json 匯入 SQLite（classics.db），或將 SQLite 目錄
+匯出回 classics.json。遷移到 SQLite 後，ClassicTracker 會自動改用 classics.db。
+
+使用方式：
+    python tools/migrate_catalogue.py                 # classics.json -> classics.db
+    python tools/migrate_catalogue.py --to json       # classics.db -> classics.json
+    python tools/migrate_catalogue.py --force         # 重新匯入，取代現有的 classics.db
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.unicode_handler import safe_print
+from core.catalogue_store import JsonCatalogueStore, SqliteCatalogueStore
+
+
+def migrate_to_sqlite(data_dir: Path, force: bool = False) -> int:
+    """classics.json -> classics.db"""
+    json_file = data_dir / "classics.json"
+    if not json_file.exists():
+        safe_print(f"❌ 找不到 {json_file}")
+        return 1
+
+    db_exists = (data_dir / "classics.db").exists()
+    store = SqliteCatalogueStore(data_dir)
+    try:
+        if db_exists:
+            if not force:
+                safe_print("⚠️  classics.db 已存在，如需重新匯入請加上 --force")
+                return 1
+            store.import_json(json_file)
+        totals = store.aggregate_totals()
+    finally:
+        store.close()
+
+    safe_print(f"✅ SQLite 目錄: {totals['total_classics']} 部經典、"
+               f"{totals['total_chapters']} 章、{totals['total_characters']:,} 字")
+    return 0
+
+
+def migrate_to_json(data_dir: Path) -> int:
+    """classics.db -> classics.json"""
+    if not (data_dir / "classics.db").exists():
+        safe_print(f"❌ 找不到 {data_dir / 'classics.db'}")
+        return 1
+
+    source = SqliteCatalogueStore(data_dir, import_json=False)
+    target = JsonCatalogueStore(data_dir)
+    try:
+        target.data = source.to_dict()
+        target.save()
+    finally:
+        source.close()
+
+    safe_print(f"✅ 已匯出 {len(target.data['classics'])} 部經典到 {target.tracker_file}")
+    safe_print("💡 如要改回 JSON 後端，請移除或改名 classics.db")
+    return 0
+
+
+def main():
+    """主函數"""
+    parser = argparse.ArgumentParser(description="經典目錄儲存後端遷移")
+    parser.add_argument('--to', choices=['sqlite', 'json'], default='sqlite', help='目標後端')
+    parser.add_argument('--data-dir', type=Path, default=Path("data/tracking"), help='追蹤資料目錄')
+    parser.add_argument('--force', action='store_true', help='classics.db 已存在時重新匯入')
+    args = parser.parse_args()
+
+    if args.to == 'sqlite':
+        return migrate_to_sqlite(args.data_dir, args.force)
+    return migrate_to_json(args.data_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
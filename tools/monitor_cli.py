@@ -1,23 +1,23 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-from core.unicode_handler import safe_print
 道教經典翻譯系統 - 監控命令列介面
 
 整合原有的 tracking_monitor.py 功能，提供統一的監控介面
 """
 
 import json
-import time
+import queue
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 # 添加父目錄到路徑以便導入核心模組
 sys.path.append(str(Path(__file__).parent.parent))
 
 from core import get_tracker, get_file_monitor
+from core.unicode_handler import safe_print
 
 
 class MonitorCLI:
@@ -91,9 +91,6 @@ class MonitorCLI:
             safe_print("暫無經典記錄")
             return
             
-        total_chapters = 0
-        completed_chapters = 0
-        
         for classic_id, classic in classics.items():
             book_title = classic['book_info']['title']
             trans_status = classic.get('translation_status', {})
@@ -102,23 +99,22 @@ class MonitorCLI:
             completed = trans_status.get('completed_chapters', 0)
             percentage = trans_status.get('completion_percentage', 0)
             
-            total_chapters += chapter_count
-            completed_chapters += completed
-            
             # 進度條
             progress_bar = self._create_progress_bar(percentage)
             
             safe_print(f"📚 {book_title}")
             safe_print(f"   {progress_bar} {completed}/{chapter_count} ({percentage}%)")
             
-        # 總體進度
-        overall_percentage = (completed_chapters / total_chapters * 100) if total_chapters > 0 else 0
-        overall_progress_bar = self._create_progress_bar(overall_percentage)
+        # 總體進度（追蹤器的累計統計）
+        progress = self.tracker.get_overall_progress()
+        overall_progress_bar = self._create_progress_bar(progress['completion_percentage'])
         
         safe_print(f"\n🎯 總體進度:")
-        safe_print(f"   {overall_progress_bar} {completed_chapters}/{total_chapters} ({overall_percentage:.1f}%)")
+        safe_print(f"   {overall_progress_bar} {progress['completed_chapters']}/{progress['total_chapters']} "
+                   f"({progress['completion_percentage']:.1f}%)")
         
-    def _create_progress_bar(self, percentage: float, width: int = 20) -> str:
+    @staticmethod
+    def _create_progress_bar(percentage: float, width: int = 20) -> str:
         """創建進度條"""
         filled = int(width * percentage / 100)
         bar = "█" * filled + "░" * (width - filled)
@@ -129,17 +125,7 @@ class MonitorCLI:
         safe_print("\n📊 分類統計")
         safe_print("-" * 30)
         
-        classics = self.tracker.get_all_classics()
-        categories = {}
-        
-        for classic in classics.values():
-            category = classic.get('category', '未分類')
-            if category not in categories:
-                categories[category] = {'count': 0, 'chapters': 0}
-            categories[category]['count'] += 1
-            categories[category]['chapters'] += classic.get('chapter_count', 0)
-            
-        for category, stats in categories.items():
+        for category, stats in self.tracker.get_category_statistics().items():
             safe_print(f"📂 {category}: {stats['count']} 部, {stats['chapters']} 章")
             
     def generate_dashboard(self) -> None:
@@ -158,23 +144,28 @@ class MonitorCLI:
         safe_print("=" * 60)
         
     def watch_mode(self, interval: int = 30) -> None:
-        """監控模式 - 定期更新顯示"""
+        """
+        監控模式 - 即時儀表板
+        
+        檔案變更或追蹤器提交時才更新，並且只重繪有變化的行；
+        interval 秒內沒有事件時只更新時間。追蹤器的讀寫都在儀表板的事件迴圈中進行，
+        監看執行緒只負責排入事件。
+        """
         safe_print("👁️  啟動監控模式 v2.0 (按 Ctrl+C 退出)")
-        safe_print(f"🔄 更新間隔: {interval} 秒")
+        
+        dashboard = LiveDashboard(self.tracker, self.file_monitor)
+        self.file_monitor.add_listener(dashboard.on_file_operations)
+        self.tracker.add_listener(dashboard.on_tracker_commit)
+        self.file_monitor.start_watching()
         
         try:
-            while True:
-                # 清屏（在支援的終端中）
-                import os
-                os.system('cls' if os.name == 'nt' else 'clear')
-                
-                self.generate_dashboard()
-                
-                safe_print(f"\n⏰ 下次更新: {interval} 秒後...")
-                time.sleep(interval)
-                
+            dashboard.run(interval)
         except KeyboardInterrupt:
             safe_print("\n👋 監控模式已退出")
+        finally:
+            self.file_monitor.stop_watching()
+            self.file_monitor.remove_listener(dashboard.on_file_operations)
+            self.tracker.remove_listener(dashboard.on_tracker_commit)
             
     def export_status_json(self) -> Path:
         """匯出狀態為JSON"""
@@ -222,6 +213,186 @@ class MonitorCLI:
         safe_print(f"   📄 狀態檔案: {status_file}")
 
 
+class LiveDashboard:
+    """
+    即時監控儀表板
+    
+    - 每本書的進度在啟動時讀取一次，之後依追蹤器提交的經典ID增量更新
+    - 分類與整體進度來自追蹤器的累計統計，檔案操作統計由 FileMonitor 增量維護
+    - 監聽器只把事件排入佇列；追蹤器的重新載入與翻譯進度更新都在 run 的執行緒中進行，
+      不會與監看執行緒同時修改追蹤器
+    - 畫面分為數個區塊，只重新產生有變化的區塊，並只重繪內容不同的行
+    """
+    
+    REGIONS = ("header", "status", "activity", "progress", "categories", "footer")
+    
+    def __init__(self, tracker, file_monitor, activity_limit: int = 5, output=None):
+        self.tracker = tracker
+        self.file_monitor = file_monitor
+        self.activity_limit = activity_limit
+        self.output = output or sys.stdout
+        self.interactive = hasattr(self.output, "isatty") and self.output.isatty()
+        
+        self.events = queue.Queue()
+        self.region_lines = {}
+        self.screen = []
+        self.dirty = set(self.REGIONS)
+        self.load_books()
+        
+    # ---- 增量狀態 ----
+    
+    def load_books(self) -> None:
+        """完整載入每本書的進度（啟動或目錄被其他程式修改時）"""
+        self.books = {}
+        for classic_id, classic in self.tracker.get_all_classics().items():
+            self._apply_book(classic_id, classic)
+            
+    def _apply_book(self, classic_id: str, classic: Optional[Dict]) -> None:
+        """更新單本書的進度（classic 為 None 表示已刪除）"""
+        if classic is None:
+            self.books.pop(classic_id, None)
+            return
+            
+        status = classic.get("translation_status", {})
+        self.books[classic_id] = {
+            "title": classic["book_info"]["title"],
+            "chapters": status.get("total_chapters", 0),
+            "completed": status.get("completed_chapters", 0),
+            "percentage": status.get("completion_percentage", 0)
+        }
+        
+    # ---- 事件 ----
+    
+    def on_file_operations(self, operations: List[Dict]) -> None:
+        """FileMonitor 監聽器（在監看執行緒中呼叫）"""
+        self.events.put(("files", operations))
+        
+    def on_tracker_commit(self, classic_ids) -> None:
+        """ClassicTracker 監聽器（在提交的執行緒中呼叫）"""
+        self.events.put(("tracker", set(classic_ids)))
+        
+    def handle_event(self, kind: str, payload) -> None:
+        """套用一個事件並標記需要重繪的區塊"""
+        if kind == "files":
+            self.dirty.update(("status", "activity"))
+            # 其他程式新增了原文，追蹤資料可能已被修改
+            if any(op["file_type"] == "source_text" and op["operation"] == "create" for op in payload):
+                self.tracker.load_tracker_data()
+                self.load_books()
+                self.dirty.update(("progress", "categories"))
+            # 增量更新翻譯進度（提交後的追蹤器事件會排入佇列，下一輪再套用）
+            translation_files = [Path(op["file_path"]) for op in payload
+                                 if op["file_type"] == "translation"]
+            if translation_files:
+                self.tracker.refresh_translation_progress(translation_files)
+        elif kind == "tracker":
+            for classic_id in payload:
+                self._apply_book(classic_id, self.tracker.get_classic_by_id(classic_id))
+            self.dirty.update(("status", "progress", "categories"))
+        self.dirty.add("footer")
+        
+    def run(self, interval: float = 30) -> None:
+        """事件迴圈：有事件時合併處理後重繪，閒置 interval 秒時只更新時間"""
+        self.render()
+        while True:
+            try:
+                kind, payload = self.events.get(timeout=interval)
+            except queue.Empty:
+                self.dirty.add("footer")
+            else:
+                self.handle_event(kind, payload)
+                # 合併同時到達的其他事件
+                while True:
+                    try:
+                        kind, payload = self.events.get_nowait()
+                    except queue.Empty:
+                        break
+                    self.handle_event(kind, payload)
+            self.render()
+            
+    # ---- 繪製 ----
+    
+    def _render_region(self, name: str) -> List[str]:
+        if name == "header":
+            return ["=" * 60, "🎛️  經典追蹤系統即時儀表板 v2.0（按 Ctrl+C 退出）", "=" * 60]
+            
+        if name == "status":
+            stats = self.tracker.get_statistics()
+            file_stats = self.file_monitor.get_statistics()
+            lines = [
+                f"📚 經典總數: {stats.get('total_classics', 0)}",
+                f"📖 章節總數: {stats.get('total_chapters', 0)}",
+                f"📝 總字數: {stats.get('total_characters', 0):,}",
+                f"📁 檔案操作總數: {file_stats['total_operations']}"
+            ]
+            for file_type, count in file_stats['file_types'].items():
+                lines.append(f"   {file_type}: {count}")
+            today = datetime.now().strftime('%Y-%m-%d')
+            lines.append(f"📅 今日操作: {file_stats['daily_activity'].get(today, 0)}")
+            return lines
+            
+        if name == "activity":
+            lines = ["", f"🕒 最近 {self.activity_limit} 項活動", "-" * 30]
+            recent = self.file_monitor.get_recent_operations(self.activity_limit)
+            if not recent:
+                lines.append("暫無活動記錄")
+            for op in reversed(recent):
+                timestamp = op['timestamp'][:19].replace('T', ' ')
+                icon = "📝" if op['operation'] == "create" else "🔄"
+                lines.append(f"{icon} {timestamp} - {op['operation']}: {op['file_name']}")
+            return lines
+            
+        if name == "progress":
+            lines = ["", "📈 翻譯進度概覽", "-" * 30]
+            for book in self.books.values():
+                bar = MonitorCLI._create_progress_bar(book["percentage"])
+                lines.append(f"📚 {book['title']}")
+                lines.append(f"   {bar} {book['completed']}/{book['chapters']} ({book['percentage']}%)")
+            progress = self.tracker.get_overall_progress()
+            lines.append(f"🎯 總體進度: {MonitorCLI._create_progress_bar(progress['completion_percentage'])} "
+                         f"{progress['completed_chapters']}/{progress['total_chapters']} "
+                         f"({progress['completion_percentage']:.1f}%)")
+            return lines
+            
+        if name == "categories":
+            lines = ["", "📊 分類統計", "-" * 30]
+            for category, stats in self.tracker.get_category_statistics().items():
+                lines.append(f"📂 {category}: {stats['count']} 部, {stats['chapters']} 章")
+            return lines
+            
+        return ["", f"⏰ 最後更新: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"]
+        
+    def render(self) -> None:
+        """重新產生有變化的區塊，只輸出與上一畫面不同的行"""
+        for name in self.REGIONS:
+            if name in self.dirty or name not in self.region_lines:
+                self.region_lines[name] = self._render_region(name)
+        self.dirty.clear()
+        
+        lines = [line for name in self.REGIONS for line in self.region_lines[name]]
+        
+        if not self.interactive:
+            # 非終端輸出（如重新導向到檔案）時逐次附加完整畫面
+            if lines != self.screen:
+                safe_print("\n".join(lines), file=self.output, flush=True)
+                self.screen = lines
+            return
+            
+        chunks = []
+        if not self.screen:
+            chunks.append("\033[2J")
+        for row, line in enumerate(lines):
+            if row >= len(self.screen) or self.screen[row] != line:
+                # 移到該行行首、寫入並清除行尾
+                chunks.append(f"\033[{row + 1};1H{line}\033[K")
+        for row in range(len(lines), len(self.screen)):
+            chunks.append(f"\033[{row + 1};1H\033[K")
+        chunks.append(f"\033[{len(lines) + 1};1H")
+        
+        self.screen = lines
+        safe_print("".join(chunks), end="", file=self.output, flush=True)
+
+
 def main():
     """主函數"""
     import argparse
@@ -235,11 +406,12 @@ def main():
   python monitor_cli.py dashboard
   python monitor_cli.py watch 10
   python monitor_cli.py activity 20
+  python monitor_cli.py verify
         """
     )
     
     parser.add_argument('command', nargs='?', default='dashboard',
-                       choices=['status', 'dashboard', 'progress', 'activity', 'watch', 'export', 'reports'],
+                       choices=['status', 'dashboard', 'progress', 'activity', 'watch', 'export', 'reports', 'verify'],
                        help='要執行的命令')
     parser.add_argument('param', nargs='?', type=int, help='命令參數（如活動數量或監控間隔）')
     
@@ -263,6 +435,9 @@ def main():
         monitor.export_status_json()
     elif args.command == 'reports':
         monitor.generate_reports()
+    elif args.command == 'verify':
+        if monitor.tracker.verify_aggregates():
+            safe_print("✅ 累計統計與目錄一致")
     else:
         monitor.generate_dashboard()
 
@@ -16,15 +16,26 @@ from typing import Dict, List, Optional
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+from core.unicode_handler import safe_print
+from core.rate_limiter import RateLimiter
+from core.http_cache import install_cache
+from core.chapter_prober import ChapterProber
+
 class NumericSequenceDiscovery:
     """數字序列章節發現器"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, requests_per_second: float = 4):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.cache = install_cache(self.session, pool_maxsize=max(10, max_workers))
         self.base_url = "https://www.shidianguji.com"
+        
+        # 探測與下載標題共用同一個速率限制器
+        self.rate_limiter = RateLimiter(requests_per_second, max_workers)
+        self.prober = ChapterProber(self.session, rate_limiter=self.rate_limiter,
+                                    cache=self.cache, max_workers=max_workers)
     
     def discover_numeric_sub_chapters(self, book_url: str, parent_chapter: Dict) -> List[Dict]:
         """針對數字序列ID發現子章節"""
@@ -74,110 +85,60 @@ class NumericSequenceDiscovery:
     
     def _check_decimal_pattern(self, book_id: str, parent_num: int) -> List[Dict]:
         """檢查小數點模式的子章節"""
-        sub_chapters = []
-        
-        # 嘗試 parent_num.1, parent_num.2, ... parent_num.10
-        for i in range(1, 11):
-            test_id = f"{parent_num}.{i}"
-            chapter_url = f"{self.base_url}/book/{book_id}/chapter/{test_id}"
-            
-            if self._test_chapter_exists(chapter_url):
-                title = self._get_chapter_title(chapter_url)
-                if title:
-                    sub_chapters.append({
-                        'title': title,
-                        'url': chapter_url,
-                        'chapter_id': test_id,
-                        'level': 2,
-                        'parent_id': str(parent_num),
-                        'discovered': True,
-                        'discovery_method': 'numeric_decimal_pattern'
-                    })
-                    safe_print(f"      📄 找到: {test_id} - {title}")
-            else:
-                # 如果連續3個不存在，停止搜索
-                if i > 3 and len(sub_chapters) == 0:
-                    break
-                elif i > len(sub_chapters) + 3:
-                    break
-        
-        return sub_chapters
+        # 嘗試 parent_num.1, parent_num.2, ... parent_num.10，連續3個不存在即停止
+        test_ids = [f"{parent_num}.{i}" for i in range(1, 11)]
+        return self._probe_sub_chapters(book_id, parent_num, test_ids,
+                                        'numeric_decimal_pattern', stop_after=3)
     
     def _check_letter_suffix_pattern(self, book_id: str, parent_num: int) -> List[Dict]:
         """檢查字母後綴模式的子章節"""
-        sub_chapters = []
-        
-        # 嘗試 parent_numa, parent_numb, ... parent_numz
-        for i in range(26):  # a-z
-            letter = chr(ord('a') + i)
-            test_id = f"{parent_num}{letter}"
-            chapter_url = f"{self.base_url}/book/{book_id}/chapter/{test_id}"
-            
-            if self._test_chapter_exists(chapter_url):
-                title = self._get_chapter_title(chapter_url)
-                if title:
-                    sub_chapters.append({
-                        'title': title,
-                        'url': chapter_url,
-                        'chapter_id': test_id,
-                        'level': 2,
-                        'parent_id': str(parent_num),
-                        'discovered': True,
-                        'discovery_method': 'numeric_letter_suffix_pattern'
-                    })
-                    safe_print(f"      📄 找到: {test_id} - {title}")
-            else:
-                # 如果連續5個不存在，停止搜索
-                if i > 5 and len(sub_chapters) == 0:
-                    break
-                elif i > len(sub_chapters) + 5:
-                    break
-        
-        return sub_chapters
+        # 嘗試 parent_numa, parent_numb, ... parent_numz，連續5個不存在即停止
+        test_ids = [f"{parent_num}{chr(ord('a') + i)}" for i in range(26)]
+        return self._probe_sub_chapters(book_id, parent_num, test_ids,
+                                        'numeric_letter_suffix_pattern', stop_after=5)
     
     def _check_range_pattern(self, book_id: str, parent_num: int) -> List[Dict]:
         """檢查範圍模式的子章節"""
-        sub_chapters = []
-        
-        # 嘗試範圍模式，如章節1可能包含101-199
+        # 嘗試範圍模式，如章節1可能包含101-199（限制搜索範圍為20個）
         start_range = parent_num * 100 + 1
-        end_range = start_range + 20  # 限制搜索範圍
+        test_ids = [str(test_num) for test_num in range(start_range, start_range + 20)]
+        return self._probe_sub_chapters(book_id, parent_num, test_ids,
+                                        'numeric_range_pattern', stop_after=5)
+    
+    def _probe_sub_chapters(self, book_id: str, parent_num: int, test_ids: List[str],
+                            method: str, stop_after: int) -> List[Dict]:
+        """並行探測候選子章節ID，只對存在的章節下載頁面提取標題"""
+        urls = {f"{self.base_url}/book/{book_id}/chapter/{test_id}": test_id
+                for test_id in test_ids}
         
-        for test_num in range(start_range, end_range):
-            test_id = str(test_num)
-            chapter_url = f"{self.base_url}/book/{book_id}/chapter/{test_id}"
-            
-            if self._test_chapter_exists(chapter_url):
-                title = self._get_chapter_title(chapter_url)
-                if title:
-                    sub_chapters.append({
-                        'title': title,
-                        'url': chapter_url,
-                        'chapter_id': test_id,
-                        'level': 2,
-                        'parent_id': str(parent_num),
-                        'discovered': True,
-                        'discovery_method': 'numeric_range_pattern'
-                    })
-                    safe_print(f"      📄 找到: {test_id} - {title}")
-            
-            # 限制連續失敗次數
-            if test_num - start_range > 5 and len(sub_chapters) == 0:
-                break
+        hits = self.prober.probe(urls, fetch=self._get_chapter_title, stop_after=stop_after)
+        
+        sub_chapters = []
+        for chapter_url, title in hits:
+            if not title:
+                continue
+            test_id = urls[chapter_url]
+            sub_chapters.append({
+                'title': title,
+                'url': chapter_url,
+                'chapter_id': test_id,
+                'level': 2,
+                'parent_id': str(parent_num),
+                'discovered': True,
+                'discovery_method': method
+            })
+            safe_print(f"      📄 找到: {test_id} - {title}")
         
         return sub_chapters
     
     def _test_chapter_exists(self, chapter_url: str) -> bool:
         """測試章節URL是否存在"""
-        try:
-            response = self.session.head(chapter_url, timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        return self.prober.exists(chapter_url)
     
     def _get_chapter_title(self, chapter_url: str) -> Optional[str]:
         """獲取章節標題"""
         try:
+            self.rate_limiter.acquire()
             response = self.session.get(chapter_url, timeout=10)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
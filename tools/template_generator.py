@@ -1,17 +1,22 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-from core.unicode_handler import safe_print
 智能翻譯模板生成器
 
 自動檢測現有經典並生成翻譯模板
 """
 
 import re
+import sys
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.unicode_handler import safe_print
+from core.corpus_index import get_corpus_index
+
 
 class TemplateGenerator:
     """翻譯模板生成器"""
@@ -20,33 +25,27 @@ class TemplateGenerator:
         """初始化生成器"""
         self.source_dir = Path("docs/source_texts")
         self.translation_dir = Path("docs/translations")
+        self.index = get_corpus_index()
         
     def scan_untranslated_classics(self) -> List[Dict]:
-        """掃描尚未翻譯的經典"""
+        """掃描尚未翻譯的經典（查詢語料索引，不重新讀取未變更的檔案）"""
         untranslated = []
         
         if not self.source_dir.exists():
             safe_print("❌ 原文目錄不存在")
             return untranslated
             
-        for book_folder in self.source_dir.iterdir():
-            if not book_folder.is_dir():
-                continue
-                
-            book_id = book_folder.name
-            original_dir = book_folder / "原文"
+        self.index.refresh()
+        
+        for book_id in self.index.book_ids(with_source=True):
+            book_folder = self.source_dir / book_id
             translation_folder = self.translation_dir / book_id
             
-            if not original_dir.exists():
-                continue
-                
             # 檢查是否已有翻譯
-            has_translation = translation_folder.exists() and any(translation_folder.glob("*.md"))
-            
-            if not has_translation:
+            if not self.index.has_translations(book_id):
                 # 獲取書籍資訊
                 book_info = self._extract_book_info(book_folder)
-                chapters = self._scan_chapters(original_dir)
+                chapters = self._scan_chapters(book_id)
                 
                 untranslated.append({
                     "book_id": book_id,
@@ -90,31 +89,19 @@ class TemplateGenerator:
             "author": author
         }
         
-    def _scan_chapters(self, original_dir: Path) -> List[Dict]:
-        """掃描章節檔案"""
+    def _scan_chapters(self, book_id: str) -> List[Dict]:
+        """列出書籍的章節檔案（字數來自語料索引）"""
         chapters = []
         
-        for file in sorted(original_dir.glob("*.txt")):
-            # 從檔案名稱提取章節資訊
-            match = re.match(r'(\d+)_(.+)\.txt', file.name)
-            if match:
-                number = match.group(1)
-                title = match.group(2)
-                
-                # 讀取內容獲取字數
-                try:
-                    with open(file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        char_count = len([c for c in content if '\u4e00' <= c <= '\u9fff'])
-                except Exception:
-                    char_count = 0
-                    
-                chapters.append({
-                    "number": number,
-                    "title": title,
-                    "file_path": file,
-                    "char_count": char_count
-                })
+        for chapter in self.index.source_chapters(book_id):
+            if chapter["number"] is None:
+                continue
+            chapters.append({
+                "number": chapter["number"],
+                "title": chapter["title"],
+                "file_path": Path(chapter["source"]),
+                "char_count": chapter.get("char_count", 0)
+            })
                 
         return chapters
         